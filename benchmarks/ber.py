@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+#
+# Copyright 2026 Kontron Europe GmbH
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Microbenchmark of decoding GETBULK responses.
+
+Compares the variable bindings decoded per second by pyasn1 and by the fast
+path codec of SnmpLibrary.ber, and the requests encoded per second.
+"""
+
+import os
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from SnmpLibrary import ber  # noqa: E402
+from pysnmp.proto import api, rfc1902  # noqa: E402
+from pyasn1.codec.ber import decoder, encoder  # noqa: E402
+
+v2c = api.v2c
+
+# one row of an ifTable like table per repetition
+COLUMNS = [
+    (2, lambda i: rfc1902.OctetString('GigabitEthernet0/%d' % i)),
+    (3, lambda i: rfc1902.Integer32(6)),
+    (5, lambda i: rfc1902.Gauge32(1000000000)),
+    (9, lambda i: rfc1902.TimeTicks(4242 + i)),
+    (10, lambda i: rfc1902.Counter32(123456 * i)),
+    (6, lambda i: rfc1902.OctetString(b'\x00\x50\x56\x9a\x2b' +
+                                      bytes((i,)))),
+    (22, lambda i: rfc1902.ObjectName('1.3.6.1.4.1.8072.3.2.10')),
+    (16, lambda i: rfc1902.Counter64(2 ** 40 + i)),
+]
+ROWS = 6
+OIDS = [(1, 3, 6, 1, 2, 1, 2, 2, 1, column) for column, _ in COLUMNS]
+
+
+def response():
+    pdu = v2c.ResponsePDU()
+    v2c.apiPDU.setDefaults(pdu)
+    v2c.apiPDU.setVarBinds(pdu, [
+        ((1, 3, 6, 1, 2, 1, 2, 2, 1, column, i), value(i))
+        for i in range(1, ROWS + 1) for column, value in COLUMNS])
+    msg = v2c.Message()
+    v2c.apiMessage.setDefaults(msg)
+    v2c.apiMessage.setCommunity(msg, 'public')
+    v2c.apiMessage.setPDU(msg, pdu)
+    return encoder.encode(msg)
+
+
+def decode_pyasn1(data):
+    msg, _ = decoder.decode(data, asn1Spec=v2c.Message())
+    pdu = v2c.apiMessage.getPDU(msg)
+    return v2c.apiPDU.getVarBinds(pdu)
+
+
+def decode_fast(data):
+    return ber.decode_message(data).var_binds
+
+
+def encode_pyasn1(request_id):
+    pdu = v2c.GetBulkRequestPDU()
+    v2c.apiBulkPDU.setDefaults(pdu)
+    v2c.apiBulkPDU.setRequestID(pdu, request_id)
+    v2c.apiBulkPDU.setMaxRepetitions(pdu, ROWS)
+    v2c.apiBulkPDU.setVarBinds(pdu, [(oid, v2c.null) for oid in OIDS])
+    msg = v2c.Message()
+    v2c.apiMessage.setDefaults(msg)
+    v2c.apiMessage.setCommunity(msg, 'public')
+    v2c.apiMessage.setPDU(msg, pdu)
+    return encoder.encode(msg)
+
+
+def bench(name, func, arg, count, unit, number):
+    seconds = min(timeit.repeat(lambda: func(arg), number=number, repeat=3))
+    print('%-24s %12.0f %s/s' % (name, count * number / seconds, unit))
+
+
+def main():
+    data = response()
+    count = len(COLUMNS) * ROWS
+    assert len(decode_fast(data)) == len(decode_pyasn1(data)) == count
+    bench('decode, pyasn1', decode_pyasn1, data, count, 'varbinds', 200)
+    bench('decode, fast path', decode_fast, data, count, 'varbinds', 5000)
+
+    template = ber.RequestTemplate(1, 'public', ber.GET_BULK_REQUEST, OIDS,
+                                   0, ROWS)
+    assert template.encode(42) == encode_pyasn1(42)
+    bench('encode, pyasn1', encode_pyasn1, 42, 1, 'requests', 500)
+    bench('encode, template', template.encode, 42, 1, 'requests', 50000)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+#
+# Copyright 2026 Kontron Europe GmbH
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Microbenchmark of the per variable binding cost of value decoding.
+
+Compares the type checks formerly done by `Get` and `Walk` with the
+dispatch table of SnmpLibrary.values.
+"""
+
+import os
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from SnmpLibrary import values  # noqa: E402
+from pysnmp.proto import rfc1902  # noqa: E402
+from pyasn1.type import univ  # noqa: E402
+
+VAR_BINDS = [
+    rfc1902.OctetString('GigabitEthernet0/1'),
+    rfc1902.Integer32(1),
+    rfc1902.Counter32(123456),
+    rfc1902.Gauge32(1000000000),
+    rfc1902.TimeTicks(4242),
+    rfc1902.Counter64(2 ** 40),
+    rfc1902.IpAddress('10.0.0.1'),
+    rfc1902.ObjectName('1.3.6.1.4.1.8072.3.2.10'),
+]
+
+
+def get_isinstance(obj):
+    if univ.OctetString().isSuperTypeOf(obj):
+        return obj.asNumbers()
+    return obj.prettyOut(obj)
+
+
+def walk_isinstance(obj):
+    if obj.isSuperTypeOf(rfc1902.ObjectIdentifier()):
+        return ''.join(('.', str(obj)))
+    return obj.prettyOut(obj)
+
+
+def bench(name, func, number=20000):
+    seconds = min(timeit.repeat(
+        lambda: [func(obj) for obj in VAR_BINDS], number=number, repeat=3))
+    per_var_bind = seconds / number / len(VAR_BINDS) * 1e6
+    print('%-24s %8.3f us/varbind' % (name, per_var_bind))
+
+
+def main():
+    bench('get, type checks', get_isinstance)
+    bench('get, dispatch', lambda obj: values.decode(obj, 'get'))
+    bench('walk, type checks', walk_isinstance)
+    bench('walk, dispatch', lambda obj: values.decode(obj, 'walk'))
+    bench('native, dispatch', values.decode)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,298 @@
+#!/usr/bin/env python
+#
+# Copyright 2026 Kontron Europe GmbH
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmarks for the SnmpLibrary against a local in-process agent.
+
+Run from the top level directory of the repository:
+
+    python benchmarks/run.py --rows 1000 --latency 0.002 --output new.json
+
+Results are written as JSON. Pass `--compare old.json` to print the relative
+change against an earlier run, e.g. one of another commit.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from SnmpLibrary import SnmpLibrary  # noqa: E402
+from SnmpLibrary import traps  # noqa: E402
+from SnmpLibrary.simulator import Simulator  # noqa: E402
+from pysnmp.proto import rfc1902  # noqa: E402
+from pysnmp.proto.api import v2c  # noqa: E402
+from pyasn1.codec.ber import encoder  # noqa: E402
+
+# IF-MIB::ifEntry
+IF_ENTRY = (1, 3, 6, 1, 2, 1, 2, 2, 1)
+IF_ENTRY_OID = '.' + '.'.join(map(str, IF_ENTRY))
+SNMP_TRAP_OID = (1, 3, 6, 1, 6, 3, 1, 1, 4, 1, 0)
+TRAP_OID = (1, 3, 6, 1, 4, 1, 99999, 0, 1)
+LAST_TRAP_OID = (1, 3, 6, 1, 4, 1, 99999, 0, 2)
+
+
+def make_table(rows, columns=10, entry=IF_ENTRY):
+    """Returns a synthetic table with `rows` rows and `columns` columns.
+
+    Odd columns hold integers, even columns hold octet strings.
+    """
+    table = list()
+    table.append(((1, 3, 6, 1, 2, 1, 1, 1, 0),
+                  rfc1902.OctetString('robotframework benchmark agent')))
+    table.append(((1, 3, 6, 1, 2, 1, 1, 3, 0), rfc1902.TimeTicks(0)))
+    for column in range(1, columns + 1):
+        for row in range(1, rows + 1):
+            oid = entry + (column, row)
+            if column % 2:
+                value = rfc1902.Integer32(row * column)
+            else:
+                value = rfc1902.OctetString('row %d column %d' %
+                                            (row, column))
+            table.append((oid, value))
+    return table
+
+
+def percentiles(samples, points=(50, 90, 99)):
+    samples = sorted(samples)
+    result = dict()
+    for point in points:
+        idx = max(0, int(round(point / 100.0 * len(samples))) - 1)
+        result['p%d' % point] = samples[idx]
+    return result
+
+
+def timed(func, iterations):
+    samples = list()
+    started = time.perf_counter()
+    for i in range(iterations):
+        t = time.perf_counter()
+        func(i)
+        samples.append(time.perf_counter() - t)
+    elapsed = time.perf_counter() - started
+    result = dict(iterations=iterations, seconds=elapsed,
+                  ops_per_second=iterations / elapsed)
+    result.update(percentiles(samples))
+    return result
+
+
+@contextlib.contextmanager
+def quiet():
+    """The library prints its log messages to stdout, hide them."""
+    saved = sys.stdout
+    sys.stdout = io.StringIO()
+    try:
+        yield
+    finally:
+        sys.stdout = saved
+
+
+def bench_import(runs):
+    script = ('import time; t = time.perf_counter(); import SnmpLibrary; '
+              'print(time.perf_counter() - t)')
+    env = dict(os.environ, PYTHONPATH=os.path.join(ROOT, 'src'))
+    samples = list()
+    for _ in range(runs):
+        output = subprocess.check_output([sys.executable, '-c', script],
+                                         env=env)
+        samples.append(float(output))
+    result = dict(runs=runs, min=min(samples))
+    result.update(percentiles(samples, (50,)))
+    return result
+
+
+def bench_requests(lib, args):
+    results = dict()
+    rows = args.rows
+
+    def get(i):
+        lib.get(IF_ENTRY_OID + '.1', idx=i % rows + 1)
+    results['get'] = timed(get, args.iterations)
+
+    value = lib.convert_to_integer32(42)
+
+    def set_(i):
+        lib.set(IF_ENTRY_OID + '.3', value, idx=i % rows + 1)
+    results['set'] = timed(set_, args.iterations)
+
+    walks = list()
+
+    def walk(i):
+        walks.append(len(lib.walk(IF_ENTRY_OID + '.2')))
+    results['walk'] = timed(walk, args.walk_iterations)
+    results['walk']['rows'] = walks[0]
+    results['walk']['rows_per_second'] = \
+        walks[0] * results['walk']['ops_per_second']
+
+    tracemalloc.start()
+    lib.walk(IF_ENTRY_OID + '.2')
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    results['walk']['peak_memory_bytes'] = peak
+    return results
+
+
+def _encode_trap(trap_oid):
+    pdu = v2c.TrapPDU()
+    v2c.apiTrapPDU.setDefaults(pdu)
+    v2c.apiTrapPDU.setVarBinds(pdu, [
+        ((1, 3, 6, 1, 2, 1, 1, 3, 0), v2c.TimeTicks(0)),
+        (SNMP_TRAP_OID, v2c.ObjectIdentifier(trap_oid)),
+    ])
+    msg = v2c.Message()
+    v2c.apiMessage.setDefaults(msg)
+    v2c.apiMessage.setCommunity(msg, 'public')
+    v2c.apiMessage.setPDU(msg, pdu)
+    return encoder.encode(msg)
+
+
+def bench_traps(args):
+    port = args.trap_port
+    trap = _encode_trap(TRAP_OID)
+    last_trap = _encode_trap(LAST_TRAP_OID)
+    received = [0]
+    started = [None]
+    done = threading.Event()
+
+    def trap_filter(domain, sock, pdu):
+        received[0] += 1
+        var_binds = dict(v2c.apiTrapPDU.getVarBinds(pdu))
+        return var_binds[SNMP_TRAP_OID] == LAST_TRAP_OID
+
+    def sender():
+        # give the receiver some time to bind its port
+        time.sleep(0.5)
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        started[0] = time.perf_counter()
+        for i in range(args.traps):
+            sock.sendto(trap, ('127.0.0.1', port))
+            # do not overflow the receive buffer of the receiver
+            if i % 20 == 19:
+                time.sleep(0.001)
+        # the last trap may be dropped if the receiver is too slow
+        while not done.wait(0.1):
+            sock.sendto(last_trap, ('127.0.0.1', port))
+        sock.close()
+
+    thread = threading.Thread(target=sender)
+    thread.start()
+    try:
+        traps._trap_receiver(trap_filter, '127.0.0.1', port, 60)
+        elapsed = time.perf_counter() - started[0]
+    finally:
+        done.set()
+        thread.join()
+    return dict(sent=args.traps, received=received[0], seconds=elapsed,
+                traps_per_second=received[0] / elapsed)
+
+
+def compare(old, new, path=()):
+    """Prints the relative change of all numbers in `new` against `old`."""
+    for key in sorted(new):
+        if key not in old:
+            continue
+        if isinstance(new[key], dict):
+            compare(old[key], new[key], path + (key,))
+        elif isinstance(new[key], (int, float)) and old[key]:
+            change = 100.0 * (new[key] - old[key]) / old[key]
+            print('%-45s %14.6g %14.6g %+8.1f%%' %
+                  ('.'.join(path + (key,)), old[key], new[key], change))
+
+
+def _git_revision():
+    try:
+        return subprocess.check_output(
+            ['git', 'describe', '--tags', '--always', '--dirty'],
+            cwd=ROOT, stderr=subprocess.STDOUT).decode('ascii').strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000,
+                        help='rows of the synthetic table')
+    parser.add_argument('--columns', type=int, default=10,
+                        help='columns of the synthetic table')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='agent response latency in seconds')
+    parser.add_argument('--jitter', type=float, default=0.0,
+                        help='additional random latency in seconds')
+    parser.add_argument('--loss', type=float, default=0.0,
+                        help='probability that a request is dropped')
+    parser.add_argument('--timeout', type=float, default=1.0,
+                        help='SNMP request timeout in seconds')
+    parser.add_argument('--iterations', type=int, default=500,
+                        help='number of GET and SET requests')
+    parser.add_argument('--walk-iterations', type=int, default=5,
+                        help='number of walks')
+    parser.add_argument('--traps', type=int, default=5000,
+                        help='number of traps sent to the receiver')
+    parser.add_argument('--trap-port', type=int, default=16200)
+    parser.add_argument('--import-runs', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0,
+                        help='seed for the injected jitter and loss')
+    parser.add_argument('--output', help='write results to this file')
+    parser.add_argument('--compare', help='compare with earlier results')
+    args = parser.parse_args()
+
+    simulator = Simulator(latency=args.latency, jitter=args.jitter,
+                          loss=args.loss, seed=args.seed)
+    port = simulator.add_agent(make_table(args.rows, args.columns))
+    simulator.start()
+
+    results = dict(meta=dict(
+        revision=_git_revision(),
+        python=platform.python_version(),
+        platform=platform.platform(),
+        parameters=vars(args),
+    ))
+    try:
+        results['import'] = bench_import(args.import_runs)
+        lib = SnmpLibrary()
+        with quiet():
+            lib.open_snmp_v2c_connection('127.0.0.1', 'public', port=port,
+                                         timeout=args.timeout)
+            results.update(bench_requests(lib, args))
+        results['traps'] = bench_traps(args)
+        results['agent'] = dict(requests=simulator.requests,
+                                dropped=simulator.dropped)
+    finally:
+        simulator.stop()
+
+    output = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    print(output)
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), results)
+
+
+if __name__ == '__main__':
+    main()
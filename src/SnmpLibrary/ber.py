@@ -0,0 +1,309 @@
+# Copyright 2026 Kontron Europe GmbH
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Fast path BER codec for SNMP v1/v2c messages.
+#
+# Most SNMP messages are community based and carry a flat list of variable
+# bindings with a handful of simple value types. This codec decodes such
+# messages straight from the datagram, using a memoryview, into tuples of
+# plain Python values instead of pyasn1 objects, and encodes them by
+# concatenating bytes. Anything else (SNMPv3, SNMPv1 traps, indefinite
+# lengths, unknown tags) raises `Unsupported`; the caller then falls back
+# to pyasn1.
+#
+# A decoded message is a `Message` tuple. The variable bindings are
+# (OID tuple, tag, value) tuples, where value is an int for the integer
+# types, bytes for OCTET STRING, IpAddress and Opaque, an OID tuple for
+# OBJECT IDENTIFIER and None for NULL and the exceptions noSuchObject,
+# noSuchInstance and endOfMibView.
+
+import collections
+
+from . import utils
+
+rfc1902 = utils.LazyModule('pysnmp.proto.rfc1902')
+rfc1905 = utils.LazyModule('pysnmp.proto.rfc1905')
+
+INTEGER = 0x02
+OCTET_STRING = 0x04
+NULL = 0x05
+OBJECT_IDENTIFIER = 0x06
+SEQUENCE = 0x30
+IP_ADDRESS = 0x40
+COUNTER32 = 0x41
+GAUGE32 = 0x42
+TIME_TICKS = 0x43
+OPAQUE = 0x44
+COUNTER64 = 0x46
+NO_SUCH_OBJECT = 0x80
+NO_SUCH_INSTANCE = 0x81
+END_OF_MIB_VIEW = 0x82
+
+GET_REQUEST = 0xa0
+GET_NEXT_REQUEST = 0xa1
+RESPONSE = 0xa2
+SET_REQUEST = 0xa3
+GET_BULK_REQUEST = 0xa5
+INFORM_REQUEST = 0xa6
+TRAP_V2 = 0xa7
+REPORT = 0xa8
+
+_PDUS = frozenset([GET_REQUEST, GET_NEXT_REQUEST, RESPONSE, SET_REQUEST,
+                   GET_BULK_REQUEST, INFORM_REQUEST, TRAP_V2, REPORT])
+_INTEGERS = frozenset([INTEGER, COUNTER32, GAUGE32, TIME_TICKS, COUNTER64])
+_OCTETS = frozenset([OCTET_STRING, IP_ADDRESS, OPAQUE])
+_EMPTY = frozenset([NULL, NO_SUCH_OBJECT, NO_SUCH_INSTANCE, END_OF_MIB_VIEW])
+
+# For GETBULK requests, error_status and error_index hold non-repeaters and
+# max-repetitions.
+Message = collections.namedtuple('Message', [
+    'version', 'community', 'pdu_type', 'request_id', 'error_status',
+    'error_index', 'var_binds'])
+
+
+class Unsupported(Exception):
+    """The message has to be decoded by pyasn1."""
+
+
+def _header(data, pos, end):
+    """Returns the tag, the start and the end of the contents."""
+    if pos + 2 > end:
+        raise Unsupported('truncated')
+    tag = data[pos]
+    length = data[pos + 1]
+    pos += 2
+    if length & 0x80:
+        count = length & 0x7f
+        if count == 0 or count > 4 or pos + count > end:
+            raise Unsupported('unsupported length')
+        length = int.from_bytes(data[pos:pos + count], 'big')
+        pos += count
+    if pos + length > end:
+        raise Unsupported('truncated')
+    return tag, pos, pos + length
+
+
+def _expect(data, pos, end, tag):
+    actual, start, stop = _header(data, pos, end)
+    if actual != tag:
+        raise Unsupported('unexpected tag 0x%02x' % actual)
+    return start, stop
+
+
+def _integer(data, start, stop):
+    if start == stop:
+        raise Unsupported('empty integer')
+    return int.from_bytes(data[start:stop], 'big', signed=True)
+
+
+def _oid(data, start, stop):
+    arcs = list()
+    arc = 0
+    for i in range(start, stop):
+        byte = data[i]
+        arc = (arc << 7) | (byte & 0x7f)
+        if not byte & 0x80:
+            arcs.append(arc)
+            arc = 0
+    if not arcs or data[stop - 1] & 0x80:
+        raise Unsupported('invalid OID')
+    first = arcs[0]
+    if first < 40:
+        return (0, first) + tuple(arcs[1:])
+    elif first < 80:
+        return (1, first - 40) + tuple(arcs[1:])
+    return (2, first - 80) + tuple(arcs[1:])
+
+
+def _value(data, tag, start, stop):
+    if tag in _INTEGERS:
+        value = _integer(data, start, stop)
+        if tag != INTEGER and value < 0:
+            raise Unsupported('negative unsigned value')
+        return value
+    elif tag in _OCTETS:
+        return bytes(data[start:stop])
+    elif tag == OBJECT_IDENTIFIER:
+        return _oid(data, start, stop)
+    elif tag in _EMPTY:
+        if start != stop:
+            raise Unsupported('non-empty null')
+        return None
+    raise Unsupported('unsupported tag 0x%02x' % tag)
+
+
+def decode_message(data):
+    """Decodes an SNMP v1/v2c message, see `Message`."""
+    data = memoryview(data)
+    end = len(data)
+    start, stop = _expect(data, 0, end, SEQUENCE)
+    if stop != end:
+        raise Unsupported('trailing data')
+
+    pos, next_pos = _expect(data, start, stop, INTEGER)
+    version = _integer(data, pos, next_pos)
+    if version not in (0, 1):
+        raise Unsupported('SNMP version %d' % version)
+    pos, next_pos = _expect(data, next_pos, stop, OCTET_STRING)
+    community = bytes(data[pos:next_pos])
+
+    pdu_type, pos, pdu_end = _header(data, next_pos, stop)
+    if pdu_type not in _PDUS or pdu_end != stop:
+        raise Unsupported('unsupported PDU')
+    fields = list()
+    for _ in range(3):
+        start, pos = _expect(data, pos, pdu_end, INTEGER)
+        fields.append(_integer(data, start, pos))
+
+    pos, list_end = _expect(data, pos, pdu_end, SEQUENCE)
+    if list_end != pdu_end:
+        raise Unsupported('trailing data')
+    var_binds = list()
+    while pos < list_end:
+        start, pos = _expect(data, pos, list_end, SEQUENCE)
+        oid_start, oid_end = _expect(data, start, pos, OBJECT_IDENTIFIER)
+        tag, value_start, value_end = _header(data, oid_end, pos)
+        if value_end != pos:
+            raise Unsupported('trailing data')
+        var_binds.append((_oid(data, oid_start, oid_end), tag,
+                          _value(data, tag, value_start, value_end)))
+
+    return Message(version, community, pdu_type, fields[0], fields[1],
+                   fields[2], var_binds)
+
+
+def _length(length):
+    if length < 0x80:
+        return bytes((length,))
+    octets = length.to_bytes((length.bit_length() + 7) // 8, 'big')
+    return bytes((0x80 | len(octets),)) + octets
+
+
+def tlv(tag, contents):
+    """Returns the encoding of `contents` with the given tag."""
+    return bytes((tag,)) + _length(len(contents)) + contents
+
+
+def encode_integer(value, tag=INTEGER):
+    length = (value + (value < 0)).bit_length() // 8 + 1
+    return tlv(tag, value.to_bytes(length, 'big', signed=True))
+
+
+def encode_oid(oid):
+    if len(oid) < 2:
+        raise Unsupported('OID with less than two arcs')
+    arcs = [oid[0] * 40 + oid[1]] + list(oid[2:])
+    contents = bytearray()
+    for arc in arcs:
+        chunk = [arc & 0x7f]
+        arc >>= 7
+        while arc:
+            chunk.append(0x80 | (arc & 0x7f))
+            arc >>= 7
+        contents.extend(reversed(chunk))
+    return tlv(OBJECT_IDENTIFIER, bytes(contents))
+
+
+def encode_value(tag, value):
+    if tag in _INTEGERS:
+        return encode_integer(value, tag)
+    elif tag in _OCTETS:
+        return tlv(tag, bytes(value))
+    elif tag == OBJECT_IDENTIFIER:
+        return encode_oid(value)
+    elif tag in _EMPTY:
+        return bytes((tag, 0))
+    raise Unsupported('unsupported tag 0x%02x' % tag)
+
+
+def encode_var_bind(oid, tag, value):
+    return tlv(SEQUENCE, encode_oid(oid) + encode_value(tag, value))
+
+
+def encode_message(version, community, pdu_type, request_id, error_status,
+                   error_index, var_binds):
+    """Encodes a message; `var_binds` are (OID, tag, value) tuples or
+    already encoded variable bindings (bytes)."""
+    encoded = b''.join(v if isinstance(v, bytes) else encode_var_bind(*v)
+                       for v in var_binds)
+    pdu = tlv(pdu_type, encode_integer(request_id) +
+              encode_integer(error_status) + encode_integer(error_index) +
+              tlv(SEQUENCE, encoded))
+    return tlv(SEQUENCE, encode_integer(version) +
+               tlv(OCTET_STRING, community) + pdu)
+
+
+class RequestTemplate:
+    """Encodes requests for a fixed list of OIDs.
+
+    Everything but the request ID is encoded once, thus encoding a request
+    is a concatenation of a few byte strings.
+    """
+
+    def __init__(self, version, community, pdu_type, oids,
+                 non_repeaters=0, max_repetitions=0):
+        if utils.is_string(community):
+            community = community.encode('utf-8')
+        self._pdu_type = pdu_type
+        self._prefix = encode_integer(version) + tlv(OCTET_STRING, community)
+        self._suffix = encode_integer(non_repeaters) + \
+            encode_integer(max_repetitions) + \
+            tlv(SEQUENCE, b''.join(encode_var_bind(oid, NULL, None)
+                                   for oid in oids))
+
+    def encode(self, request_id):
+        pdu = tlv(self._pdu_type, encode_integer(request_id) + self._suffix)
+        return tlv(SEQUENCE, self._prefix + pdu)
+
+
+# tag -> type name in pysnmp.proto.rfc1902
+_TYPES = {
+    INTEGER: 'Integer32',
+    OCTET_STRING: 'OctetString',
+    OBJECT_IDENTIFIER: 'ObjectName',
+    IP_ADDRESS: 'IpAddress',
+    COUNTER32: 'Counter32',
+    GAUGE32: 'Gauge32',
+    TIME_TICKS: 'TimeTicks',
+    OPAQUE: 'Opaque',
+    COUNTER64: 'Counter64',
+}
+
+
+def to_asn1(tag, value):
+    """Returns the pyasn1 object of a decoded value."""
+    if tag in _TYPES:
+        return getattr(rfc1902, _TYPES[tag])(value)
+    elif tag == NULL:
+        return rfc1902.Null('')
+    elif tag == NO_SUCH_OBJECT:
+        return rfc1905.noSuchObject
+    elif tag == NO_SUCH_INSTANCE:
+        return rfc1905.noSuchInstance
+    return rfc1905.endOfMibView
+
+
+def from_asn1(value):
+    """Returns the tag and the plain value of a pyasn1 object."""
+    tag = value.tagSet[0]
+    tag = tag.tagClass | tag.tagId
+    if tag in _INTEGERS:
+        return tag, int(value)
+    elif tag in _OCTETS:
+        return tag, value.asOctets()
+    elif tag == OBJECT_IDENTIFIER:
+        return tag, tuple(value)
+    elif tag in (NULL, NO_SUCH_OBJECT, NO_SUCH_INSTANCE, END_OF_MIB_VIEW):
+        return tag, None
+    raise Unsupported('unsupported value type %s' % type(value).__name__)
@@ -0,0 +1,244 @@
+# Copyright 2026 Kontron Europe GmbH
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# SET requests for large numbers of variable bindings.
+#
+# The rows to set are read one by one from a CSV file, a JSON lines file or
+# a list and packed into SET requests, each one below a budget of variable
+# bindings and of encoded bytes. Thus the rows never have to be held in
+# memory at once. Every row is an OID, an optional type and a value:
+#
+#   .1.3.6.1.2.1.2.2.1.7.1,integer,1
+#   IF-MIB::ifAlias.1,,uplink
+#   {"oid": ".1.3.6.1.2.1.1.5.0", "type": "octetstring", "value": "sw1"}
+#
+# Without a type, the value is converted according to the loaded MIBs.
+#
+# A SET request is applied either completely or not at all. If the agent
+# rejects a request, the error index points to the offending row. That row
+# is reported as failed and the other rows of the request are sent again.
+# A request which is too big for the agent is split in halves.
+
+import csv
+import json
+
+from . import utils
+
+univ = utils.LazyModule('pyasn1.type.univ')
+encoder = utils.LazyModule('pyasn1.codec.ber.encoder')
+rfc1902 = utils.LazyModule('pysnmp.proto.rfc1902')
+
+# errorStatus tooBig
+_TOO_BIG = 1
+
+# type name -> type name in pysnmp.proto.rfc1902
+_TYPES = {
+    'octetstring': 'OctetString',
+    'integer': 'Integer',
+    'integer32': 'Integer32',
+    'counter32': 'Counter32',
+    'counter64': 'Counter64',
+    'gauge32': 'Gauge32',
+    'unsigned32': 'Unsigned32',
+    'timeticks': 'TimeTicks',
+    'ipaddress': 'IpAddress',
+    'objectidentifier': 'ObjectName',
+}
+
+_COLUMNS = ('oid', 'type', 'value')
+
+
+def _from_sequence(row):
+    row = list(row)
+    if len(row) == 2:
+        row.insert(1, '')
+    if len(row) != 3:
+        raise ValueError('Expected OID, type and value, got %r' % (row, ))
+    return row
+
+
+def _from_dict(row):
+    for key in ('oid', 'value'):
+        if key not in row:
+            raise ValueError('Missing "%s" in %r' % (key, row))
+    return [row['oid'], row.get('type', ''), row['value']]
+
+
+def parse_row(row):
+    """Returns the OID, type and value of a row yielded by `read_rows`."""
+    if utils.is_string(row):
+        # a line of a JSON lines file
+        row = json.loads(row)
+    if isinstance(row, dict):
+        return _from_dict(row)
+    return _from_sequence(row)
+
+
+def _read_csv(path):
+    with open(path) as f:
+        for row in csv.reader(f):
+            if not row or row[0].startswith('#'):
+                continue
+            if [c.strip().lower() for c in row] == list(_COLUMNS):
+                continue
+            yield [c.strip() for c in row]
+
+
+def _read_jsonl(path):
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            yield line
+
+
+def read_rows(source):
+    """Yields the unparsed rows of a file or of a list.
+
+    Files ending in `.json` or `.jsonl` are read as JSON lines, all other
+    files as CSV. The items of a list are dictionaries or sequences. The
+    rows are parsed by `parse_row`, thus a malformed row fails on its own.
+    """
+    if utils.is_string(source):
+        if source.endswith(('.json', '.jsonl')):
+            return _read_jsonl(source)
+        return _read_csv(source)
+    return iter(source)
+
+
+def make_value(type_, value):
+    """Converts `value` to the named SNMP type, if `type_` is given."""
+    if not type_:
+        return value
+    try:
+        cls = getattr(rfc1902, _TYPES[type_.lower().replace(' ', '')])
+    except KeyError:
+        raise ValueError('Unknown type "%s"' % type_)
+    if cls.tagSet in (rfc1902.OctetString.tagSet, rfc1902.IpAddress.tagSet,
+                      rfc1902.ObjectName.tagSet):
+        return cls(str(value))
+    return cls(int(value))
+
+
+def encoded_size(oid, value):
+    """Returns the size of the encoded variable binding."""
+    size = len(encoder.encode(univ.ObjectIdentifier(oid))) + \
+        len(encoder.encode(value))
+    if size < 0x80:
+        return size + 2
+    elif size < 0x100:
+        return size + 3
+    return size + 4
+
+
+def pack(rows, max_var_binds, max_bytes):
+    """Packs (number, OID, value, size) rows into lists of rows.
+
+    A single row larger than `max_bytes` is packed alone.
+    """
+    chunk = list()
+    size = 0
+    for row in rows:
+        if chunk and (len(chunk) >= max_var_binds or
+                      size + row[3] > max_bytes):
+            yield chunk
+            chunk = list()
+            size = 0
+        chunk.append(row)
+        size += row[3]
+    if chunk:
+        yield chunk
+
+
+class BulkSet:
+    """Sets all rows of a source with as few SET requests as possible.
+
+    The failed rows are collected as (number, OID, error) tuples in
+    `failures`, where number is the position of the row in the source,
+    starting at 1.
+    """
+
+    def __init__(self, connection, max_var_binds=50, max_bytes=1200):
+        self.connection = connection
+        self.max_var_binds = max_var_binds
+        self.max_bytes = max_bytes
+        self.failures = list()
+        self.rows = 0
+        self.requests = 0
+
+    def _prepare(self, source):
+        cmd_gen = self.connection.async_cmd_gen
+        for number, row in enumerate(read_rows(source), 1):
+            self.rows += 1
+            oid = ''
+            try:
+                oid, type_, value = parse_row(row)
+                value = make_value(type_, value)
+                var_bind = cmd_gen.makeVarBinds(
+                        [(utils.parse_oid(oid), value)])[0]
+                oid, value = tuple(var_bind[0].getOid()), var_bind[1]
+                if not hasattr(value, 'tagSet'):
+                    raise ValueError('No type given and none found in '
+                                     'the loaded MIBs')
+                yield number, oid, value, encoded_size(oid, value)
+            except Exception as e:
+                if not utils.is_string(oid):
+                    oid = utils.format_oid(oid)
+                self.failures.append((number, oid, str(e)))
+
+    def _fail(self, chunk, error):
+        for number, oid, _, _ in chunk:
+            self.failures.append((number, utils.format_oid(oid), error))
+
+    def run(self, source, max_in_flight=1):
+        """Sets all rows with at most `max_in_flight` concurrent requests.
+        """
+        cmd_gen = self.connection.async_cmd_gen
+        chunks = pack(self._prepare(source), self.max_var_binds,
+                      self.max_bytes)
+        retries = list()
+
+        def _start_next():
+            chunk = retries and retries.pop() or next(chunks, None)
+            if chunk is None:
+                return False
+            self.requests += 1
+            cmd_gen.setCmd(self.connection.authentication_data,
+                           self.connection.transport_target,
+                           [(oid, value) for _, oid, value, _ in chunk],
+                           (_set_cb, chunk),
+                           contextName=self.connection.context_name)
+            return True
+
+        def _set_cb(send_request_handle, error_indication, error_status,
+                    error_index, var_binds, chunk):
+            if error_indication:
+                self._fail(chunk, str(error_indication))
+            elif error_status and int(error_status) == _TOO_BIG and \
+                    len(chunk) > 1:
+                half = len(chunk) // 2
+                retries.extend([chunk[half:], chunk[:half]])
+            elif error_status and 0 < int(error_index) <= len(chunk):
+                idx = int(error_index) - 1
+                self._fail(chunk[idx:idx + 1], error_status.prettyPrint())
+                if len(chunk) > 1:
+                    retries.append(chunk[:idx] + chunk[idx + 1:])
+            elif error_status:
+                self._fail(chunk, error_status.prettyPrint())
+            _start_next()
+
+        started = [_start_next() for _ in range(max(1, max_in_flight))]
+        if any(started):
+            cmd_gen.snmpEngine.transportDispatcher.runDispatcher()
+        self.failures.sort()
@@ -0,0 +1,129 @@
+# Copyright 2026 Kontron Europe GmbH
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Coalescing of concurrent GET requests of one connection.
+#
+# Threads reading from the same connection at the same time share requests:
+# a GET for an OID which is already part of the request in flight waits for
+# that request instead of sending its own. GETs for other OIDs are collected
+# in a pending batch, which is sent as one multi variable binding request as
+# soon as the request in flight is answered (or after a short window). The
+# first thread adding an OID to a batch sends it, the others wait for it.
+#
+# Only one request of a connection is in flight at any time, because the
+# synchronous command generator of pysnmp must not be used by several
+# threads at once.
+
+import threading
+import time
+
+from . import tables
+
+
+class _Batch:
+
+    def __init__(self):
+        self.oids = list()
+        self.index = dict()
+        self.done = threading.Event()
+        self.response = None
+
+    def add(self, oid):
+        if oid not in self.index:
+            self.index[oid] = len(self.oids)
+            self.oids.append(oid)
+
+
+class GetCoalescer:
+    """Merges concurrent GET requests of one connection.
+
+    `requests` counts the requests sent and `calls` the GETs asked for.
+    """
+
+    def __init__(self, connection, max_var_binds=tables.MAX_VAR_BINDS):
+        self.connection = connection
+        self.max_var_binds = max_var_binds
+        self.requests = 0
+        self.calls = 0
+        self._lock = threading.Lock()
+        self._request_lock = threading.Lock()
+        self._pending = None
+        self._in_flight = None
+
+    def get(self, oid, window=0.0):
+        """Returns the GET response (error indication, error status, error
+        index, variable bindings) for the single OID `oid`.
+
+        The thread starting a batch waits `window` seconds for further OIDs
+        before sending it.
+        """
+        leader = False
+        with self._lock:
+            self.calls += 1
+            batch = self._in_flight
+            if batch is None or oid not in batch.index:
+                batch = self._pending
+                if batch is None or (oid not in batch.index and
+                                     len(batch.oids) >= self.max_var_binds):
+                    batch = self._pending = _Batch()
+                    leader = True
+                batch.add(oid)
+
+        if leader:
+            if window:
+                time.sleep(window)
+            self._send(batch)
+        batch.done.wait()
+        return self._response(batch, oid)
+
+    def _response(self, batch, oid):
+        response = batch.response
+        if isinstance(response, Exception):
+            raise response
+        error_indication, error, error_index, var_binds = response
+        if error_indication is None and error != 0 and len(batch.oids) > 1:
+            # the error may be caused by another OID of the batch
+            retry = _Batch()
+            retry.add(oid)
+            self._send(retry)
+            return self._response(retry, oid)
+        if error_indication is not None or error != 0:
+            return response
+        idx = batch.index[oid]
+        return error_indication, error, error_index, var_binds[idx:idx + 1]
+
+    def _send(self, batch):
+        with self._request_lock:
+            with self._lock:
+                if self._pending is batch:
+                    self._pending = None
+                self._in_flight = batch
+                self.requests += 1
+            try:
+                if self.connection.fast_path is not None:
+                    batch.response = \
+                        self.connection.fast_path.get(batch.oids)
+                if batch.response is None:
+                    batch.response = self.connection.cmd_gen.getCmd(
+                            self.connection.authentication_data,
+                            self.connection.transport_target,
+                            *batch.oids,
+                            contextName=self.connection.context_name
+                    )
+            except Exception as e:
+                batch.response = e
+            finally:
+                with self._lock:
+                    self._in_flight = None
+                batch.done.set()
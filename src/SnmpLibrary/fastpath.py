@@ -0,0 +1,136 @@
+# Copyright 2026 Kontron Europe GmbH
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Requests of v2c connections sent with the fast path codec (see ber.py).
+#
+# GET and GETNEXT requests are encoded with a `RequestTemplate`, sent on a
+# plain UDP socket and the response is decoded by `decode_message`, without
+# the SNMP engine of pysnmp. The result has the form of the synchronous
+# command generator of pysnmp: (error indication, error status, error
+# index, variable bindings), with pyasn1 objects as values. Like there, the
+# values of GET responses are resolved with the MIBs, e.g. an INTEGER of an
+# enumeration becomes its named value; GETNEXT responses keep the plain
+# values, like the ones of the asynchronous command generator.
+#
+# If the request or the response cannot be handled by the fast path codec,
+# `request` returns None and the caller sends the request with pysnmp.
+
+import itertools
+import random
+import socket
+import threading
+import time
+
+from . import ber
+from . import utils
+
+errind = utils.LazyModule('pysnmp.proto.errind')
+rfc1902 = utils.LazyModule('pysnmp.proto.rfc1902')
+rfc1905 = utils.LazyModule('pysnmp.proto.rfc1905')
+
+# number of request templates kept per connection
+MAX_TEMPLATES = 64
+
+
+class FastPath:
+    """Sends requests of a v2c connection to `host`:`port`.
+
+    The request is repeated `retries` times if no response is received
+    within `timeout` seconds. `cmd_gen` is the asynchronous command
+    generator of the connection, which resolves the values with its MIBs.
+    """
+
+    def __init__(self, host, port, community, timeout=1.0, retries=5,
+                 cmd_gen=None):
+        self.address = (host, port)
+        self.community = community
+        self.timeout = timeout
+        self.retries = retries
+        self.cmd_gen = cmd_gen
+        self._templates = dict()
+        self._request_ids = itertools.count(random.randrange(1 << 30))
+        self._sock = None
+        self._lock = threading.Lock()
+
+    def _template(self, pdu_type, oids):
+        key = (pdu_type, tuple(oids))
+        template = self._templates.get(key)
+        if template is None:
+            if len(self._templates) >= MAX_TEMPLATES:
+                self._templates.clear()
+            template = self._templates[key] = ber.RequestTemplate(
+                    1, self.community, pdu_type, oids)
+        return template
+
+    def _exchange(self, data, request_id):
+        if self._sock is None:
+            self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self._sock.connect(self.address)
+        for _ in range(self.retries + 1):
+            self._sock.send(data)
+            deadline = time.time() + self.timeout
+            while True:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                self._sock.settimeout(remaining)
+                try:
+                    response = self._sock.recv(65535)
+                except socket.timeout:
+                    break
+                except socket.error:
+                    # e.g. ICMP port unreachable
+                    continue
+                msg = ber.decode_message(response)
+                if msg.pdu_type == ber.RESPONSE and \
+                        msg.request_id == request_id:
+                    return msg
+        return None
+
+    def request(self, pdu_type, oids):
+        """Returns the response to a GET or GETNEXT request for `oids`, or
+        None if the fast path codec does not support it."""
+        if not all(isinstance(arc, int) for oid in oids for arc in oid):
+            # symbolic OIDs are resolved by pysnmp
+            return None
+        request_id = next(self._request_ids) & 0x7fffffff
+        try:
+            data = self._template(pdu_type, oids).encode(request_id)
+            with self._lock:
+                msg = self._exchange(data, request_id)
+            if msg is None:
+                return errind.requestTimedOut, 0, 0, []
+            var_binds = [(rfc1902.ObjectName(oid), ber.to_asn1(tag, value))
+                         for oid, tag, value in msg.var_binds]
+        except ber.Unsupported:
+            return None
+        error_status = rfc1905.errorStatus.clone(msg.error_status)
+        return None, error_status, msg.error_index, var_binds
+
+    def get(self, oids):
+        response = self.request(ber.GET_REQUEST, oids)
+        if response is None or self.cmd_gen is None or \
+                response[0] is not None or response[1] != 0:
+            return response
+        error_indication, error_status, error_index, var_binds = response
+        var_binds = self.cmd_gen.unmakeVarBinds(var_binds, True, True)
+        return error_indication, error_status, error_index, var_binds
+
+    def get_next(self, oids):
+        return self.request(ber.GET_NEXT_REQUEST, oids)
+
+    def close(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
@@ -13,40 +13,74 @@
 # limitations under the License.
 
 import os.path
-import warnings
 from itertools import islice
-from pyasn1.compat.octets import null
+import robot.utils
 from robot.utils.connectioncache import ConnectionCache
 
 from .traps import _Traps
+from .pool import connection_pool
+from .simulator import Simulator
+from . import bulkset
+from . import coalesce
+from . import fastpath
+from . import profiling
+from . import snapshot
+from . import symbols
+from . import tables
 from . import utils
+from . import values
+from . import walkcache
+from . import walker
 from . import __version__
 
-with warnings.catch_warnings():
-    warnings.filterwarnings("ignore", category=DeprecationWarning)
-    from pysnmp.smi import builder
-    from pysnmp.entity import engine
-    from pysnmp.entity.rfc3413.oneliner import cmdgen
-    from pyasn1.type import univ
-    from pysnmp.proto import rfc1902, rfc1905
+engine = utils.LazyModule('pysnmp.entity.engine')
+cmdgen = utils.LazyModule('pysnmp.entity.rfc3413.oneliner.cmdgen')
+octets = utils.LazyModule('pyasn1.compat.octets')
+rfc1902 = utils.LazyModule('pysnmp.proto.rfc1902')
+rfc1905 = utils.LazyModule('pysnmp.proto.rfc1905')
+
+
+_SYS_UP_TIME = (1, 3, 6, 1, 2, 1, 1, 3, 0)
 
 
 class _SnmpConnection:
 
-    def __init__(self, authentication, transport_target, context_name=null):
+    def __init__(self, authentication, transport_target, context_name=None):
+        if context_name is None:
+            context_name = octets.null
+
         eng = engine.SnmpEngine()
         self.builder = eng.msgAndPduDsp.mibInstrumController.mibBuilder
 
         self.cmd_gen = cmdgen.CommandGenerator(eng)
+        self.async_cmd_gen = cmdgen.AsynCommandGenerator(eng)
         self.authentication_data = authentication
         self.context_name = context_name
         self.transport_target = transport_target
 
         self.prefetched_table = {}
+        self.table_columns = {}
+        self.pool_key = None
+        self.closed = False
+        # set by `Add MIB Search Path` and `Preload MIBs`
+        self.mibs_changed = False
+        self.fast_path = None
+        self.coalescer = coalesce.GetCoalescer(self)
+
+    def is_alive(self):
+        """Checks whether the agent still answers on this connection."""
+        error_indication, error, _, _ = self.cmd_gen.getCmd(
+            self.authentication_data,
+            self.transport_target,
+            _SYS_UP_TIME,
+            contextName=self.context_name
+        )
+        return error_indication is None and error == 0
 
     def close(self):
-        # nothing to do atm
-        pass
+        self.closed = True
+        if self.fast_path is not None:
+            self.fast_path.close()
 
 
 class SnmpLibrary(_Traps):
@@ -54,10 +88,122 @@ class SnmpLibrary(_Traps):
     ROBOT_LIBRARY_VERSION = __version__
     ROBOT_LIBRARY_SCOPE = 'TEST SUITE'
 
-    def __init__(self):
-        _Traps.__init__(self)
+    def __init__(self, connection_pool=False, pool_idle_timeout='5 minutes',
+                 pool_health_check=False, native_values=False,
+                 symbolic_oids=False, trap_hub=False, fast_ber=False,
+                 coalescing_window=0, walk_cache=None,
+                 walk_cache_probes=None, walk_cache_max_age=None):
+        """SnmpLibrary can be imported with optional arguments.
+
+        If `connection_pool` is enabled, connections are taken from and given
+        back to a pool which is shared by all library instances of the
+        process. Thus, the SNMP engine, the transport and the loaded MIBs of a
+        connection survive the end of a test suite and are reused by any
+        later suite which opens a connection with the same host, port,
+        version and credentials. Connections are only given back to the pool
+        by `Close All SNMP Connections`. Connections whose MIBs were changed
+        by `Add MIB Search Path` or `Preload MIBs` are closed instead.
+
+        Pooled connections which were idle for longer than
+        `pool_idle_timeout` are discarded. If `pool_health_check` is enabled,
+        a pooled connection is probed with a GET request for `sysUpTime`
+        before it is reused.
+
+        By default, `Get` returns OCTET STRINGs as tuple of octets and other
+        values as string, `Walk` returns all values as string. If
+        `native_values` is enabled, both return native Python values instead:
+        integers for all integer types, bytes for OCTET STRINGs and Opaque
+        values, `ipaddress.IPv4Address` for IpAddress values and tuples of
+        integers for OIDs.
+
+        If `symbolic_oids` is enabled, the OIDs returned by the walk keywords
+        and `Wait Until Trap Is Received` and the OIDs in the log are
+        translated to the symbolic notation, e.g. `IF-MIB::ifDescr.12`, with
+        the loaded MIBs. OIDs unknown to these MIBs stay numeric.
+
+        If `trap_hub` is enabled, `Wait Until Trap Is Received` gets the
+        traps from a trap hub process, which is shared by parallel test
+        executions, instead of binding the trap port itself.
+
+        If `fast_ber` is enabled, the GET and GETNEXT requests of SNMP v2c
+        connections are encoded and decoded by a built-in codec instead of
+        pysnmp. Requests with symbolic OIDs and responses with values the
+        codec does not support are still handled by pysnmp.
+
+        `Get` requests of threads using the same connection at the same time
+        are coalesced: a GET for an OID which is already requested waits for
+        the response of that request, and GETs for other OIDs are merged
+        into one request sent when the request in flight is answered. With a
+        `coalescing_window`, a request is delayed by that time to collect
+        further GETs.
+
+        If `walk_cache` is set to a directory, the results of `Walk` and
+        `Prefetch OID Table` are cached in that directory, for the agent
+        identified by its sysObjectID and snmpEngineID, and for the
+        community or user and the context of the connection. Before a walk,
+        a single GET reads sysUpTime and the OIDs in `walk_cache_probes`, a
+        comma separated list, e.g. `IF-MIB::ifTableLastChange.0`. The cached
+        walk is used if the agent was not restarted and the probes did not
+        change since, and if it is not older than `walk_cache_max_age`.
+        Walks with a range or a stop condition are never cached, nor are
+        walks of agents whose state cannot be read by this GET.
+
+        Example:
+        | Library | SnmpLibrary | connection_pool=True | pool_idle_timeout=10 minutes |
+        | Library | SnmpLibrary | native_values=True | |
+        | Library | SnmpLibrary | symbolic_oids=True | |
+        | Library | SnmpLibrary | trap_hub=True | |
+        | Library | SnmpLibrary | fast_ber=True | |
+        | Library | SnmpLibrary | coalescing_window=5 ms | |
+        | Library | SnmpLibrary | walk_cache=${TEMPDIR}/walks | walk_cache_probes=IF-MIB::ifTableLastChange.0 |
+        """
+        _Traps.__init__(self, robot.utils.is_truthy(trap_hub))
         self._active_connection = None
         self._cache = ConnectionCache()
+        self._simulator = None
+        self._profiler = None
+        self._use_pool = robot.utils.is_truthy(connection_pool)
+        self._pool_idle_timeout = \
+            robot.utils.timestr_to_secs(pool_idle_timeout)
+        self._pool_health_check = robot.utils.is_truthy(pool_health_check)
+        if robot.utils.is_truthy(native_values):
+            self._get_value_format = self._walk_value_format = 'native'
+        else:
+            self._get_value_format = 'get'
+            self._walk_value_format = 'walk'
+        self._symbolic_oids = robot.utils.is_truthy(symbolic_oids)
+        self._fast_ber = robot.utils.is_truthy(fast_ber)
+        self._coalescing_window = \
+            robot.utils.timestr_to_secs(coalescing_window)
+        self._walk_cache = None
+        if walk_cache:
+            if utils.is_string(walk_cache_probes):
+                walk_cache_probes = walk_cache_probes.split(',')
+            probes = [utils.parse_oid(probe.strip())
+                      for probe in walk_cache_probes or ()]
+            if walk_cache_max_age is not None:
+                walk_cache_max_age = \
+                    robot.utils.timestr_to_secs(walk_cache_max_age)
+            self._walk_cache = walkcache.WalkCache(walk_cache, probes,
+                                                   walk_cache_max_age)
+
+    def _open_connection(self, key, factory, alias):
+        connection = None
+        if self._use_pool:
+            health_check = None
+            if self._pool_health_check:
+                health_check = _SnmpConnection.is_alive
+            connection = connection_pool.acquire(
+                    key, self._pool_idle_timeout, health_check)
+            if connection is not None:
+                self._debug('Reusing pooled connection')
+
+        if connection is None:
+            connection = factory()
+            connection.pool_key = key
+
+        self._active_connection = connection
+        return self._cache.register(self._active_connection, alias)
 
     def open_snmp_v2c_connection(self, host, community_string=None, port=161,
                                  timeout=1.0, retries=5, alias=None):
@@ -82,15 +228,22 @@ class SnmpLibrary(_Traps):
         if alias:
             alias = str(alias)
 
-        authentication_data = cmdgen.CommunityData(self.AGENT_NAME,
-                                                   community_string)
-        transport_target = cmdgen.UdpTransportTarget(
-                                        (host, port), timeout, retries)
-
-        connection = _SnmpConnection(authentication_data, transport_target)
-        self._active_connection = connection
-
-        return self._cache.register(self._active_connection, alias)
+        def factory():
+            authentication_data = cmdgen.CommunityData(self.AGENT_NAME,
+                                                       community_string)
+            transport_target = cmdgen.UdpTransportTarget(
+                                            (host, port), timeout, retries)
+            connection = _SnmpConnection(authentication_data,
+                                         transport_target)
+            if self._fast_ber:
+                connection.fast_path = fastpath.FastPath(
+                        host, port, community_string, timeout, retries,
+                        connection.async_cmd_gen)
+            return connection
+
+        key = ('v2c', host, port, timeout, retries, community_string,
+               self._fast_ber)
+        return self._open_connection(key, factory, alias)
 
     # backwards compatibility, will be removed soon
     open_snmp_connection = open_snmp_v2c_connection
@@ -100,7 +253,7 @@ class SnmpLibrary(_Traps):
                                 authentication_protocol=None,
                                 encryption_protocol=None, port=161,
                                 timeout=1.0, retries=5, alias=None,
-                                context_name=null):
+                                context_name=None):
         """Opens a new SNMP v3 Connection to the given host.
 
         If no `port` is given, the default port 161 is used.
@@ -135,6 +288,13 @@ class SnmpLibrary(_Traps):
         if authentication_protocol is not None:
             authentication_protocol = authentication_protocol.upper()
 
+        if encryption_protocol is not None:
+            encryption_protocol = encryption_protocol.upper()
+
+        key = ('v3', host, port, timeout, retries, user, password,
+               encryption_password, authentication_protocol,
+               encryption_protocol, context_name)
+
         try:
             authentication_protocol = {
                 None: cmdgen.usmNoAuthProtocol,
@@ -145,9 +305,6 @@ class SnmpLibrary(_Traps):
             raise RuntimeError('Invalid authentication protocol %s' %
                                authentication_protocol)
 
-        if encryption_protocol is not None:
-            encryption_protocol = encryption_protocol.upper()
-
         try:
             encryption_protocol = {
                 None: cmdgen.usmNoPrivProtocol,
@@ -161,20 +318,21 @@ class SnmpLibrary(_Traps):
             raise RuntimeError('Invalid encryption protocol %s' %
                                encryption_protocol)
 
-        authentication_data = cmdgen.UsmUserData(
-                                    user,
-                                    password,
-                                    encryption_password,
-                                    authentication_protocol,
-                                    encryption_protocol)
+        def factory():
+            authentication_data = cmdgen.UsmUserData(
+                                        user,
+                                        password,
+                                        encryption_password,
+                                        authentication_protocol,
+                                        encryption_protocol)
 
-        transport_target = cmdgen.UdpTransportTarget(
-                                        (host, port), timeout, retries)
+            transport_target = cmdgen.UdpTransportTarget(
+                                            (host, port), timeout, retries)
 
-        conn = _SnmpConnection(authentication_data, transport_target, context_name)
-        self._active_connection = conn
+            return _SnmpConnection(authentication_data, transport_target,
+                                   context_name)
 
-        return self._cache.register(self._active_connection, alias)
+        return self._open_connection(key, factory, alias)
 
     def close_snmp_connection(self):
         """Closes the current connection.
@@ -190,9 +348,26 @@ class SnmpLibrary(_Traps):
 
         This keyword should be used in a test or suite teardown to
         make sure all connections are closed.
+
+        If the library was imported with `connection_pool` enabled, the
+        connections are given back to the pool instead of being closed.
         """
 
-        self._active_connection = self._cache.close_all()
+        if self._use_pool:
+            for connection in self._cache:
+                if connection.closed:
+                    continue
+                if connection.mibs_changed:
+                    # loaded MIBs cannot be unloaded for the next suite
+                    connection.close()
+                    continue
+                connection.prefetched_table = {}
+                connection.table_columns = {}
+                connection_pool.release(connection.pool_key, connection)
+            self._cache.empty_cache()
+            connection_pool.purge(self._pool_idle_timeout)
+        else:
+            self._cache.close_all()
         self._active_connection = None
 
     def switch_snmp_connection(self, index_or_alias):
@@ -223,6 +398,7 @@ class SnmpLibrary(_Traps):
         paths += (path, )
         self._debug('New paths: %s' % ' '.join(paths))
         self._active_connection.builder.setMibPath(*paths)
+        self._active_connection.mibs_changed = True
 
     def preload_mibs(self, *names):
         """Preloads MIBs.
@@ -242,22 +418,29 @@ class SnmpLibrary(_Traps):
         else:
             self._info('Preloading all available MIBs')
         self._active_connection.builder.loadModules(*names)
+        self._active_connection.mibs_changed = True
+
+    def _resolve_oid(self, oid):
+        """Returns the numeric OID tuple of a parsed OID."""
+        if all(isinstance(arc, int) for arc in oid):
+            return tuple(oid)
+        var_binds = self._active_connection.async_cmd_gen.makeReadVarBinds(
+                [oid])
+        return tuple(var_binds[0][0])
 
     def _get(self, oid, idx=(0,), expect_string=False):
 
         if self._active_connection is None:
             raise RuntimeError('No transport host set')
 
-        idx = utils.parse_idx(idx)
-        oid = utils.parse_oid(oid) + idx
+        with profiling.phase('parse_oid'):
+            idx = utils.parse_idx(idx)
+            oid = utils.parse_oid(oid) + idx
 
-        error_indication, error, _, var = \
-            self._active_connection.cmd_gen.getCmd(
-                self._active_connection.authentication_data,
-                self._active_connection.transport_target,
-                oid,
-                contextName=self._active_connection.context_name
-            )
+        with profiling.phase('request'):
+            error_indication, error, _, var = \
+                self._active_connection.coalescer.get(
+                        oid, self._coalescing_window)
 
         if error_indication is not None:
             raise RuntimeError('SNMP GET failed: %s' % error_indication)
@@ -270,16 +453,13 @@ class SnmpLibrary(_Traps):
             raise RuntimeError('Object with OID %s not found' %
                                utils.format_oid(oid))
 
-        if expect_string:
-            if not univ.OctetString().isSuperTypeOf(obj):
-                raise RuntimeError('Returned value is not an octetstring')
-            value = str(obj)
-        elif univ.OctetString().isSuperTypeOf(obj):
-            value = obj.asNumbers()
-        else:
-            value = obj.prettyOut(obj)
+        with profiling.phase('format'):
+            if expect_string:
+                value = values.decode(obj, 'string')
+            else:
+                value = values.decode(obj, self._get_value_format)
 
-        self._info('OID %s has value %s' % (utils.format_oid(oid), value))
+        self._info('OID %s has value %s' % (self._format_oid(oid), value))
 
         return value
 
@@ -296,7 +476,8 @@ class SnmpLibrary(_Traps):
         | ${value}=  | Get | sysDescr | |
         | ${value}=  | Get | ifDescr | 2 |
         """
-        return self._get(oid, idx)
+        with profiling.phase('get'):
+            return self._get(oid, idx)
 
     def get_display_string(self, oid, idx=(0,)):
         """Does a SNMP GET request for the specified 'oid' and convert it
@@ -304,19 +485,94 @@ class SnmpLibrary(_Traps):
 
         For more information and an example see `Get`.
         """
-        return self._get(oid, idx, expect_string=True)
+        with profiling.phase('get'):
+            return self._get(oid, idx, expect_string=True)
+
+    def _get_table_rows(self, entry, indexes, names):
+        if self._active_connection is None:
+            raise RuntimeError('No transport host set')
+
+        columns = tables.entry_columns(self._active_connection,
+                                       utils.parse_oid(entry))
+        columns = tables.select_columns(columns, names)
+        requests = [(row, name, oid + utils.parse_idx(idx))
+                    for row, idx in enumerate(indexes)
+                    for name, oid in columns]
+
+        rows = [dict() for _ in indexes]
+        for i in range(0, len(requests), tables.MAX_VAR_BINDS):
+            chunk = requests[i:i + tables.MAX_VAR_BINDS]
+            error_indication, error, _, var_binds = \
+                self._active_connection.cmd_gen.getCmd(
+                    self._active_connection.authentication_data,
+                    self._active_connection.transport_target,
+                    *[oid for _, _, oid in chunk],
+                    contextName=self._active_connection.context_name
+                )
+
+            if error_indication is not None:
+                raise RuntimeError('SNMP GET failed: %s' % error_indication)
+            if error != 0:
+                raise RuntimeError('SNMP GET failed: %s' %
+                                   error.prettyPrint())
+
+            for (row, name, _), (oid, obj) in zip(chunk, var_binds):
+                # noSuchObject and noSuchInstance
+                if isinstance(obj, (rfc1905.NoSuchObject,
+                                    rfc1905.NoSuchInstance)):
+                    continue
+                rows[row][name] = values.decode(obj, self._walk_value_format)
+
+        for idx, row in zip(indexes, rows):
+            self._info('Row %s of %s: %s' % (idx, entry, row))
+        return rows
+
+    def get_table_row(self, entry, idx, *columns):
+        """Gets the given `columns` of one row of a table.
+
+        `entry` is the entry of the table, e.g. `IF-MIB::ifEntry`, and `idx`
+        the index of the row. The columns are given by name or by number.
+        If no columns are given, all columns of the entry are fetched. The
+        MIB describing the table has to be available.
+
+        All columns are fetched with a single GET request. The row is
+        returned as a dictionary with the column names as keys and values
+        like the ones returned by `Walk`. Columns which do not exist in the
+        row are left out.
+
+        Examples:
+        | ${row}= | Get Table Row | IF-MIB::ifEntry | 2 | | |
+        | ${row}= | Get Table Row | IF-MIB::ifEntry | 2 | ifDescr | ifOperStatus |
+        | Should Be Equal | ${row['ifOperStatus']} | up | | | |
+        """
+        return self._get_table_rows(entry, [idx], columns)[0]
+
+    def get_table_rows(self, entry, indexes, *columns):
+        """Gets the given `columns` of several rows of a table.
+
+        `indexes` is a list (or a comma separated string) of row indexes.
+        The rows are fetched with as few GET requests as possible and
+        returned as a list of dictionaries. See `Get Table Row` for details.
+
+        Example:
+        | ${rows}= | Get Table Rows | IF-MIB::ifEntry | 1,2,3 | ifDescr | ifOperStatus |
+        """
+        if utils.is_string(indexes):
+            indexes = [i.strip() for i in indexes.split(',') if i.strip()]
+        return self._get_table_rows(entry, list(indexes), columns)
 
     def _set(self, *oid_values):
         for oid, value in oid_values:
-            self._info('Setting OID %s to %s' % (utils.format_oid(oid), value))
+            self._info('Setting OID %s to %s' % (self._format_oid(oid), value))
 
-        error_indication, error, _, var = \
-            self._active_connection.cmd_gen.setCmd(
-                self._active_connection.authentication_data,
-                self._active_connection.transport_target,
-                *oid_values,
-                contextName=self._active_connection.context_name
-            )
+        with profiling.phase('request'):
+            error_indication, error, _, var = \
+                self._active_connection.cmd_gen.setCmd(
+                    self._active_connection.authentication_data,
+                    self._active_connection.transport_target,
+                    *oid_values,
+                    contextName=self._active_connection.context_name
+                )
 
         if error_indication is not None:
             raise RuntimeError('SNMP SET failed: %s' % error_indication)
@@ -342,9 +598,11 @@ class SnmpLibrary(_Traps):
         if self._active_connection is None:
             raise RuntimeError('No transport host set')
 
-        idx = utils.parse_idx(idx)
-        oid = utils.parse_oid(oid) + idx
-        self._set((oid, value))
+        with profiling.phase('set'):
+            with profiling.phase('parse_oid'):
+                idx = utils.parse_idx(idx)
+                oid = utils.parse_oid(oid) + idx
+            self._set((oid, value))
 
     def set_many(self, *oid_value_pairs):
         """ Does a SNMP SET request with multiple values.
@@ -364,15 +622,24 @@ class SnmpLibrary(_Traps):
         if self._active_connection is None:
             raise RuntimeError('No transport host set')
 
-        args = list(oid_value_pairs)
+        with profiling.phase('set'):
+            with profiling.phase('parse_oid'):
+                oid_values = self._parse_oid_values(oid_value_pairs)
+            self._set(*oid_values)
+
+    def _parse_oid_values(self, args):
         oid_values = list()
+        i = 0
         try:
-            while len(args):
-                oid = args.pop(0)
-                value = args.pop(0)
-                possible_idx = args[0] if len(args) > 0 else ''
-                if possible_idx.startswith('idx='):
-                    idx = args.pop(0)[4:]
+            while i < len(args):
+                oid = args[i]
+                value = args[i + 1]
+                i += 2
+                possible_idx = args[i] if i < len(args) else ''
+                if utils.is_string(possible_idx) and \
+                        possible_idx.startswith('idx='):
+                    idx = possible_idx[4:]
+                    i += 1
                 else:
                     idx = (0,)
                 idx = utils.parse_idx(idx)
@@ -382,44 +649,460 @@ class SnmpLibrary(_Traps):
             raise RuntimeError('Invalid OID/value(/index) format')
         if len(oid_values) < 1:
             raise RuntimeError('You must specify at least one OID/value pair')
+        return oid_values
 
-        self._set(*oid_values)
+    def bulk_set(self, rows, max_var_binds=50, max_bytes=1200,
+                 max_in_flight=1, fail=True):
+        """Does SNMP SET requests for a large number of values.
 
-    def walk(self, oid):
-        """Does a SNMP WALK request and returns the result as OID list."""
+        `rows` is the path of a CSV file, of a JSON lines file (ending in
+        `.json` or `.jsonl`) or a list. Every row consists of an OID, an
+        optional type and a value, e.g.:
+
+        | .1.3.6.1.2.1.2.2.1.7.1,integer,1 |
+        | IF-MIB::ifAlias.1,,uplink |
+        | {"oid": "SNMPv2-MIB::sysName.0", "type": "octetstring", "value": "sw1"} |
+
+        A CSV file may start with the header line `oid,type,value`. Valid
+        types are the ones of the `Convert To XXX` keywords, e.g.
+        `Integer32` or `IP Address`, and `ObjectIdentifier`. Without a type,
+        the value is converted like by `Set`.
+
+        The rows are read one by one and packed into SET requests of at most
+        `max_var_binds` variable bindings and `max_bytes` encoded bytes of
+        variable bindings. At most `max_in_flight` requests are outstanding
+        at any time. Requests which are too big for the agent are split.
+
+        Every request is applied completely or not at all. If the agent
+        rejects a row, that row is reported as failed and the other rows of
+        the request are sent again. Returns the failed rows as list of
+        (row number, OID, error) tuples. If `fail` is true and there are
+        failed rows, the keyword fails and lists them.
+
+        Examples:
+        | Bulk Set | ${CURDIR}/vlans.csv | | |
+        | ${failed}= | Bulk Set | ${CURDIR}/ports.jsonl | max_in_flight=4 | fail=False |
+        """
 
         if self._active_connection is None:
             raise RuntimeError('No transport host set')
 
-        self._info('Walk starts at OID %s' % (oid, ))
-        oid = utils.parse_oid(oid)
+        bulk = bulkset.BulkSet(self._active_connection, int(max_var_binds),
+                               int(max_bytes))
+        bulk.run(rows, int(max_in_flight))
+        self._info('Set %d rows with %d requests, %d rows failed' %
+                   (bulk.rows, bulk.requests, len(bulk.failures)))
+
+        lines = ['row %d %s: %s' % failure for failure in bulk.failures]
+        if lines:
+            self._info('\n'.join(lines))
+        if lines and robot.utils.is_truthy(fail):
+            raise RuntimeError('SNMP SET failed for %d rows:\n%s' %
+                               (len(lines), '\n'.join(lines)))
+        return bulk.failures
+
+    def _walk(self, oid):
+        if self._active_connection is None:
+            raise RuntimeError('No transport host set')
 
-        error_indication, error, _, var_bind_table = \
-            self._active_connection.cmd_gen.nextCmd(
-                self._active_connection.authentication_data,
-                self._active_connection.transport_target,
-                oid,
-                contextName=self._active_connection.context_name
-            )
+        self._info('Walk starts at OID %s' % (oid, ))
+        with profiling.phase('parse_oid'):
+            oid = utils.parse_oid(oid)
+
+        with profiling.phase('request'):
+            error_indication, error, _, var_bind_table = \
+                self._active_connection.cmd_gen.nextCmd(
+                    self._active_connection.authentication_data,
+                    self._active_connection.transport_target,
+                    oid,
+                    contextName=self._active_connection.context_name
+                )
 
         if error_indication:
             raise RuntimeError('SNMP WALK failed: %s' % error_indication)
         if error != 0:
             raise RuntimeError('SNMP WALK failed: %s' % error.prettyPrint())
 
+        return [var_bind_table_row[0] for var_bind_table_row in var_bind_table]
+
+    def _cached_walk(self, oid):
+        if self._active_connection is None:
+            raise RuntimeError('No transport host set')
+
+        root = self._resolve_oid(utils.parse_oid(oid))
+        with profiling.phase('cache'):
+            try:
+                entry = self._walk_cache.lookup(self._active_connection,
+                                                root)
+            except RuntimeError as e:
+                self._info('Walk of OID %s is not cached: %s' % (oid, e))
+                entry = None
+        if entry is not None and entry.var_binds is not None:
+            self._info('Walk of OID %s read from cache %s' %
+                       (oid, entry.path))
+            # resolve the values with the MIBs, like a live walk
+            with profiling.phase('cache'):
+                return [tuple(var_bind) for var_bind in
+                        self._active_connection.async_cmd_gen.unmakeVarBinds(
+                            entry.var_binds, True, True)]
+
+        var_binds = self._walk(oid)
+        if entry is not None and entry.store(var_binds):
+            self._debug('Walk of OID %s written to cache %s' %
+                        (oid, entry.path))
+        return var_binds
+
+    def _format_oid(self, oid):
+        if not self._symbolic_oids or \
+                not all(isinstance(arc, int) for arc in oid):
+            return utils.format_oid(oid)
+        if self._active_connection is not None:
+            builder = self._active_connection.builder
+        else:
+            builder = symbols.default_builder()
+        return symbols.format_symbolic(builder, tuple(oid))
+
+    def _format_var_bind(self, oid, obj):
+        return (self._format_oid(oid),
+                values.decode(obj, self._walk_value_format))
+
+    def _format_walk(self, var_binds):
         oids = list()
-        for var_bind_table_row in var_bind_table:
-            oid, obj = var_bind_table_row[0]
-            oid = ''.join(('.', str(oid)))
-            if obj.isSuperTypeOf(rfc1902.ObjectIdentifier()):
-                obj = ''.join(('.', str(obj)))
-            else:
-                obj = obj.prettyOut(obj)
+        for oid, obj in var_binds:
+            with profiling.phase('format'):
+                oid, obj = self._format_var_bind(oid, obj)
             self._info('%s: %s' % (oid, obj))
             oids.append((oid, obj))
 
         return oids
 
+    def _walk_range(self, oid, start=None, end=None, max_rows=None,
+                    stop=None):
+        if self._active_connection is None:
+            raise RuntimeError('No transport host set')
+
+        self._info('Walk starts at OID %s' % (start or oid, ))
+        with profiling.phase('parse_oid'):
+            root = self._resolve_oid(utils.parse_oid(oid))
+            if start is not None:
+                start = self._resolve_oid(utils.parse_oid(start))
+            if end is not None:
+                end = self._resolve_oid(utils.parse_oid(end))
+        if max_rows is not None:
+            max_rows = int(max_rows)
+            if max_rows < 1:
+                raise RuntimeError('Invalid max_rows %d' % max_rows)
+
+        predicate = None
+        if utils.is_string(stop):
+            code = compile(stop, '<stop>', 'eval')
+
+            def predicate(oid, obj):
+                oid, value = self._format_var_bind(oid, obj)
+                return eval(code, {}, {'oid': oid, 'value': value})
+        elif stop is not None:
+            def predicate(oid, obj):
+                return stop(*self._format_var_bind(oid, obj))
+
+        # a start before the subtree begins the walk at the subtree
+        if start is None or start < root:
+            start = root
+        walk_range = walker.WalkRange(root, start, end,
+                                      max_rows=max_rows, stop=predicate)
+        with profiling.phase('request'):
+            walker.walk_ranges(self._active_connection, [walk_range])
+
+        token = None
+        if walk_range.truncated:
+            token = self._format_oid(walk_range.var_binds[-1][0])
+        return walk_range.var_binds, token
+
+    def walk(self, oid, start=None, end=None, max_rows=None, stop=None):
+        """Does a SNMP WALK request and returns the result as OID list.
+
+        By default the whole subtree of `oid` is walked. The walk can be
+        restricted to a range of the subtree:
+
+        - It begins after the OID `start` (which is not part of the result
+          itself).
+        - It ends before the OID `end`.
+        - It stops after `max_rows` OIDs, which must be at least 1.
+        - It stops after the first OID for which the `stop` expression is
+          true. The expression is evaluated in Python with the OID and the
+          value as the variables `oid` and `value`.
+
+        See `Walk Range` for a walk which can be continued.
+
+        Examples:
+        | ${result}= | Walk | .1.3.6.1.2.1.2.2.1.2 | | |
+        | ${result}= | Walk | .1.3.6.1.2.1.2.2.1 | start=.1.3.6.1.2.1.2.2.1.2 | end=.1.3.6.1.2.1.2.2.1.4 |
+        | ${result}= | Walk | .1.3.6.1.2.1.2.2.1.2 | stop=value == 'eth0' | |
+        """
+
+        with profiling.phase('walk'):
+            if start is None and end is None and max_rows is None and \
+                    stop is None:
+                if self._walk_cache is not None:
+                    return self._format_walk(self._cached_walk(oid))
+                return self._format_walk(self._walk(oid))
+            return self._format_walk(
+                    self._walk_range(oid, start, end, max_rows, stop)[0])
+
+    def walk_range(self, oid, start=None, end=None, max_rows=None,
+                   stop=None):
+        """Does a SNMP WALK request which can be continued.
+
+        Returns the result as OID list and a resume token. If the walk was
+        cut short by `max_rows` or by the `stop` expression, the resume token
+        is the last OID of the result. Passing it as `start` continues the
+        walk. Otherwise the token is None.
+
+        See `Walk` for the arguments.
+
+        Example:
+        | ${rows} | ${token}= | Walk Range | .1.3.6.1.2.1.2.2 | max_rows=1000 |
+        | ${rows} | ${token}= | Walk Range | .1.3.6.1.2.1.2.2 | start=${token} | max_rows=1000 |
+        """
+
+        with profiling.phase('walk'):
+            var_binds, token = self._walk_range(oid, start, end, max_rows,
+                                                stop)
+            return self._format_walk(var_binds), token
+
+    def parallel_walk(self, oid, partitions=8, max_in_flight=None, arcs=None):
+        """Does a SNMP WALK request by walking parts of the subtree in
+        parallel.
+
+        A walk is a chain of requests, each one depending on the response to
+        the previous one. For agents with a high latency, it is much faster
+        to split the subtree into `partitions` disjoint parts and to walk them
+        concurrently. At most `max_in_flight` requests are outstanding at any
+        time, by default one per part.
+
+        The subtree is split at the given child `arcs` of `oid`, e.g. the
+        column numbers of a table entry. Otherwise, the split points are
+        found by probing the agent with two GETNEXT requests.
+
+        The result is the same as the one of `Walk`.
+
+        Examples:
+        | ${result}= | Parallel Walk | IF-MIB::ifTable | | |
+        | ${result}= | Parallel Walk | .1.3.6.1.2.1.2.2.1 | arcs=2,5,8,10 | |
+        | ${result}= | Parallel Walk | .1.3.6.1.2.1.31 | partitions=16 | max_in_flight=4 |
+        """
+
+        if self._active_connection is None:
+            raise RuntimeError('No transport host set')
+
+        with profiling.phase('walk'):
+            self._info('Parallel walk starts at OID %s' % (oid, ))
+            root = self._resolve_oid(utils.parse_oid(oid))
+            partitions = int(partitions)
+            if max_in_flight is not None:
+                max_in_flight = int(max_in_flight)
+
+            if arcs is None:
+                node, arcs = walker.probe_child_arcs(
+                        self._active_connection, root, partitions)
+            else:
+                node = root
+                if utils.is_string(arcs):
+                    arcs = arcs.replace(',', ' ').split()
+            ranges = walker.split_subtree(root, node, arcs)
+            self._debug('Walking %d ranges' % len(ranges))
+
+            with profiling.phase('request'):
+                walker.walk_ranges(self._active_connection, ranges,
+                                   max_in_flight)
+
+            var_binds = list()
+            for walk_range in ranges:
+                var_binds.extend(walk_range.var_binds)
+            return self._format_walk(var_binds)
+
+    def record_walk_snapshot(self, oid, path):
+        """Walks the given `oid` and writes the result to a snapshot file.
+
+        The snapshot is sorted by OID and can be served by `Start SNMP
+        Simulator`. The snapshot uses the snmprec format of snmpsim. Returns
+        the number of recorded OIDs.
+
+        Example:
+        | Record Walk Snapshot | .1.3 | ${CURDIR}/device.snmprec |
+        """
+
+        count = snapshot.write_snapshot(path, self._walk(oid))
+        self._info('Recorded %d OIDs to %s' % (count, path))
+        return count
+
+    def compare_walk_to_snapshot(self, oid, snapshot_file, ignore=None,
+                                 max_differences=None, fail=True):
+        """Walks the given `oid` and compares the result with a snapshot.
+
+        The snapshot is usually recorded with `Record Walk Snapshot`. Only
+        the part of the snapshot below `oid` is compared. The walk and the
+        snapshot are compared while walking, thus even huge tables need
+        little memory.
+
+        `ignore` is a list (or a comma separated string) of glob patterns.
+        Matching OIDs, e.g. volatile counters, are not compared. The
+        comparison stops after `max_differences` differences.
+
+        Returns the differences as list of (kind, OID, expected, actual)
+        tuples, where kind is `added`, `removed` or `changed` and the
+        values are in snapshot notation (`tag|value`). If `fail` is true
+        and there are differences, the keyword fails and lists them.
+
+        Example:
+        | Compare Walk To Snapshot | .1.3.6.1.2.1.2.2 | ${CURDIR}/golden.snmprec | ignore=.1.3.6.1.2.1.2.2.1.1[0-9].* |
+        """
+
+        if self._active_connection is None:
+            raise RuntimeError('No transport host set')
+
+        self._info('Comparing walk of OID %s with %s' % (oid, snapshot_file))
+        root = self._resolve_oid(utils.parse_oid(oid))
+        if ignore is None:
+            ignore = []
+        elif utils.is_string(ignore):
+            ignore = [p.strip() for p in ignore.split(',') if p.strip()]
+        if max_differences is not None:
+            max_differences = int(max_differences)
+
+        diff = snapshot.SnapshotDiff(root, snapshot_file, ignore,
+                                     max_differences)
+        walker.walk_ranges(self._active_connection, [diff])
+        diff.finish()
+
+        lines = list()
+        for kind, oid, expected, actual in diff.differences:
+            if kind == 'added':
+                lines.append('+ %s: %s' % (oid, actual))
+            elif kind == 'removed':
+                lines.append('- %s: %s' % (oid, expected))
+            else:
+                lines.append('~ %s: %s != %s' % (oid, expected, actual))
+        if lines:
+            self._info('\n'.join(lines))
+        if lines and robot.utils.is_truthy(fail):
+            raise AssertionError(
+                    'Walk differs from snapshot in %d OIDs%s:\n%s' %
+                    (len(lines), diff.truncated and ' (or more)' or '',
+                     '\n'.join(lines)))
+        return diff.differences
+
+    def start_snmp_simulator(self, snapshot_file, port=0, host='127.0.0.1',
+                             count=1, latency=0):
+        """Starts simulated SNMP agents serving a snapshot file.
+
+        A snapshot can be recorded with `Record Walk Snapshot`. The simulated
+        agents answer SNMP v1 and v2c GET, GETNEXT, GETBULK and SET requests
+        with any community string.
+
+        `count` agents are started. If `port` is 0, each agent uses a free
+        port, otherwise the agents use consecutive ports starting at `port`.
+        The `latency` is added to every response of these agents. All
+        simulated agents of a test suite are served by one thread.
+
+        Returns the port of the agent or a list of ports if `count` is
+        greater than 1.
+
+        Example:
+        | ${port}= | Start SNMP Simulator | ${CURDIR}/device.snmprec |
+        | Open SNMP v2c Connection | 127.0.0.1 | public | port=${port} |
+        """
+
+        port = int(port)
+        count = int(count)
+        latency = robot.utils.timestr_to_secs(latency)
+
+        if self._simulator is None:
+            self._simulator = Simulator()
+            self._simulator.start()
+
+        ports = list()
+        for i in range(count):
+            ports.append(self._simulator.add_agent(
+                    snapshot_file, host, port + i if port else 0, latency))
+        self._info('Simulating %d agents of %s' % (count, snapshot_file))
+
+        if count == 1:
+            return ports[0]
+        return ports
+
+    def stop_snmp_simulator(self):
+        """Stops all agents started by `Start SNMP Simulator`."""
+
+        if self._simulator is not None:
+            self._simulator.stop()
+            self._simulator = None
+
+    def start_snmp_profiling(self, profile_keywords=None, trace_memory=False):
+        """Starts measuring the time spent in the phases of SNMP keywords.
+
+        The phases of `Get`, `Set`, the walk keywords and of received traps
+        are timed: parsing of OIDs, resolution with the MIBs, BER encoding
+        and decoding, waiting for the response, formatting of values and
+        logging.
+
+        `profile_keywords` is a list (or a comma separated string) of the
+        phases `get`, `set`, `walk` and `trap`. During these phases, the
+        Python profiler is enabled as well. If `trace_memory` is true, the
+        memory allocations are traced during these phases, too.
+
+        Only one library instance of a process can profile at a time; the
+        keywords of all its threads are timed.
+
+        See `Stop SNMP Profiling` for the report.
+
+        Example:
+        | Start SNMP Profiling | | |
+        | Start SNMP Profiling | profile_keywords=walk | trace_memory=True |
+        """
+
+        if self._profiler is not None:
+            self._profiler.stop()
+        if profile_keywords is None:
+            profile_keywords = []
+        elif utils.is_string(profile_keywords):
+            profile_keywords = [k.strip().lower()
+                                for k in profile_keywords.split(',')
+                                if k.strip()]
+        self._profiler = profiling.Profiler(
+                profile_keywords, robot.utils.is_truthy(trace_memory))
+        self._profiler.start()
+
+    def stop_snmp_profiling(self, report=None):
+        """Stops measuring the time spent in the phases of SNMP keywords.
+
+        The time per phase is logged. If `report` is given, the time spent
+        in every phase without its nested phases is written to this file as
+        folded stacks, which can be turned into a flame graph by
+        flamegraph.pl or speedscope. The statistics of the Python profiler
+        are written to the file `report` with the suffix `.pstats`.
+        The allocations of the traced phase with the highest memory usage
+        are logged.
+
+        Example:
+        | Stop SNMP Profiling | ${OUTPUT DIR}/${SUITE NAME}.folded |
+        """
+
+        if self._profiler is None:
+            raise RuntimeError('SNMP profiling was not started')
+        profiler = self._profiler
+        profiler.stop()
+        self._profiler = None
+
+        self._info('\n'.join(profiler.summary()))
+        if profiler.memory is not None:
+            self._info('Top memory allocations:\n%s' %
+                       '\n'.join(str(s) for s in profiler.memory[:10]))
+        if report is not None:
+            profiler.write_folded(report)
+            self._info('Wrote profiling report to %s' % report)
+            if profiler.cprofile is not None:
+                profiler.cprofile.dump_stats(report + '.pstats')
+
     def prefetch_oid_table(self, oid):
         """Prefetch the walk result of the given oid.
 
@@ -431,19 +1114,28 @@ class SnmpLibrary(_Traps):
         self._active_connection.prefetched_table[oid] = oids
 
     def find_oid_by_value(self, oid, value, strip=False):
-        """Return the first OID that matches a value in a list."""
+        """Return the first OID that matches a value in a list.
 
-        if oid in self._active_connection.prefetched_table:
-            oids = self._active_connection.prefetched_table[oid]
-        else:
-            oids = self.walk(oid)
+        Unless the table was prefetched with `Prefetch OID Table`, the walk
+        stops at the first match.
+        """
 
-        for oid in oids:
-            s = str(oid[1])
+        def matches(candidate):
+            s = str(candidate)
             if strip is True:
                 s = s.strip()
-            if s == str(value):
-                return oid[0]
+            return s == str(value)
+
+        if oid in self._active_connection.prefetched_table:
+            oids = self._active_connection.prefetched_table[oid]
+            for oid in oids:
+                if matches(oid[1]):
+                    return oid[0]
+        else:
+            var_binds, token = self._walk_range(
+                    oid, stop=lambda oid, value: matches(value))
+            if token is not None:
+                return token
 
         raise RuntimeError('Value "%s" not found.' % value)
 
@@ -476,28 +1168,57 @@ class SnmpLibrary(_Traps):
 
         data = islice(args, 0, None, 2)
         match = islice(args, 1, None, 2)
+        table_index = tables.TableIndex(index_length, dict(enumerate(data)))
+        return table_index.find_one(dict(enumerate(match)))
 
-        l = list()
-        for e in zip(data, match):
-            # match our desired value
-            d = [x for x in e[0] if x[1] == e[1]]
+    def build_table_index(self, index_length, **columns):
+        """Builds an index of walked table columns for `Find Indexes`.
 
-            # we only need the index part of the oid
-            d = [(utils.parse_oid(x[0])[-int(index_length):]) for x in d]
+        The columns are given as named arguments, the name of the column
+        and its walk result. `index_length` is the length of the index part
+        of the OIDs, see `Find Index`. The walk results are parsed only
+        once, thus many lookups are much faster than with `Find Index`.
 
-            # now convert the list of indices to a set
-            d = set(d)
-            l.append(d)
+        Example:
+        | ${a}= | Walk | ${oidOfA} | |
+        | ${b}= | Walk | ${oidOfB} | |
+        | ${index}= | Build Table Index | 1 | a=${a} | b=${b} |
+        """
+        table_index = tables.TableIndex(index_length, columns)
+        self._info('Indexed %d rows of %d columns' %
+                   (len(table_index.indexes), len(columns)))
+        return table_index
 
-        # intersect all sets
-        s = set(l[0]).intersection(*l[1:])
+    def find_indexes(self, table_index, queries, all_matches=False):
+        """Searches the indexes of many rows in a table index.
 
-        if len(s) == 0:
-            raise RuntimeError('No index found for the given matches')
-        if len(s) > 1:
-            raise RuntimeError('Ambiguous match. Found %d matching indices' %
-                               len(s))
-        return s.pop()
+        `table_index` is built by `Build Table Index`. `queries` is a list
+        of dictionaries, each mapping column names to the values the row
+        must have. Returns a list with the index of the matching row for
+        every query. Like `Find Index`, it fails if no row or more than one
+        row matches a query.
+
+        If `all_matches` is true, a list of the indexes of all matching
+        rows, which may be empty, is returned for every query instead.
+
+        Example:
+        | ${q1}= | Create Dictionary | a=2 | b=3 |
+        | ${q2}= | Create Dictionary | a=2 | b=5 |
+        | ${queries}= | Create List | ${q1} | ${q2} |
+        | ${indexes}= | Find Indexes | ${index} | ${queries} |
+        | ${rows}= | Find Indexes | ${index} | ${queries} | all_matches=True |
+        """
+        if isinstance(queries, dict):
+            queries = [queries]
+        if robot.utils.is_truthy(all_matches):
+            return [table_index.find(query) for query in queries]
+        indexes = list()
+        for i, query in enumerate(queries):
+            try:
+                indexes.append(table_index.find_one(query))
+            except RuntimeError as e:
+                raise RuntimeError('Query %d %s: %s' % (i + 1, query, e))
+        return indexes
 
     def get_index_from_oid(self, oid, length=1):
         """Return last part of oid.
@@ -674,7 +1395,8 @@ class SnmpLibrary(_Traps):
         if level is None:
             level = self._default_log_level
         if msg != '':
-            print('*%s* %s' % (level.upper(), msg))
+            with profiling.phase('log'):
+                print('*%s* %s' % (level.upper(), msg))
 
     def _is_valid_log_level(self, level, raise_if_invalid=False):
         if level is None:
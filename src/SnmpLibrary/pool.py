@@ -0,0 +1,90 @@
+# Copyright 2026 Kontron Europe GmbH
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+import threading
+
+
+class _ConnectionPool:
+    """Process-wide pool of idle SNMP connections.
+
+    Connections are stored by a key which identifies the remote agent and the
+    credentials used to talk to it. A connection handed out by `acquire` is
+    owned by the caller until it is given back with `release`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._idle = dict()
+
+    def acquire(self, key, idle_timeout=None, health_check=None):
+        """Returns an idle connection for `key` or None.
+
+        Connections which were idle for longer than `idle_timeout` seconds or
+        for which `health_check` returns False are closed and dropped.
+        """
+        while True:
+            with self._lock:
+                entries = self._idle.get(key)
+                if not entries:
+                    return None
+                connection, released = entries.pop()
+                if not entries:
+                    del self._idle[key]
+
+            if idle_timeout is not None and \
+                    time.time() - released > idle_timeout:
+                connection.close()
+                continue
+            if health_check is not None and not health_check(connection):
+                connection.close()
+                continue
+            return connection
+
+    def release(self, key, connection):
+        """Gives a connection back to the pool."""
+        with self._lock:
+            self._idle.setdefault(key, []).append((connection, time.time()))
+
+    def purge(self, idle_timeout=None):
+        """Closes idle connections.
+
+        If `idle_timeout` is None all idle connections are closed, otherwise
+        only those which were idle for longer than `idle_timeout` seconds.
+        """
+        now = time.time()
+        expired = list()
+        with self._lock:
+            for key in list(self._idle):
+                keep = list()
+                for connection, released in self._idle[key]:
+                    if idle_timeout is None or now - released > idle_timeout:
+                        expired.append(connection)
+                    else:
+                        keep.append((connection, released))
+                if keep:
+                    self._idle[key] = keep
+                else:
+                    del self._idle[key]
+
+        for connection in expired:
+            connection.close()
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(entries) for entries in self._idle.values())
+
+
+# There is only one pool per process, shared between all library instances.
+connection_pool = _ConnectionPool()
@@ -0,0 +1,210 @@
+# Copyright 2026 Kontron Europe GmbH
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Timing of the phases of SNMP requests.
+#
+# The library wraps the phases of its keywords (OID parsing, the request,
+# value formatting, logging) in `phase(name)`. While a profiler is active,
+# the phases are timed with a stack of timers: the time of a phase without
+# the time of its nested phases is added to its call path, e.g.
+# `get;request;ber_decode`. These folded stacks are the input format of
+# flamegraph.pl and speedscope.
+#
+# pysnmp does the BER encoding, the BER decoding and the MIB resolution
+# inside the request. While profiling, the functions doing these are wrapped
+# in phases, too. The remaining time of the request is spent waiting for
+# the response in the dispatcher.
+#
+# The wrapped functions are patched in their modules, so only one profiler
+# can be active in a process. The phases of keywords running in different
+# threads are timed on a stack per thread.
+
+import cProfile
+import importlib
+import threading
+import time
+import tracemalloc
+
+# (module, class or None, function, phase) of the wrapped functions
+_WRAPPED = (
+    ('pyasn1.codec.ber.encoder', None, 'encode', 'ber_encode'),
+    ('pyasn1.codec.ber.decoder', None, 'decode', 'ber_decode'),
+    ('pysnmp.hlapi.varbinds', 'CommandGeneratorVarBinds', 'makeVarBinds',
+     'mib_resolve'),
+    ('pysnmp.hlapi.varbinds', 'CommandGeneratorVarBinds', 'unmakeVarBinds',
+     'mib_resolve'),
+)
+
+_profiler = None
+_profiler_lock = threading.Lock()
+
+
+class _NoPhase:
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+_NO_PHASE = _NoPhase()
+
+
+class _Phase:
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.profiler.enter(self.name)
+
+    def __exit__(self, *exc_info):
+        self.profiler.exit()
+
+
+def phase(name):
+    """Returns a context manager timing the phase `name`.
+
+    Without an active profiler, this is a no-op.
+    """
+    if _profiler is None:
+        return _NO_PHASE
+    return _Phase(_profiler, name)
+
+
+def _timed(name, func):
+    def wrapper(*args, **kwargs):
+        with phase(name):
+            return func(*args, **kwargs)
+    wrapper.__wrapped__ = func
+    return wrapper
+
+
+class Profiler:
+    """Collects the time per call path of phases.
+
+    If the name of an outermost phase is in `profile`, cProfile and
+    tracemalloc (if `trace_memory` is true) are enabled during that phase.
+    """
+
+    def __init__(self, profile=(), trace_memory=False):
+        self.folded = dict()
+        self.calls = dict()
+        self.profile = set(profile)
+        self.trace_memory = trace_memory
+        self.cprofile = None
+        self.memory = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._capturing = False
+        self._patched = list()
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = list()
+        return stack
+
+    def enter(self, name):
+        stack = self._stack()
+        path = stack and stack[-1][0] + ';' + name or name
+        captured = False
+        if not stack and name in self.profile:
+            captured = self._start_capture()
+        stack.append([path, time.perf_counter(), 0.0, captured])
+
+    def exit(self):
+        stack = self._stack()
+        path, started, children, captured = stack.pop()
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.folded[path] = \
+                self.folded.get(path, 0.0) + elapsed - children
+            calls, total = self.calls.get(path, (0, 0.0))
+            self.calls[path] = (calls + 1, total + elapsed)
+        if stack:
+            stack[-1][2] += elapsed
+        elif captured:
+            self._stop_capture()
+
+    def _start_capture(self):
+        # cProfile and tracemalloc capture one phase at a time
+        with self._lock:
+            if self._capturing:
+                return False
+            self._capturing = True
+        if self.cprofile is None:
+            self.cprofile = cProfile.Profile()
+        self.cprofile.enable()
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        return True
+
+    def _stop_capture(self):
+        self.cprofile.disable()
+        if self.trace_memory and tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            if self.memory is None:
+                self.memory = snapshot.statistics('lineno')
+            else:
+                # keep the statistics of the snapshot with the highest usage
+                memory = snapshot.statistics('lineno')
+                if sum(s.size for s in memory) > \
+                        sum(s.size for s in self.memory):
+                    self.memory = memory
+        self._capturing = False
+
+    def start(self):
+        global _profiler
+        with _profiler_lock:
+            if _profiler is not None:
+                raise RuntimeError('SNMP profiling is already active')
+            for module, cls, attr, name in _WRAPPED:
+                obj = importlib.import_module(module)
+                if cls is not None:
+                    obj = getattr(obj, cls)
+                func = getattr(obj, attr)
+                self._patched.append((obj, attr, func))
+                setattr(obj, attr, _timed(name, func))
+            _profiler = self
+
+    def stop(self):
+        global _profiler
+        with _profiler_lock:
+            if _profiler is not self:
+                return
+            _profiler = None
+            for obj, attr, func in reversed(self._patched):
+                setattr(obj, attr, func)
+            del self._patched[:]
+
+    def write_folded(self, path):
+        """Writes the folded stacks with the time in microseconds."""
+        with open(path, 'w') as f:
+            for stack in sorted(self.folded):
+                f.write('%s %d\n' % (stack, round(self.folded[stack] * 1e6)))
+
+    def summary(self):
+        """Returns the lines of a table of the phases."""
+        lines = ['%-40s %8s %12s %12s' %
+                 ('phase', 'calls', 'total [ms]', 'self [ms]')]
+        for stack in sorted(self.calls):
+            calls, total = self.calls[stack]
+            lines.append('%-40s %8d %12.3f %12.3f' %
+                         (stack, calls, total * 1e3,
+                          self.folded[stack] * 1e3))
+        return lines
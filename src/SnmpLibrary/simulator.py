@@ -0,0 +1,426 @@
+# Copyright 2026 Kontron Europe GmbH
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Lightweight SNMP v1/v2c agent simulator.
+
+The simulator answers GET, GETNEXT, GETBULK and SET requests from snapshots
+recorded with the `Record Walk Snapshot` keyword (see snapshot.py) or from
+in-memory tables. SET requests can only change existing OIDs. Any number of
+simulated agents, each listening on its own UDP port, are served by a single
+thread. A configurable latency, jitter and packet loss can be injected to
+mimic remote agents.
+
+SNMP v2c GET, GETNEXT and GETBULK requests are answered by the fast path BER
+codec (see ber.py) with the variable bindings encoded once per OID. Any
+other request is decoded and answered with pyasn1.
+
+It can also be run standalone, e.g. to simulate 200 devices:
+
+    python -m SnmpLibrary.simulator --port 20000 --count 200 device.snmprec
+"""
+
+import argparse
+import bisect
+import heapq
+import random
+import selectors
+import socket
+import sys
+import threading
+import time
+import traceback
+
+from . import ber
+from . import utils
+from . import snapshot
+
+api = utils.LazyModule('pysnmp.proto.api')
+rfc1905 = utils.LazyModule('pysnmp.proto.rfc1905')
+encoder = utils.LazyModule('pyasn1.codec.ber.encoder')
+decoder = utils.LazyModule('pyasn1.codec.ber.decoder')
+error = utils.LazyModule('pyasn1.error')
+
+# placeholders for exceptions, replaced by protocol specific errors
+_NO_SUCH_INSTANCE = object()
+_END_OF_MIB = object()
+
+# errorStatus values
+_TOO_BIG = 1
+_NO_SUCH_NAME = 2
+_NO_CREATION = 11
+
+
+class _Table:
+    """MIB view of one simulated agent.
+
+    The OIDs are kept in a sorted list, thus a GETNEXT lookup is a binary
+    search. OID tuples compare lexicographically, as required by SNMP.
+    """
+
+    def __init__(self, var_binds):
+        self.values = dict((tuple(oid), value) for oid, value in var_binds)
+        self.oids = sorted(self.values)
+        self._encoded = dict()
+
+    def get(self, oid):
+        return self.values.get(oid, _NO_SUCH_INSTANCE)
+
+    def successor(self, oid):
+        idx = bisect.bisect_right(self.oids, oid)
+        if idx < len(self.oids):
+            return self.oids[idx]
+        return None
+
+    def set(self, oid, value):
+        if oid not in self.values:
+            bisect.insort(self.oids, oid)
+        self.values[oid] = value
+        self._encoded.pop(oid, None)
+
+    def encoded(self, oid):
+        """Returns the BER encoded variable binding of a known OID."""
+        var_bind = self._encoded.get(oid)
+        if var_bind is None:
+            var_bind = self._encoded[oid] = ber.encode_var_bind(
+                    oid, *ber.from_asn1(self.values[oid]))
+        return var_bind
+
+
+class Simulator:
+    """Serves any number of simulated agents from a single thread.
+
+    Requests which cannot be decoded are ignored. `errors` counts the
+    requests which could not be handled for any other reason; their
+    tracebacks are written to stderr.
+    """
+
+    def __init__(self, latency=0.0, jitter=0.0, loss=0.0, seed=0,
+                 max_message_size=None, fast_path=True):
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+        self.max_message_size = max_message_size
+        self.fast_path = fast_path
+        self.requests = 0
+        self.dropped = 0
+        self.errors = 0
+        self._random = random.Random(seed)
+        self._agents = dict()
+        self._latencies = dict()
+        self._selector = selectors.DefaultSelector()
+        self._snapshots = dict()
+        self._pending = list()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def add_agent(self, source, host='127.0.0.1', port=0, latency=None):
+        """Adds a simulated agent and returns its UDP port.
+
+        `source` is either the path of a snapshot file or a list of variable
+        bindings. Agents which are created from the same snapshot file share
+        one table, including the values changed by SET requests. The
+        `latency` of the agent defaults to the latency of the simulator.
+        """
+        if utils.is_string(source):
+            if source not in self._snapshots:
+                self._snapshots[source] = \
+                    _Table(snapshot.read_snapshot(source))
+            table = self._snapshots[source]
+        else:
+            table = _Table(source)
+
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.bind((host, int(port)))
+        sock.setblocking(False)
+        self._agents[sock] = table
+        if latency is not None:
+            self._latencies[sock] = latency
+        self._selector.register(sock, selectors.EVENT_READ)
+        return sock.getsockname()[1]
+
+    @property
+    def ports(self):
+        return sorted(sock.getsockname()[1] for sock in self._agents)
+
+    def start(self):
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self.run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        for sock in self._agents:
+            self._selector.unregister(sock)
+            sock.close()
+        self._agents.clear()
+        self._latencies.clear()
+        del self._pending[:]
+
+    def run(self):
+        while not self._stopped.is_set():
+            timeout = 0.1
+            if self._pending:
+                timeout = max(0, min(timeout,
+                                     self._pending[0][0] - time.time()))
+            for key, _ in self._selector.select(timeout):
+                sock = key.fileobj
+                try:
+                    msg, peer = sock.recvfrom(65535)
+                except socket.error:
+                    continue
+                self._receive(sock, msg, peer)
+            now = time.time()
+            while self._pending and self._pending[0][0] <= now:
+                _, _, sock, msg, peer = heapq.heappop(self._pending)
+                sock.sendto(msg, peer)
+
+    def _receive(self, sock, msg, peer):
+        self.requests += 1
+        if self.loss and self._random.random() < self.loss:
+            self.dropped += 1
+            return
+        try:
+            response = self.handle(self._agents[sock], msg)
+        except error.PyAsn1Error:
+            return
+        except Exception:
+            self.errors += 1
+            traceback.print_exc()
+            return
+        if response is None:
+            return
+        delay = self._latencies.get(sock, self.latency)
+        if self.jitter:
+            delay += self._random.uniform(0, self.jitter)
+        if delay:
+            heapq.heappush(self._pending, (time.time() + delay, self.requests,
+                                           sock, response, peer))
+        else:
+            sock.sendto(response, peer)
+
+    def handle(self, table, msg):
+        """Returns the encoded response to the request `msg`.
+
+        Like a real agent, variable bindings are removed from the end of a
+        GETBULK response larger than `max_message_size` (RFC 3416, 4.2.3).
+        Any other response which is too large is replaced by a tooBig error.
+        """
+        if self.fast_path:
+            try:
+                response = self._handle_fast(table, msg)
+            except ber.Unsupported:
+                response = None
+            if response is not None:
+                return response
+
+        version = int(api.decodeMessageVersion(msg))
+        if version not in api.protoModules:
+            return None
+        p_mod = api.protoModules[version]
+        req_msg, _ = decoder.decode(msg, asn1Spec=p_mod.Message())
+        req_pdu = p_mod.apiMessage.getPDU(req_msg)
+        rsp_msg = p_mod.apiMessage.getResponse(req_msg)
+        rsp_pdu = p_mod.apiMessage.getPDU(rsp_msg)
+
+        req_oids = [tuple(oid) for oid, _ in
+                    p_mod.apiPDU.getVarBinds(req_pdu)]
+        updates = ()
+        bulk = False
+
+        if req_pdu.isSameTypeWith(p_mod.GetRequestPDU()):
+            var_binds = [(oid, table.get(oid)) for oid in req_oids]
+        elif req_pdu.isSameTypeWith(p_mod.GetNextRequestPDU()):
+            var_binds = self._next(table, req_oids)
+        elif version == api.protoVersion2c and \
+                req_pdu.isSameTypeWith(p_mod.GetBulkRequestPDU()):
+            var_binds = self._bulk(table, p_mod, req_pdu, req_oids)
+            bulk = True
+        elif req_pdu.isSameTypeWith(p_mod.SetRequestPDU()):
+            var_binds = p_mod.apiPDU.getVarBinds(req_pdu)
+            # like a real agent, nothing is set if any OID is unknown
+            for idx, oid in enumerate(req_oids):
+                if table.get(oid) is _NO_SUCH_INSTANCE:
+                    p_mod.apiPDU.setVarBinds(rsp_pdu, var_binds)
+                    p_mod.apiPDU.setErrorStatus(
+                        rsp_pdu, version and _NO_CREATION or _NO_SUCH_NAME)
+                    p_mod.apiPDU.setErrorIndex(rsp_pdu, idx + 1)
+                    return encoder.encode(rsp_msg)
+            updates = var_binds
+        else:
+            return None
+
+        def encode(var_binds):
+            rsp_msg = p_mod.apiMessage.getResponse(req_msg)
+            rsp_pdu = p_mod.apiMessage.getPDU(rsp_msg)
+            errors = list()
+            var_binds = list(var_binds)
+            for idx, (oid, value) in enumerate(var_binds):
+                if value is _NO_SUCH_INSTANCE or value is _END_OF_MIB:
+                    errors.append((idx + 1, value))
+                    var_binds[idx] = (oid, p_mod.Null(''))
+            p_mod.apiPDU.setVarBinds(rsp_pdu, var_binds)
+            for idx, placeholder in errors:
+                if placeholder is _NO_SUCH_INSTANCE:
+                    p_mod.apiPDU.setNoSuchInstanceError(rsp_pdu, idx)
+                else:
+                    p_mod.apiPDU.setEndOfMibError(rsp_pdu, idx)
+            return encoder.encode(rsp_msg)
+
+        response = self._fit(encode, var_binds, bulk)
+        if response is None:
+            rsp_msg = p_mod.apiMessage.getResponse(req_msg)
+            rsp_pdu = p_mod.apiMessage.getPDU(rsp_msg)
+            p_mod.apiPDU.setVarBinds(rsp_pdu, [])
+            p_mod.apiPDU.setErrorStatus(rsp_pdu, _TOO_BIG)
+            return encoder.encode(rsp_msg)
+
+        for oid, value in updates:
+            table.set(tuple(oid), value)
+        return response
+
+    def _handle_fast(self, table, msg):
+        req = ber.decode_message(msg)
+        if req.version != 1:
+            return None
+
+        oids = [oid for oid, _, _ in req.var_binds]
+        if req.pdu_type == ber.GET_REQUEST:
+            var_binds = [(oid, table.get(oid)) for oid in oids]
+        elif req.pdu_type == ber.GET_NEXT_REQUEST:
+            var_binds = self._next(table, oids)
+        elif req.pdu_type == ber.GET_BULK_REQUEST:
+            var_binds = self._next_bulk(table, oids, req.error_status,
+                                        req.error_index, _END_OF_MIB)
+        else:
+            return None
+
+        encoded = list()
+        for oid, value in var_binds:
+            if value is _NO_SUCH_INSTANCE:
+                encoded.append((oid, ber.NO_SUCH_INSTANCE, None))
+            elif value is _END_OF_MIB:
+                encoded.append((oid, ber.END_OF_MIB_VIEW, None))
+            else:
+                encoded.append(table.encoded(oid))
+        def encode(var_binds):
+            return ber.encode_message(req.version, req.community,
+                                      ber.RESPONSE, req.request_id, 0, 0,
+                                      var_binds)
+
+        response = self._fit(encode, encoded,
+                             req.pdu_type == ber.GET_BULK_REQUEST)
+        if response is None:
+            return ber.encode_message(req.version, req.community,
+                                      ber.RESPONSE, req.request_id,
+                                      _TOO_BIG, 0, [])
+        return response
+
+    def _fit(self, encode, var_binds, bulk):
+        """Returns the response encoded by `encode`, or None if it is
+        larger than `max_message_size`.
+
+        A GETBULK response is cut to the most variable bindings which fit,
+        but at least one.
+        """
+        response = encode(var_binds)
+        if not self.max_message_size or \
+                len(response) <= self.max_message_size:
+            return response
+        if not bulk:
+            return None
+        fits, too_big = 0, len(var_binds)
+        while too_big - fits > 1:
+            count = (fits + too_big) // 2
+            if len(encode(var_binds[:count])) <= self.max_message_size:
+                fits = count
+            else:
+                too_big = count
+        if not fits:
+            return None
+        return encode(var_binds[:fits])
+
+    def _next(self, table, req_oids):
+        var_binds = list()
+        for oid in req_oids:
+            next_oid = table.successor(oid)
+            if next_oid is None:
+                var_binds.append((oid, _END_OF_MIB))
+            else:
+                var_binds.append((next_oid, table.values[next_oid]))
+        return var_binds
+
+    def _bulk(self, table, p_mod, req_pdu, req_oids):
+        non_repeaters = int(p_mod.apiBulkPDU.getNonRepeaters(req_pdu))
+        max_repetitions = int(p_mod.apiBulkPDU.getMaxRepetitions(req_pdu))
+        return self._next_bulk(table, req_oids, non_repeaters,
+                               max_repetitions, rfc1905.endOfMibView)
+
+    def _next_bulk(self, table, req_oids, non_repeaters, max_repetitions,
+                   end_of_mib):
+        non_repeaters = max(0, non_repeaters)
+        var_binds = self._next(table, req_oids[:non_repeaters])
+        repeaters = req_oids[non_repeaters:]
+        for _ in range(max_repetitions):
+            if not repeaters:
+                break
+            exhausted = True
+            for idx, oid in enumerate(repeaters):
+                next_oid = table.successor(oid)
+                if next_oid is None:
+                    var_binds.append((oid, end_of_mib))
+                else:
+                    var_binds.append((next_oid, table.values[next_oid]))
+                    repeaters[idx] = next_oid
+                    exhausted = False
+            if exhausted:
+                break
+        return var_binds
+
+
+def main():
+    parser = argparse.ArgumentParser(
+            description='Serve SNMP agents from snapshot files.')
+    parser.add_argument('snapshots', nargs='+', metavar='SNAPSHOT')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=1161,
+                        help='port of the first agent, the following agents '
+                        'use consecutive ports')
+    parser.add_argument('--count', type=int, default=1,
+                        help='number of agents per snapshot')
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--loss', type=float, default=0.0)
+    args = parser.parse_args()
+
+    simulator = Simulator(args.latency, args.jitter, args.loss)
+    port = args.port
+    for path in args.snapshots:
+        for _ in range(args.count):
+            simulator.add_agent(path, args.host, port)
+            print('%s:%d %s' % (args.host, port, path))
+            port += 1
+    sys.stdout.flush()
+
+    try:
+        simulator.run()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
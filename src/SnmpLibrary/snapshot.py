@@ -0,0 +1,186 @@
+# Copyright 2026 Kontron Europe GmbH
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Snapshots store the result of a walk in the snmprec format, which is also
+# understood by snmpsim. Every line holds one variable binding:
+#
+#   1.3.6.1.2.1.1.1.0|4|Linux
+#   1.3.6.1.2.1.1.2.0|6|1.3.6.1.4.1.8072.3.2.10
+#   1.3.6.1.2.1.2.2.1.6.2|4x|0050569a2b3c
+#
+# The first column is the OID, the second the BER tag of the value type and
+# the third the value itself. A tag suffixed by an 'x' denotes a value in
+# hexadecimal notation. The lines are sorted by OID.
+
+import binascii
+import fnmatch
+
+from . import utils
+from . import walker
+
+rfc1902 = utils.LazyModule('pysnmp.proto.rfc1902')
+
+# tag -> type name in pysnmp.proto.rfc1902
+_TYPES = {
+    2: 'Integer32',
+    4: 'OctetString',
+    6: 'ObjectName',
+    64: 'IpAddress',
+    65: 'Counter32',
+    66: 'Gauge32',
+    67: 'TimeTicks',
+    68: 'Opaque',
+    70: 'Counter64',
+}
+
+
+def _printable(octets):
+    return all(32 <= c < 127 for c in bytearray(octets))
+
+
+def format_record(oid, value):
+    """Returns the snapshot line (without newline) for one variable binding.
+    """
+    tag = value.tagSet[0]
+    tag = tag.tagClass | tag.tagId
+    if tag not in _TYPES:
+        raise RuntimeError('Unsupported value type %s' %
+                           value.__class__.__name__)
+    if tag == 4 or tag == 68:
+        octets = value.asOctets()
+        if _printable(octets):
+            text = octets.decode('ascii')
+        else:
+            text = binascii.hexlify(octets).decode('ascii')
+            tag = '%dx' % tag
+    elif tag == 6:
+        text = str(value)
+    elif tag == 64:
+        text = '.'.join(map(str, value.asNumbers()))
+    else:
+        text = str(int(value))
+    return '%s|%s|%s' % ('.'.join(map(str, oid)), tag, text)
+
+
+def parse_record(line):
+    """Returns the variable binding (OID tuple, value) of a snapshot line."""
+    oid, tag, text = line.rstrip('\r\n').split('|', 2)
+    oid = tuple(int(arc) for arc in oid.split('.'))
+    if tag.endswith('x'):
+        tag = int(tag[:-1])
+        text = binascii.unhexlify(text)
+    else:
+        tag = int(tag)
+    try:
+        cls = getattr(rfc1902, _TYPES[tag])
+    except KeyError:
+        raise RuntimeError('Unsupported tag %s in snapshot line "%s"' %
+                           (tag, line.strip()))
+    if tag in (4, 6, 64, 68):
+        return oid, cls(text)
+    return oid, cls(int(text))
+
+
+def write_snapshot(path, var_binds):
+    """Writes variable bindings sorted by OID to a snapshot file."""
+    records = sorted(((tuple(oid), value) for oid, value in var_binds),
+                     key=lambda record: record[0])
+    with open(path, 'w') as f:
+        for oid, value in records:
+            f.write(format_record(oid, value))
+            f.write('\n')
+    return len(records)
+
+
+def read_snapshot(path):
+    """Yields the variable bindings of a snapshot file in file order."""
+    with open(path) as f:
+        for line in f:
+            if not line.strip() or line.startswith('#'):
+                continue
+            yield parse_record(line)
+
+
+class SnapshotDiff(walker.WalkRange):
+    """Compares the walk of the subtree `root` with a snapshot file.
+
+    The live walk and the sorted snapshot are merged in a single pass. Only
+    the differences are kept in memory, as (kind, OID, expected, actual)
+    tuples, where kind is one of 'added', 'removed' and 'changed' and the
+    values are in snapshot notation (tag|value). OIDs matching one of the
+    glob `ignore` patterns are skipped. The walk is stopped after
+    `max_differences` differences.
+    """
+
+    def __init__(self, root, path, ignore=(), max_differences=None):
+        walker.WalkRange.__init__(self, root, root)
+        self.differences = list()
+        self._ignore = list(ignore)
+        self._max_differences = max_differences
+        self._records = self._read(path)
+        self._expected = next(self._records, None)
+
+    def _read(self, path):
+        # the lines of the subtree are contiguous in a sorted snapshot
+        for oid, value in read_snapshot(path):
+            if oid[:len(self.root)] == self.root:
+                yield oid, value
+            elif oid > self.root:
+                break
+
+    def _is_ignored(self, oid):
+        oid = utils.format_oid(oid)
+        return any(fnmatch.fnmatchcase(oid, p) for p in self._ignore)
+
+    def _text(self, oid, value):
+        return format_record(oid, value).split('|', 1)[1]
+
+    def _report(self, kind, oid, expected, actual):
+        if self._is_ignored(oid):
+            return True
+        if expected is not None:
+            expected = self._text(oid, expected)
+        if actual is not None:
+            actual = self._text(oid, actual)
+        self.differences.append((kind, utils.format_oid(oid), expected,
+                                 actual))
+        if self._max_differences is not None and \
+                len(self.differences) >= self._max_differences:
+            self.truncated = True
+        return not self.truncated
+
+    def _removed_before(self, oid):
+        while self._expected is not None and \
+                (oid is None or self._expected[0] < oid):
+            expected_oid, expected = self._expected
+            self._expected = next(self._records, None)
+            if not self._report('removed', expected_oid, expected, None):
+                return False
+        return True
+
+    def accept(self, oid, value):
+        if not self._removed_before(oid):
+            return False
+        if self._expected is not None and self._expected[0] == oid:
+            expected = self._expected[1]
+            self._expected = next(self._records, None)
+            if self._text(oid, expected) != self._text(oid, value):
+                return self._report('changed', oid, expected, value)
+            return True
+        return self._report('added', oid, None, value)
+
+    def finish(self):
+        """Reports the remaining snapshot OIDs, called after the walk."""
+        if not self.truncated:
+            self._removed_before(None)
@@ -0,0 +1,117 @@
+# Copyright 2026 Kontron Europe GmbH
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Translation of numeric OIDs to symbolic ones, e.g. .1.3.6.1.2.1.2.2.1.2.12
+# to IF-MIB::ifDescr.12.
+#
+# All objects of the MIBs loaded by a MIB builder are put into a trie, one
+# level per OID arc. The longest known prefix of an OID is found by
+# following its arcs from the root, thus a lookup takes O(length of OID)
+# dictionary lookups. The remaining arcs are the instance index. The trie of
+# a MIB builder is cached until further MIBs are loaded.
+
+import weakref
+
+from . import utils
+
+smi_builder = utils.LazyModule('pysnmp.smi.builder')
+
+_tries = weakref.WeakKeyDictionary()
+_default_builder = None
+
+
+class OidTrie:
+    """Maps OID prefixes to (MIB, symbol) tuples."""
+
+    def __init__(self):
+        # every node is a list of the symbol (or None) and the child nodes
+        self._root = [None, dict()]
+        self.build_id = None
+
+    def insert(self, oid, symbol):
+        """Adds `symbol` for `oid`, unless there already is a symbol."""
+        node = self._root
+        for arc in oid:
+            node = node[1].setdefault(arc, [None, dict()])
+        if node[0] is None:
+            node[0] = symbol
+
+    def lookup(self, oid):
+        """Returns the symbol of the longest prefix of `oid` and the
+        remaining arcs.
+
+        The symbol is None if no prefix is known.
+        """
+        node = self._root
+        symbol = None
+        depth = 0
+        for i, arc in enumerate(oid):
+            node = node[1].get(arc)
+            if node is None:
+                break
+            if node[0] is not None:
+                symbol = node[0]
+                depth = i + 1
+        return symbol, tuple(oid[depth:])
+
+
+def build_trie(builder):
+    """Returns a new trie of all objects of the MIBs loaded by `builder`.
+
+    If an OID is defined by several MIBs, the one loaded first wins.
+    """
+    node_cls, instance_cls = builder.importSymbols(
+            'SNMPv2-SMI', 'MibNode', 'MibScalarInstance')
+    trie = OidTrie()
+    trie.build_id = builder.lastBuildId
+    for mib, symbols in list(builder.mibSymbols.items()):
+        for name, symbol in symbols.items():
+            if isinstance(symbol, node_cls) and \
+                    not isinstance(symbol, instance_cls):
+                trie.insert(tuple(symbol.name), (mib, name))
+    return trie
+
+
+def get_trie(builder):
+    """Returns the cached trie of `builder`, it is rebuilt if MIBs were
+    loaded since it was built."""
+    trie = _tries.get(builder)
+    if trie is None or trie.build_id != builder.lastBuildId:
+        trie = _tries[builder] = build_trie(builder)
+    return trie
+
+
+def default_builder():
+    """Returns a MIB builder with SNMPv2-MIB, for OIDs without connection.
+    """
+    global _default_builder
+    if _default_builder is None:
+        _default_builder = smi_builder.MibBuilder()
+        _default_builder.loadModules('SNMPv2-MIB')
+    return _default_builder
+
+
+def format_symbolic(builder, oid):
+    """Returns the symbolic notation of a numeric `oid`, like
+    `IF-MIB::ifDescr.12`.
+
+    The numeric notation is returned if no prefix of `oid` is known.
+    """
+    symbol, index = get_trie(builder).lookup(oid)
+    if symbol is None:
+        return utils.format_oid(oid)
+    text = '%s::%s' % symbol
+    if index:
+        text += utils.format_oid(index)
+    return text
@@ -0,0 +1,158 @@
+# Copyright 2026 Kontron Europe GmbH
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Conceptual tables described by MIBs.
+#
+# The columns of a table entry (e.g. IF-MIB::ifEntry) are looked up once in
+# the MIB builder of a connection and cached in the connection. A row is
+# fetched by a GET request for the column OIDs followed by the row index.
+#
+# A `TableIndex` finds rows by the values of walked columns. The rows are
+# numbered once, and every column maps its values to the sets of row
+# numbers, thus a lookup intersects a few small integer sets instead of
+# scanning and parsing the walks again.
+
+from . import utils
+
+# maximum number of variable bindings in one GET request
+MAX_VAR_BINDS = 50
+
+
+def entry_columns(connection, entry):
+    """Returns the columns of the table entry `entry`.
+
+    `entry` is a parsed OID. The columns are returned as list of (name,
+    OID tuple), ordered by OID.
+    """
+    try:
+        return connection.table_columns[entry]
+    except KeyError:
+        pass
+
+    builder = connection.builder
+    var_binds = connection.async_cmd_gen.makeReadVarBinds([entry])
+    mib, name, suffix = var_binds[0][0].getMibSymbol()
+    oid = tuple(var_binds[0][0].getOid())
+    row_cls, column_cls = builder.importSymbols(
+            'SNMPv2-SMI', 'MibTableRow', 'MibTableColumn')
+    symbols = builder.mibSymbols.get(mib, {})
+    if suffix or not isinstance(symbols.get(name), row_cls):
+        raise RuntimeError('OID %s is not a table entry of a loaded MIB' %
+                           utils.format_oid(oid))
+
+    columns = sorted((tuple(symbol.name), symbol_name)
+                     for symbol_name, symbol in symbols.items()
+                     if isinstance(symbol, column_cls) and
+                     tuple(symbol.name[:-1]) == oid)
+    columns = [(symbol_name, column) for column, symbol_name in columns]
+    connection.table_columns[entry] = columns
+    return columns
+
+
+def select_columns(columns, names):
+    """Returns the columns with the given names or sub-identifiers.
+
+    All columns are returned if no names are given.
+    """
+    if not names:
+        return columns
+    selected = list()
+    for name in names:
+        for column in columns:
+            if name == column[0] or utils.try_int(name) == column[1][-1]:
+                selected.append(column)
+                break
+        else:
+            raise RuntimeError('Table has no column "%s"' % name)
+    return selected
+
+
+def _row_index(oid, index_length):
+    if utils.is_string(oid):
+        return tuple(utils.try_int(arc)
+                     for arc in oid.rsplit('.', index_length)[1:])
+    return tuple(oid)[-index_length:]
+
+
+class TableIndex:
+    """Index of the values of walked table columns.
+
+    `columns` maps column names to walk results, i.e. lists of (OID, value)
+    tuples. The row index is made of the last `index_length` arcs of an
+    OID. Unhashable values, e.g. lists, are compared one by one.
+    """
+
+    def __init__(self, index_length, columns):
+        self.index_length = int(index_length)
+        self.indexes = list()
+        self.columns = dict()
+        self._unhashable = dict()
+        rows = dict()
+        for name, var_binds in columns.items():
+            values = self.columns[name] = dict()
+            unhashable = self._unhashable[name] = list()
+            for oid, value in var_binds:
+                idx = _row_index(oid, self.index_length)
+                row = rows.get(idx)
+                if row is None:
+                    row = rows[idx] = len(self.indexes)
+                    self.indexes.append(idx)
+                try:
+                    values.setdefault(value, set()).add(row)
+                except TypeError:
+                    unhashable.append((value, row))
+
+    def _rows(self, name, value):
+        """Returns the rows whose column `name` equals `value`."""
+        try:
+            values = self.columns[name]
+        except KeyError:
+            raise RuntimeError('Table index has no column "%s"' % name)
+        unhashable = self._unhashable[name]
+        try:
+            rows = values.get(value)
+        except TypeError:
+            rows = set()
+            for other, matching in values.items():
+                if other == value:
+                    rows |= matching
+        if unhashable:
+            rows = set(rows or ())
+            rows.update(row for other, row in unhashable if other == value)
+        return rows
+
+    def find(self, query):
+        """Returns the indexes of all rows matching `query`, which maps
+        column names to values, in the order the rows were indexed."""
+        if not query:
+            raise RuntimeError('Query without columns')
+        matches = list()
+        for name, value in query.items():
+            rows = self._rows(name, value)
+            if not rows:
+                return []
+            matches.append(rows)
+        matches.sort(key=len)
+        rows = matches[0].intersection(*matches[1:])
+        return [self.indexes[row] for row in sorted(rows)]
+
+    def find_one(self, query):
+        """Returns the index of the only row matching `query`."""
+        indexes = self.find(query)
+        if len(indexes) == 0:
+            raise RuntimeError('No index found for the given matches')
+        if len(indexes) > 1:
+            raise RuntimeError('Ambiguous match. Found %d matching indices' %
+                               len(indexes))
+        return indexes[0]
@@ -0,0 +1,432 @@
+# Copyright 2026 Kontron Europe GmbH
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Trap hub, which shares a trap port between several processes.
+
+Only one process can bind the trap port. When test suites are executed in
+parallel, e.g. by pabot, the hub owns the trap port instead and forwards
+the received traps to any number of subscribed processes over a Unix
+socket. Every trap is decoded once by the hub.
+
+A subscriber connects to the socket of the hub and sends its trap filter as
+one JSON line, e.g. `{"host": "10.0.0.1", "oid": [1, 3, 6, 1, 4, 1, 1]}`.
+Once the filter is registered, the hub acknowledges it with the line
+`{"subscribed": true}`; traps received before are not forwarded. Then the
+hub answers with one JSON line for every matching trap:
+
+    {"source": "10.0.0.1", "var_binds": ["1.3.6.1.2.1.1.3.0|67|42", ...]}
+
+The variable bindings are in snapshot notation (see snapshot.py). NULL and
+the exceptions noSuchObject, noSuchInstance and endOfMibView, which have no
+snapshot notation, are given by their tag only, e.g. `1.3.6.1.2.1.1.1.0|5|`.
+The OIDs of any other values which cannot be forwarded are listed in
+`dropped`. A subscriber with an invalid filter, or which does not read its
+traps, is disconnected.
+
+The hub is started on demand by the first process waiting for a trap and
+exits after it had no subscribers for a while. It can also be run
+standalone:
+
+    python -m SnmpLibrary.traphub --port 1620
+"""
+
+import argparse
+import json
+import os
+import selectors
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import robot.utils
+
+from . import ber
+from . import snapshot
+from . import traps
+from . import utils
+
+api = utils.LazyModule('pysnmp.proto.api')
+decoder = utils.LazyModule('pyasn1.codec.ber.decoder')
+
+# seconds without subscribers after which a hub started on demand exits
+IDLE_TIMEOUT = 60
+
+# seconds to wait for a hub started on demand
+START_TIMEOUT = 10
+
+# bytes of undelivered traps after which a subscriber is dropped
+MAX_PENDING = 1024 * 1024
+
+_SUBSCRIBED = b'{"subscribed": true}\n'
+
+# tags of the values given by their tag only
+_EMPTY = (ber.NULL, ber.NO_SUCH_OBJECT, ber.NO_SUCH_INSTANCE,
+          ber.END_OF_MIB_VIEW)
+
+
+def socket_path(host, port):
+    """Returns the path of the Unix socket of the hub for a trap port."""
+    return os.path.join(tempfile.gettempdir(),
+                        'snmplibrary-traphub-%s-%d.sock' % (host, port))
+
+
+def _format_record(oid, value):
+    try:
+        return snapshot.format_record(oid, value)
+    except RuntimeError:
+        tag, _ = ber.from_asn1(value)
+        if tag not in _EMPTY:
+            raise ber.Unsupported('unsupported tag 0x%02x' % tag)
+        return '%s|%d|' % ('.'.join(map(str, oid)), tag)
+
+
+def _parse_record(record):
+    oid, tag, text = record.split('|', 2)
+    if not text and tag.isdigit() and int(tag) in _EMPTY:
+        return (tuple(int(arc) for arc in oid.split('.')),
+                ber.to_asn1(int(tag), None))
+    return snapshot.parse_record(record)
+
+
+def encode_trap(source, var_binds):
+    """Returns the JSON line of a trap."""
+    records = list()
+    dropped = list()
+    for oid, value in var_binds:
+        try:
+            records.append(_format_record(tuple(oid), value))
+        except ber.Unsupported:
+            dropped.append(utils.format_oid(tuple(oid)))
+    trap = {'source': source, 'var_binds': records}
+    if dropped:
+        trap['dropped'] = dropped
+    return (json.dumps(trap) + '\n').encode('utf-8')
+
+
+def decode_trap(line):
+    """Returns the source, the variable bindings and the OIDs of the
+    dropped values of a JSON line."""
+    trap = json.loads(line)
+    return (trap['source'],
+            [_parse_record(record) for record in trap['var_binds']],
+            trap.get('dropped', []))
+
+
+class _Subscriber:
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.buffer = b''
+        self.output = bytearray()
+        self.trap_filter = None
+
+
+class TrapHub:
+    """Receives traps on a UDP port and forwards them to subscribers."""
+
+    def __init__(self, host='0.0.0.0', port=1620, path=None,
+                 idle_timeout=None):
+        self.host = host
+        self.port = port
+        self.path = path or socket_path(host, port)
+        self.idle_timeout = idle_timeout
+        self.received = 0
+        self._subscribers = dict()
+        self._selector = selectors.DefaultSelector()
+        self._udp = None
+        self._server = None
+
+    def open(self):
+        self._udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._udp.bind((self.host, self.port))
+        self._udp.setblocking(False)
+        self._selector.register(self._udp, selectors.EVENT_READ)
+
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._server.bind(self.path)
+        self._server.listen(64)
+        self._server.setblocking(False)
+        self._selector.register(self._server, selectors.EVENT_READ)
+
+    def close(self):
+        for sock in [self._udp, self._server] + list(self._subscribers):
+            if sock is not None:
+                self._selector.unregister(sock)
+                sock.close()
+        self._subscribers.clear()
+        if self._server is not None and os.path.exists(self.path):
+            os.unlink(self.path)
+        self._udp = self._server = None
+
+    def run(self):
+        idle_since = time.time()
+        while True:
+            if self._subscribers:
+                idle_since = time.time()
+            elif self.idle_timeout is not None and \
+                    time.time() - idle_since > self.idle_timeout:
+                return
+            for key, events in self._selector.select(1.0):
+                sock = key.fileobj
+                if sock is self._udp:
+                    self._receive_trap()
+                elif sock is self._server:
+                    self._accept()
+                else:
+                    subscriber = self._subscribers.get(sock)
+                    if subscriber is not None and \
+                            events & selectors.EVENT_WRITE:
+                        self._flush(subscriber)
+                    subscriber = self._subscribers.get(sock)
+                    if subscriber is not None and \
+                            events & selectors.EVENT_READ:
+                        self._receive_filter(subscriber)
+
+    def _accept(self):
+        try:
+            sock, _ = self._server.accept()
+        except socket.error:
+            return
+        # a subscriber which does not read its traps must not block the hub
+        sock.setblocking(False)
+        self._subscribers[sock] = _Subscriber(sock)
+        self._selector.register(sock, selectors.EVENT_READ)
+
+    def _drop(self, subscriber):
+        self._selector.unregister(subscriber.sock)
+        subscriber.sock.close()
+        del self._subscribers[subscriber.sock]
+
+    def _receive_filter(self, subscriber):
+        try:
+            data = subscriber.sock.recv(4096)
+        except BlockingIOError:
+            return
+        except socket.error:
+            data = b''
+        if not data:
+            self._drop(subscriber)
+            return
+        subscriber.buffer += data
+        if subscriber.trap_filter is None and b'\n' in subscriber.buffer:
+            line, subscriber.buffer = subscriber.buffer.split(b'\n', 1)
+            try:
+                trap_filter = json.loads(line.decode('utf-8'))
+            except ValueError:
+                trap_filter = None
+            if not isinstance(trap_filter, dict):
+                self._drop(subscriber)
+                return
+            subscriber.trap_filter = trap_filter
+            self._send(subscriber, _SUBSCRIBED)
+
+    def _send(self, subscriber, line):
+        subscriber.output += line
+        if len(subscriber.output) > MAX_PENDING:
+            self._drop(subscriber)
+        else:
+            self._flush(subscriber)
+
+    def _flush(self, subscriber):
+        """Sends as much of the pending output as the socket takes."""
+        try:
+            sent = subscriber.sock.send(subscriber.output)
+        except BlockingIOError:
+            sent = 0
+        except socket.error:
+            self._drop(subscriber)
+            return
+        del subscriber.output[:sent]
+        events = selectors.EVENT_READ
+        if subscriber.output:
+            events |= selectors.EVENT_WRITE
+        self._selector.modify(subscriber.sock, events)
+
+    def _decode(self, msg):
+        """Returns the variable bindings of a v2c trap, None otherwise.
+
+        The values of traps decoded by the fast path are (tag, value)
+        tuples, see ber.py.
+        """
+        try:
+            trap = ber.decode_message(msg)
+        except ber.Unsupported:
+            pass
+        else:
+            if trap.version != 1 or trap.pdu_type != ber.TRAP_V2:
+                return None
+            return [(oid, (tag, value)) for oid, tag, value in
+                    trap.var_binds]
+
+        if api.decodeMessageVersion(msg) != api.protoVersion2c:
+            return None
+        req, _ = decoder.decode(msg, asn1Spec=api.v2c.Message())
+        pdu = api.v2c.apiMessage.getPDU(req)
+        if not pdu.isSameTypeWith(api.v2c.TrapPDU()):
+            return None
+        return api.v2c.apiTrapPDU.getVarBinds(pdu)
+
+    def _receive_trap(self):
+        try:
+            msg, peer = self._udp.recvfrom(65535)
+        except socket.error:
+            return
+        try:
+            var_binds = self._decode(msg)
+        except Exception:
+            return
+        if var_binds is None:
+            return
+        self.received += 1
+
+        line = None
+        for subscriber in list(self._subscribers.values()):
+            if subscriber.trap_filter is None or not traps.trap_matches(
+                    subscriber.trap_filter, peer[0], var_binds):
+                continue
+            if line is None:
+                line = encode_trap(peer[0], [
+                    (oid, ber.to_asn1(*value) if isinstance(value, tuple)
+                     else value) for oid, value in var_binds])
+            self._send(subscriber, line)
+
+
+def _connect(path):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except socket.error:
+        sock.close()
+        return None
+    return sock
+
+
+def _start_hub(host, port, path):
+    # run the hub as module of this package, also if imported as subpackage
+    package = __name__.rsplit('.', 1)[0]
+    root = os.path.abspath(__file__)
+    for _ in range(package.count('.') + 2):
+        root = os.path.dirname(root)
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+            p for p in (root, env.get('PYTHONPATH')) if p)
+    with open(os.devnull, 'w') as devnull:
+        subprocess.Popen([sys.executable, '-m', __name__,
+                          '--host', host, '--port', str(port),
+                          '--socket', path,
+                          '--idle-timeout', str(IDLE_TIMEOUT)],
+                         env=env, stdout=devnull, stderr=devnull,
+                         start_new_session=True)
+
+
+def subscribe(trap_filter, host='0.0.0.0', port=1620):
+    """Connects to the hub of a trap port, which is started if needed.
+
+    Returns the socket of the subscription once the hub has registered the
+    filter. Processes starting a hub at the same time are serialized by a
+    lock file, thus only one hub is started.
+    """
+    import fcntl
+
+    path = socket_path(host, port)
+    sock = _connect(path)
+    if sock is None:
+        with open(path + '.lock', 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            sock = _connect(path)
+            if sock is None:
+                _start_hub(host, port, path)
+                started = time.time()
+                while sock is None:
+                    if time.time() - started > START_TIMEOUT:
+                        raise RuntimeError('Trap hub for port %d did not '
+                                           'start.' % port)
+                    time.sleep(0.05)
+                    sock = _connect(path)
+
+    try:
+        sock.sendall((json.dumps(trap_filter) + '\n').encode('utf-8'))
+        # read byte by byte, the first trap may follow right away
+        sock.settimeout(START_TIMEOUT)
+        line = b''
+        while not line.endswith(b'\n'):
+            data = sock.recv(1)
+            if not data:
+                raise RuntimeError('Trap hub for port %d rejected the trap '
+                                   'filter.' % port)
+            line += data
+    except socket.timeout:
+        sock.close()
+        raise RuntimeError('Trap hub for port %d did not answer.' % port)
+    except Exception:
+        sock.close()
+        raise
+    if line != _SUBSCRIBED:
+        sock.close()
+        raise RuntimeError('Unexpected answer of the trap hub for port %d: '
+                           '%r' % (port, line))
+    return sock
+
+
+def wait_for_trap(trap_filter, host='0.0.0.0', port=1620, timeout=5.0):
+    """Returns the variable bindings of the first matching trap received by
+    the hub and the OIDs of the values the hub could not forward."""
+    sock = subscribe(trap_filter, host, port)
+    buffer = b''
+    deadline = time.time() + timeout
+    try:
+        while b'\n' not in buffer:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                raise socket.timeout()
+            sock.settimeout(remaining)
+            data = sock.recv(65536)
+            if not data:
+                raise RuntimeError('Trap hub for port %d exited.' % port)
+            buffer += data
+    except socket.timeout:
+        raise AssertionError('No matching trap received in %s.' %
+                             robot.utils.secs_to_timestr(timeout))
+    finally:
+        sock.close()
+    return decode_trap(buffer.split(b'\n', 1)[0].decode('utf-8'))[1:]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+            description='Share a trap port between processes.')
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=1620)
+    parser.add_argument('--socket', help='path of the Unix socket')
+    parser.add_argument('--idle-timeout', type=float,
+                        help='exit after this many seconds without '
+                        'subscribers')
+    args = parser.parse_args()
+
+    hub = TrapHub(args.host, args.port, args.socket, args.idle_timeout)
+    hub.open()
+    try:
+        hub.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        hub.close()
+
+
+if __name__ == '__main__':
+    main()
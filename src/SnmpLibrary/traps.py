@@ -13,37 +13,53 @@
 # limitations under the License.
 
 import time
-import warnings
 import functools
 
 import robot.utils
 
-with warnings.catch_warnings():
-    warnings.filterwarnings("ignore", category=DeprecationWarning)
-    from pysnmp.carrier.asynsock.dispatch import AsynsockDispatcher
-    from pysnmp.carrier.asynsock.dgram import udp
-    from pysnmp.proto.api import decodeMessageVersion, v2c, protoVersion2c
-    from pyasn1.codec.ber import decoder
-
+from . import profiling
+from . import traphub
 from . import utils
+from . import values
 
+dispatch = utils.LazyModule('pysnmp.carrier.asynsock.dispatch')
+udp = utils.LazyModule('pysnmp.carrier.asynsock.dgram.udp')
+api = utils.LazyModule('pysnmp.proto.api')
+decoder = utils.LazyModule('pyasn1.codec.ber.decoder')
 
-def _generic_trap_filter(domain, sock, pdu, **kwargs):
+
+def trap_matches(trap_filter, source, var_binds):
+    """Checks a trap from the host `source` against the `host` and `oid`
+    of a trap filter.
+
+    The values are pyasn1 objects or (tag, value) tuples of the fast path
+    codec, see ber.py.
+    """
     snmpTrapOID = (1, 3, 6, 1, 6, 3, 1, 1, 4, 1, 0)
-    if 'host' in kwargs and kwargs['host']:
-        if sock[0] != kwargs['host']:
+    if trap_filter.get('host'):
+        if source != trap_filter['host']:
             return False
 
-    for oid, val in v2c.apiPDU.getVarBindList(pdu):
-        if 'oid' in kwargs and kwargs['oid']:
+    for oid, val in var_binds:
+        if trap_filter.get('oid'):
             if oid == snmpTrapOID:
-                if val[0][0][2] != v2c.ObjectIdentifier(kwargs['oid']):
+                if isinstance(val, tuple):
+                    val = val[1]
+                else:
+                    val = values.decode(val)
+                if val != tuple(trap_filter['oid']):
                     return False
     return True
 
 
+def _generic_trap_filter(domain, sock, pdu, **kwargs):
+    return trap_matches(kwargs, sock[0], api.v2c.apiPDU.getVarBinds(pdu))
+
+
 def _trap_receiver(trap_filter, host, port, timeout):
+    """Returns the variable bindings of the first matching trap."""
     started = time.time()
+    received = list()
 
     def _trap_timer_cb(now):
         if now - started > timeout:
@@ -51,21 +67,25 @@ def _trap_receiver(trap_filter, host, port, timeout):
                                  robot.utils.secs_to_timestr(timeout))
 
     def _trap_receiver_cb(transport, domain, sock, msg):
-        if decodeMessageVersion(msg) != protoVersion2c:
+        if api.decodeMessageVersion(msg) != api.protoVersion2c:
             raise RuntimeError('Only SNMP v2c traps are supported.')
 
-        req, msg = decoder.decode(msg, asn1Spec=v2c.Message())
-        pdu = v2c.apiMessage.getPDU(req)
+        with profiling.phase('trap'):
+            req, msg = decoder.decode(msg, asn1Spec=api.v2c.Message())
+            pdu = api.v2c.apiMessage.getPDU(req)
 
-        # ignore any non trap PDUs
-        if not pdu.isSameTypeWith(v2c.TrapPDU()):
-            return
+            # ignore any non trap PDUs
+            if not pdu.isSameTypeWith(api.v2c.TrapPDU()):
+                return
 
-        # Stop the receiver if the trap we are looking for was received.
-        if trap_filter(domain, sock, pdu):
-            transport.jobFinished(1)
+            # Stop the receiver if the trap we are looking for was received.
+            with profiling.phase('filter'):
+                matches = trap_filter(domain, sock, pdu)
+            if matches:
+                received.append(api.v2c.apiTrapPDU.getVarBinds(pdu))
+                transport.jobFinished(1)
 
-    dispatcher = AsynsockDispatcher()
+    dispatcher = dispatch.AsynsockDispatcher()
     dispatcher.registerRecvCbFun(_trap_receiver_cb)
     dispatcher.registerTimerCbFun(_trap_timer_cb)
 
@@ -80,10 +100,13 @@ def _trap_receiver(trap_filter, host, port, timeout):
     finally:
         dispatcher.closeDispatcher()
 
+    return received[0]
+
 
 class _Traps:
-    def __init__(self):
+    def __init__(self, trap_hub=False):
         self._trap_filters = dict()
+        self._trap_hub = trap_hub
 
     def new_trap_filter(self, name, host=None, oid=None):
         """Defines a new SNMP trap filter.
@@ -98,11 +121,30 @@ class _Traps:
 
     def wait_until_trap_is_received(self, trap_filter_name, timeout=5.0,
                                     host='0.0.0.0', port=1620):
-        """Wait until the first matching trap is received."""
+        """Wait until the first matching trap is received.
+
+        Returns the variable bindings of the trap as list of OIDs and
+        values, like `Walk`.
+
+        If the library is imported with `trap_hub` enabled, the trap port is
+        not bound by this keyword. Instead, a trap hub process owns the port
+        and forwards the traps to all processes waiting for them, e.g. to
+        the workers of pabot. The hub is started on demand and exits after
+        it was unused for a minute. The trap hub needs Unix sockets and thus
+        is not available on Windows.
+        """
         if trap_filter_name not in self._trap_filters:
             raise RuntimeError('Trap filter "%s" not found.' % trap_filter_name)
 
         trap_filter = self._trap_filters[trap_filter_name]
         timeout = robot.utils.timestr_to_secs(timeout)
 
-        _trap_receiver(trap_filter, host, port, timeout)
+        if self._trap_hub:
+            var_binds, dropped = traphub.wait_for_trap(
+                    trap_filter.keywords, host, int(port), timeout)
+            for oid in dropped:
+                self._warn('Trap hub could not forward the value of OID %s'
+                           % oid)
+        else:
+            var_binds = _trap_receiver(trap_filter, host, port, timeout)
+        return self._format_walk(var_binds)
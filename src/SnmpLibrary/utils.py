@@ -13,6 +13,8 @@
 # limitations under the License.
 
 import sys
+import importlib
+import warnings
 
 
 def try_int(i):
@@ -22,6 +24,26 @@ def try_int(i):
         return i
 
 
+class LazyModule:
+    """Placeholder for a module which is imported on first use.
+
+    pysnmp and pyasn1 are expensive to import. Modules referenced through a
+    `LazyModule` are only imported when one of their attributes is accessed
+    for the first time.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            with warnings.catch_warnings():
+                warnings.filterwarnings("ignore", category=DeprecationWarning)
+                self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+
 def is_string(string):
     if (sys.version_info[0] >= 3):
         return isinstance(string, str)
@@ -48,10 +70,13 @@ def parse_oid(oid):
         oid = None
 
     if oid is None:
-        sym, suffixes = sym.split('.', 1)
-        suffixes = suffixes.split('.')
-        suffixes = map(try_int, suffixes)
-        suffixes = tuple(suffixes)
+        if '.' in sym:
+            sym, suffixes = sym.split('.', 1)
+            suffixes = suffixes.split('.')
+            suffixes = map(try_int, suffixes)
+            suffixes = tuple(suffixes)
+        else:
+            suffixes = ()
         oid = ((mib, sym),) + suffixes
 
     return oid
@@ -0,0 +1,114 @@
+# Copyright 2026 Kontron Europe GmbH
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Conversion of SNMP values to Python values.
+#
+# The converter of a value is looked up by the tag set of the value in a
+# dispatch table, which is built once per form. Subtypes like DisplayString
+# share the tag set of their base type and thus its converter. The forms are:
+#
+#   native  int, bytes, ipaddress.IPv4Address, OID tuple or None for Null
+#           and the exceptions noSuchObject, noSuchInstance and endOfMibView
+#   get     the legacy result of `Get`: a tuple of octets for OCTET STRINGs,
+#           the pretty printed value otherwise
+#   string  the legacy result of `Get Display String`, only valid for OCTET
+#           STRINGs
+#   walk    the legacy result of `Walk`: a dotted string with a leading dot
+#           for OIDs, the pretty printed value otherwise
+
+import ipaddress
+
+from . import utils
+
+univ = utils.LazyModule('pyasn1.type.univ')
+rfc1902 = utils.LazyModule('pysnmp.proto.rfc1902')
+rfc1905 = utils.LazyModule('pysnmp.proto.rfc1905')
+
+FORMS = ('native', 'get', 'string', 'walk')
+
+_tables = dict()
+
+
+def _pretty(value):
+    return value.prettyOut(value)
+
+
+def _octets(value):
+    return value.asOctets()
+
+
+def _ip_address(value):
+    return ipaddress.IPv4Address(value.asOctets())
+
+
+def _oid(value):
+    return tuple(value)
+
+
+def _dotted_oid(value):
+    return ''.join(('.', str(value)))
+
+
+def _string(value):
+    return str(value)
+
+
+def _numbers(value):
+    return value.asNumbers()
+
+
+def _null(value):
+    return None
+
+
+def _build_table(form):
+    integers = (univ.Integer, rfc1902.Integer32, rfc1902.Counter32,
+                rfc1902.Gauge32, rfc1902.TimeTicks, rfc1902.Counter64)
+    if form == 'native':
+        table = dict((t.tagSet, int) for t in integers)
+        table[univ.OctetString.tagSet] = _octets
+        table[rfc1902.Opaque.tagSet] = _octets
+        table[rfc1902.IpAddress.tagSet] = _ip_address
+        table[univ.ObjectIdentifier.tagSet] = _oid
+        for t in (univ.Null, rfc1905.NoSuchObject, rfc1905.NoSuchInstance,
+                  rfc1905.EndOfMibView):
+            table[t.tagSet] = _null
+    elif form == 'get':
+        table = {univ.OctetString.tagSet: _numbers}
+    elif form == 'string':
+        table = {univ.OctetString.tagSet: _string}
+    elif form == 'walk':
+        table = {univ.ObjectIdentifier.tagSet: _dotted_oid}
+    else:
+        raise RuntimeError('Invalid value format "%s"' % form)
+    return table
+
+
+def converter(value, form='native'):
+    """Returns the function converting `value` to the given form."""
+    try:
+        table = _tables[form]
+    except KeyError:
+        table = _tables[form] = _build_table(form)
+    try:
+        return table[value.tagSet]
+    except KeyError:
+        if form == 'string':
+            raise RuntimeError('Returned value is not an octetstring')
+        return _pretty
+
+
+def decode(value, form='native'):
+    """Converts an SNMP value to the given form, see above."""
+    return converter(value, form)(value)
@@ -0,0 +1,211 @@
+# Copyright 2026 Kontron Europe GmbH
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# On-disk cache of walk results.
+#
+# A cached walk is a snapshot file (see snapshot.py) in the cache directory.
+# Its name is derived from the identity of the agent (sysObjectID and
+# snmpEngineID, or the transport address if the agent has no engine ID), the
+# community or user and the context name of the connection, and the root of
+# the walked subtree. The header comments of the file record
+# the state of the agent when the walk was done:
+#
+#   # boot: 1444380000.12
+#   # created: 1444390000.50
+#   # probe .1.3.6.1.2.1.2.5.0: 67|4242
+#
+# Before a walk, the identity, sysUpTime and the configured probe OIDs
+# (e.g. IF-MIB::ifTableLastChange.0) are fetched with a single GET. The
+# cached walk is used if the agent was not restarted since, i.e. the boot
+# time derived from sysUpTime did not change, and all probes still have
+# the same value. SNMPv1 agents without snmpEngineID answer this GET with
+# noSuchName; it is repeated without the engine ID then.
+
+import hashlib
+import os
+import tempfile
+import time
+
+from . import snapshot
+from . import utils
+
+_SYS_OBJECT_ID = (1, 3, 6, 1, 2, 1, 1, 2, 0)
+_SYS_UP_TIME = (1, 3, 6, 1, 2, 1, 1, 3, 0)
+_SNMP_ENGINE_ID = (1, 3, 6, 1, 6, 3, 10, 2, 1, 1, 0)
+
+# seconds the boot time derived from sysUpTime may differ between two GETs
+BOOT_TOLERANCE = 5.0
+
+
+def _principal(connection):
+    """Returns the community or the user name of a connection."""
+    for attr in ('communityName', 'userName'):
+        value = getattr(connection.authentication_data, attr, None)
+        if value is not None:
+            return str(value)
+    return ''
+
+
+def _context(connection):
+    context_name = connection.context_name or ''
+    if isinstance(context_name, bytes):
+        context_name = context_name.decode('utf-8', 'replace')
+    return str(context_name)
+
+
+def _text(oid, value):
+    """Returns the snapshot notation (tag|value) of a value."""
+    try:
+        return snapshot.format_record(oid, value).split('|', 1)[1]
+    except RuntimeError:
+        # noSuchObject, noSuchInstance, endOfMibView
+        return value.__class__.__name__
+
+
+class CacheEntry:
+    """The cached walk of one subtree of one agent.
+
+    `var_binds` holds the cached walk if it is still valid, None otherwise.
+    """
+
+    def __init__(self, path, header, var_binds=None):
+        self.path = path
+        self.header = header
+        self.var_binds = var_binds
+
+    def store(self, var_binds):
+        """Writes the walk to the cache, unless it has unsupported values.
+        """
+        try:
+            records = [snapshot.format_record(tuple(oid), value)
+                       for oid, value in var_binds]
+        except RuntimeError:
+            return False
+        header = dict(self.header, created=repr(time.time()))
+        directory = os.path.dirname(self.path)
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            for key in sorted(header):
+                f.write('# %s: %s\n' % (key, header[key]))
+            for record in records:
+                f.write(record)
+                f.write('\n')
+        os.replace(tmp, self.path)
+        return True
+
+
+def read_header(path):
+    """Returns the header comments of a cached walk as dictionary."""
+    header = dict()
+    with open(path) as f:
+        for line in f:
+            if not line.startswith('# '):
+                break
+            key, value = line[2:].rstrip('\r\n').split(': ', 1)
+            header[key] = value
+    return header
+
+
+class WalkCache:
+    """Cache of walk results in `directory`.
+
+    `probes` are OIDs whose values must not have changed for a cached walk
+    to be used. Cached walks older than `max_age` seconds are not used.
+    """
+
+    def __init__(self, directory, probes=(), max_age=None):
+        self.directory = directory
+        self.probes = list(probes)
+        self.max_age = max_age
+
+    def _get(self, connection, oids):
+        return connection.cmd_gen.getCmd(
+            connection.authentication_data,
+            connection.transport_target,
+            *oids,
+            contextName=connection.context_name
+        )
+
+    def _state(self, connection):
+        """Returns the identity and the header of the agent."""
+        oids = [_SYS_OBJECT_ID, _SNMP_ENGINE_ID, _SYS_UP_TIME] + self.probes
+        error_indication, error, error_index, var_binds = \
+            self._get(connection, oids)
+        if error_indication is None and error != 0 and error_index == 2:
+            # SNMPv1 noSuchName for snmpEngineID
+            oids.remove(_SNMP_ENGINE_ID)
+            error_indication, error, error_index, var_binds = \
+                self._get(connection, oids)
+        if error_indication is not None:
+            raise RuntimeError('SNMP GET failed: %s' % error_indication)
+        if error != 0:
+            raise RuntimeError('SNMP GET failed: %s' % error.prettyPrint())
+        var_binds = list(var_binds)
+        values = [_text(tuple(oid), value) for oid, value in var_binds]
+        if _SNMP_ENGINE_ID not in oids:
+            var_binds.insert(1, (_SNMP_ENGINE_ID, None))
+            values.insert(1, 'noSuchName')
+
+        identity = [values[0], values[1], _principal(connection),
+                    _context(connection)]
+        if not values[1].startswith('4'):
+            # without engine ID, the transport address identifies the agent
+            identity.append(
+                '%s:%s' % connection.transport_target.transportAddr)
+        header = dict()
+        if values[2].startswith('67|'):
+            uptime = int(values[2].split('|', 1)[1]) / 100.0
+            header['boot'] = repr(round(time.time() - uptime, 2))
+        for (oid, _), value in zip(var_binds[3:], values[3:]):
+            header['probe %s' % utils.format_oid(tuple(oid))] = value
+        return identity, header
+
+    def _is_valid(self, cached, header):
+        for key in set(cached) | set(header):
+            if key in ('boot', 'created'):
+                continue
+            if cached.get(key) != header.get(key):
+                return False
+        if 'boot' in cached or 'boot' in header:
+            if 'boot' not in cached or 'boot' not in header or \
+                    abs(float(cached['boot']) - float(header['boot'])) > \
+                    BOOT_TOLERANCE:
+                return False
+        if self.max_age is not None and \
+                time.time() - float(cached.get('created', 0)) > self.max_age:
+            return False
+        return True
+
+    def lookup(self, connection, root):
+        """Returns the `CacheEntry` of the walk of `root`, a numeric OID
+        tuple.
+
+        Raises a RuntimeError if the state of the agent cannot be read.
+        """
+        identity, header = self._state(connection)
+
+        key = '\n'.join(identity + [utils.format_oid(root)])
+        path = os.path.join(self.directory, '%s-%s.snmprec' % (
+            utils.format_oid(root)[1:],
+            hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]))
+        entry = CacheEntry(path, header)
+        try:
+            cached = read_header(path)
+        except (IOError, OSError, ValueError):
+            return entry
+        if self._is_valid(cached, header):
+            entry.var_binds = list(snapshot.read_snapshot(path))
+        return entry
@@ -0,0 +1,247 @@
+# Copyright 2026 Kontron Europe GmbH
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Walks of lexicographic OID ranges.
+#
+# A range is walked by a chain of GETNEXT requests, each one starting at the
+# last OID returned by its predecessor. Several ranges are walked
+# concurrently by the asynchronous command generator of a connection; all of
+# them share the SNMP engine and the transport of the connection. Like the
+# synchronous command generator used by `Walk`, the returned values are
+# resolved with the loaded MIBs.
+
+from . import utils
+
+univ = utils.LazyModule('pyasn1.type.univ')
+
+# errorStatus noSuchName, returned by SNMPv1 agents at the end of the MIB
+_NO_SUCH_NAME = 2
+
+
+class WalkRange:
+    """A range of OIDs below `root`, which is walked by one GETNEXT chain.
+
+    The walk starts after the OID `start`. It ends at the end of the subtree
+    `root`, at the OID `end` or, if `include_end` is True, after the OID
+    `end`. It is cut short after `max_rows` (at least 1) OIDs or after the
+    first OID for which `stop(oid, value)` returns True; `truncated` is set
+    in this case.
+    """
+
+    def __init__(self, root, start, end=None, include_end=False,
+                 max_rows=None, stop=None):
+        self.root = tuple(root)
+        self.start = tuple(start)
+        self.end = end and tuple(end)
+        self.include_end = include_end
+        self.max_rows = max_rows
+        self.stop = stop
+        self.var_binds = list()
+        self.last = self.start
+        self.truncated = False
+        self.error = None
+
+    def _is_past_end(self, oid):
+        if oid[:len(self.root)] != self.root:
+            return True
+        if self.end is None:
+            return False
+        if self.include_end:
+            return oid > self.end
+        return oid >= self.end
+
+    def accept(self, oid, value):
+        """Called for every OID in the range, returns False to stop."""
+        self.var_binds.append((oid, value))
+        if self.max_rows is not None and \
+                len(self.var_binds) >= self.max_rows:
+            self.truncated = True
+        elif self.stop is not None and self.stop(oid, value):
+            self.truncated = True
+        return not self.truncated
+
+    def process(self, error_indication, error_status, var_bind_table):
+        """Processes one response, returns False if the walk has ended."""
+        if error_indication:
+            self.error = str(error_indication)
+            return False
+        if error_status:
+            if int(error_status) != _NO_SUCH_NAME:
+                self.error = error_status.prettyPrint()
+            return False
+
+        for var_bind_table_row in var_bind_table:
+            oid, value = var_bind_table_row[0]
+            # endOfMibView, noSuchObject and noSuchInstance
+            if isinstance(value, univ.Null):
+                return False
+            oid = tuple(oid)
+            if self._is_past_end(oid):
+                return False
+            if oid <= self.last:
+                self.error = 'OID %s not increasing' % utils.format_oid(oid)
+                return False
+            self.last = oid
+            if not self.accept(oid, value):
+                return False
+        return True
+
+
+def walk_ranges(connection, ranges, max_in_flight=None):
+    """Walks all `ranges` with at most `max_in_flight` concurrent requests.
+
+    Raises a RuntimeError if the walk of any range failed.
+    """
+    cmd_gen = connection.async_cmd_gen
+    pending = list(reversed(ranges))
+    errors = list()
+
+    def _start_next():
+        if errors:
+            del pending[:]
+        if pending:
+            walk_range = pending.pop()
+            cmd_gen.nextCmd(connection.authentication_data,
+                            connection.transport_target,
+                            [walk_range.start],
+                            (_walk_cb, walk_range),
+                            lookupNames=True, lookupValues=True,
+                            contextName=connection.context_name)
+
+    def _walk_cb(send_request_handle, error_indication, error_status,
+                 error_index, var_bind_table, walk_range):
+        more = walk_range.process(error_indication, error_status,
+                                  var_bind_table)
+        if not more:
+            if walk_range.error is not None:
+                errors.append(walk_range.error)
+            _start_next()
+        return more
+
+    if max_in_flight is None:
+        max_in_flight = len(ranges)
+    for _ in range(max(1, max_in_flight)):
+        _start_next()
+
+    if ranges:
+        cmd_gen.snmpEngine.transportDispatcher.runDispatcher()
+
+    if errors:
+        raise RuntimeError('SNMP WALK failed: %s' % errors[0])
+
+
+def get_next(connection, oids):
+    """Does a single GETNEXT request and returns the variable bindings."""
+    if connection.fast_path is not None:
+        response = connection.fast_path.get_next(oids)
+        if response is not None:
+            error_indication, error_status, _, var_binds = response
+            if error_indication:
+                raise RuntimeError('SNMP GETNEXT failed: %s' %
+                                   error_indication)
+            if error_status and int(error_status) != _NO_SUCH_NAME:
+                raise RuntimeError('SNMP GETNEXT failed: %s' %
+                                   error_status.prettyPrint())
+            return [(tuple(oid), value) for oid, value in var_binds]
+
+    cmd_gen = connection.async_cmd_gen
+    result = list()
+
+    def _get_next_cb(send_request_handle, error_indication, error_status,
+                     error_index, var_bind_table, ctx):
+        if error_indication:
+            result.append(str(error_indication))
+        elif error_status and int(error_status) != _NO_SUCH_NAME:
+            result.append(error_status.prettyPrint())
+        else:
+            result.append([(tuple(oid), value) for oid, value in
+                           (var_bind_table and var_bind_table[0] or ())])
+        return False
+
+    cmd_gen.nextCmd(connection.authentication_data,
+                    connection.transport_target,
+                    oids,
+                    (_get_next_cb, None),
+                    contextName=connection.context_name)
+    cmd_gen.snmpEngine.transportDispatcher.runDispatcher()
+
+    if not isinstance(result[0], list):
+        raise RuntimeError('SNMP GETNEXT failed: %s' % result[0])
+    return result[0]
+
+
+def _is_child(root, oid, value):
+    return len(oid) > len(root) and oid[:len(root)] == root and \
+        not isinstance(value, univ.Null)
+
+
+def _child_arcs(root, var_binds):
+    arcs = set(oid[len(root)] for oid, value in var_binds
+               if _is_child(root, oid, value))
+    return sorted(arcs)
+
+
+def probe_child_arcs(connection, root, partitions, max_depth=4):
+    """Finds child arcs which split the subtree `root` into `partitions`.
+
+    A first GETNEXT request with exponentially spaced probes finds the range
+    of child arcs. A second one with linearly spaced probes within that
+    range returns the boundaries. If there is only a single child arc, its
+    children are probed instead.
+
+    Returns the node below which the arcs were found and the arcs.
+    """
+    root = tuple(root)
+    powers = [1 << i for i in range(32)]
+    for _ in range(max_depth):
+        var_binds = get_next(connection,
+                             [root] + [root + (p,) for p in powers])
+        arcs = _child_arcs(root, var_binds)
+        if len(arcs) != 1:
+            break
+        root = root + (arcs[0],)
+
+    if len(arcs) < 2 or partitions < 2:
+        return root, arcs
+
+    # There is nothing behind the first power of two without a successor
+    # in the subtree, thus it is an upper bound of the child arcs.
+    lo, hi = arcs[0], arcs[-1] + 1
+    for power, (oid, value) in zip(powers, var_binds[1:]):
+        if not _is_child(root, oid, value):
+            hi = power
+            break
+
+    probes = list()
+    for i in range(1, partitions):
+        probe = root + (lo + (hi - lo) * i // partitions,)
+        if not probes or probes[-1] < probe:
+            probes.append(probe)
+    return root, _child_arcs(root, get_next(connection, probes))
+
+
+def split_subtree(root, node, arcs):
+    """Splits the subtree `root` into disjoint ranges at the `arcs` of
+    `node`.
+
+    `node` has to be within `root` (or `root` itself). The ranges are
+    returned in lexicographic order.
+    """
+    root = tuple(root)
+    node = tuple(node)
+    boundaries = sorted(set(node + (int(arc),) for arc in arcs))
+    starts = [root] + boundaries
+    ends = boundaries + [None]
+    return [WalkRange(root, start, end, include_end=True)
+            for start, end in zip(starts, ends)]
@@ -0,0 +1,44 @@
+import pytest
+
+from src.SnmpLibrary import SnmpLibrary
+from src.SnmpLibrary.simulator import Simulator
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        'markers', 'simulator(**options): the Simulator options of the '
+        '`simulator` fixture')
+
+
+@pytest.fixture
+def simulator(request):
+    """A running simulator with one agent on `simulator.port`.
+
+    The agent serves the `table` of the test module. The options of the
+    simulator are given by the `simulator` marker, e.g.
+    `@pytest.mark.simulator(latency=0.05)`.
+    """
+    marker = request.node.get_closest_marker('simulator')
+    simulator = Simulator(**(marker.kwargs if marker else {}))
+    simulator.port = simulator.add_agent(request.module.table)
+    simulator.start()
+    yield simulator
+    simulator.stop()
+
+
+@pytest.fixture
+def connect(simulator):
+    """Returns a function which opens a v2c connection to the simulator with
+    a new library, created with the given library options."""
+    def connect(community='public', **options):
+        lib = SnmpLibrary(**options)
+        lib.open_snmp_v2c_connection('127.0.0.1', community,
+                                     port=simulator.port)
+        return lib
+    return connect
+
+
+@pytest.fixture
+def lib(connect):
+    """A library connected to the simulator."""
+    return connect()
@@ -0,0 +1,153 @@
+import random
+
+import pytest
+
+from src.SnmpLibrary import ber
+from src.SnmpLibrary.simulator import Simulator, _Table
+
+from pysnmp.proto import api
+from pysnmp.proto import rfc1902
+from pysnmp.proto import rfc1905
+from pyasn1.codec.ber import decoder, encoder
+
+v2c = api.v2c
+
+
+def _random_oid(rnd):
+    first = rnd.choice([0, 1, 2])
+    second = rnd.randint(0, 39) if first < 2 else rnd.randint(0, 300)
+    return (first, second) + tuple(
+        rnd.choice([rnd.randint(0, 127), rnd.randint(0, 2 ** 32 - 1)])
+        for _ in range(rnd.randint(0, 20)))
+
+
+def _random_value(rnd):
+    kind = rnd.randint(0, 12)
+    if kind == 0:
+        return rfc1902.Integer32(rnd.randint(-2 ** 31, 2 ** 31 - 1))
+    elif kind == 1:
+        return rfc1902.OctetString(bytes(
+            rnd.randint(0, 255) for _ in range(rnd.choice([0, 5, 200]))))
+    elif kind == 2:
+        return rfc1902.ObjectName(_random_oid(rnd))
+    elif kind == 3:
+        return rfc1902.IpAddress(bytes(rnd.randint(0, 255)
+                                       for _ in range(4)))
+    elif kind == 4:
+        return rfc1902.Counter32(rnd.randint(0, 2 ** 32 - 1))
+    elif kind == 5:
+        return rfc1902.Gauge32(rnd.randint(0, 2 ** 32 - 1))
+    elif kind == 6:
+        return rfc1902.TimeTicks(rnd.randint(0, 2 ** 32 - 1))
+    elif kind == 7:
+        return rfc1902.Opaque(b'\x9f\x78\x04\x3f\x80\x00\x00')
+    elif kind == 8:
+        return rfc1902.Counter64(rnd.randint(0, 2 ** 64 - 1))
+    elif kind == 9:
+        return rfc1902.Null('')
+    elif kind == 10:
+        return rfc1905.noSuchObject
+    elif kind == 11:
+        return rfc1905.noSuchInstance
+    return rfc1905.endOfMibView
+
+
+def _random_message(rnd):
+    pdu = rnd.choice([v2c.GetRequestPDU, v2c.GetNextRequestPDU,
+                      v2c.ResponsePDU, v2c.GetBulkRequestPDU,
+                      v2c.TrapPDU])()
+    v2c.apiPDU.setDefaults(pdu)
+    v2c.apiPDU.setRequestID(pdu, rnd.randint(-2 ** 31, 2 ** 31 - 1))
+    var_binds = [(_random_oid(rnd), _random_value(rnd))
+                 for _ in range(rnd.choice([0, 1, 10, 60]))]
+    v2c.apiPDU.setVarBinds(pdu, var_binds)
+    msg = v2c.Message()
+    v2c.apiMessage.setDefaults(msg)
+    v2c.apiMessage.setCommunity(msg, rnd.choice(['public', 'x' * 300]))
+    v2c.apiMessage.setPDU(msg, pdu)
+    return msg, pdu, var_binds
+
+
+def test_conformance_with_pyasn1():
+    rnd = random.Random(0)
+    for _ in range(200):
+        msg, pdu, var_binds = _random_message(rnd)
+        data = encoder.encode(msg)
+
+        decoded = ber.decode_message(data)
+        assert decoded.version == 1
+        assert decoded.community == msg[1].asOctets()
+        assert decoded.pdu_type == pdu.tagSet[0].tagClass | \
+            pdu.tagSet[0].tagFormat | pdu.tagSet[0].tagId
+        assert decoded.request_id == int(v2c.apiPDU.getRequestID(pdu))
+        assert len(decoded.var_binds) == len(var_binds)
+        for (oid, tag, value), (expected_oid, expected) in \
+                zip(decoded.var_binds, var_binds):
+            assert oid == expected_oid
+            assert (tag, value) == ber.from_asn1(expected)
+            assert ber.to_asn1(tag, value).isSameTypeWith(expected)
+            if value is not None:
+                assert ber.to_asn1(tag, value) == expected
+
+        reference, _ = decoder.decode(data, asn1Spec=v2c.Message())
+        reference = v2c.apiPDU.getVarBinds(v2c.apiMessage.getPDU(reference))
+        assert decoded.var_binds == [(tuple(oid),) + ber.from_asn1(value)
+                                     for oid, value in reference]
+
+        assert ber.encode_message(*decoded) == data
+
+
+def test_request_template():
+    oids = [(1, 3, 6, 1, 2, 1, 1, 1, 0), (1, 3, 6, 1, 2, 1, 1, 3, 0)]
+    template = ber.RequestTemplate(1, 'public', ber.GET_REQUEST, oids)
+    for request_id in (0, 1, 127, 128, -1, 2 ** 31 - 1):
+        pdu = v2c.GetRequestPDU()
+        v2c.apiPDU.setDefaults(pdu)
+        v2c.apiPDU.setRequestID(pdu, request_id)
+        v2c.apiPDU.setVarBinds(pdu, [(oid, v2c.Null('')) for oid in oids])
+        msg = v2c.Message()
+        v2c.apiMessage.setDefaults(msg)
+        v2c.apiMessage.setCommunity(msg, 'public')
+        v2c.apiMessage.setPDU(msg, pdu)
+        assert template.encode(request_id) == encoder.encode(msg)
+
+
+@pytest.mark.parametrize('data', [
+    b'',
+    b'\x30\x03\x02\x01',
+    b'\x30\x80\x02\x01\x01\x00\x00',
+    b'\x30\x05\x02\x01\x03\x04\x00',
+    b'\x30\x0e\x02\x01\x01\x04\x00\xa2\x07\x02\x01\x00\x02\x01\x00\x30\x00',
+    b'\x30\x13\x02\x01\x01\x04\x00\xa2\x0c\x02\x01\x00\x02\x01\x00'
+    b'\x02\x01\x00\x30\x01\x00',
+])
+def test_unsupported_messages(data):
+    with pytest.raises(ber.Unsupported):
+        ber.decode_message(data)
+
+
+def test_simulator_fast_path_matches_pyasn1():
+    table = [((1, 3, 6, 1, 2, 1, 1, 1, 0), rfc1902.OctetString('Linux')),
+             ((1, 3, 6, 1, 2, 1, 1, 3, 0), rfc1902.TimeTicks(42)),
+             ((1, 3, 6, 1, 2, 1, 2, 2, 1, 10, 1), rfc1902.Counter32(7))]
+    requests = [
+        ber.RequestTemplate(1, 'public', ber.GET_REQUEST,
+                            [(1, 3, 6, 1, 2, 1, 1, 1, 0), (1, 3, 6, 1)]),
+        ber.RequestTemplate(1, 'public', ber.GET_NEXT_REQUEST,
+                            [(1, 3, 6, 1, 2, 1, 1, 1, 0), (1, 3, 6, 2)]),
+        ber.RequestTemplate(1, 'public', ber.GET_BULK_REQUEST,
+                            [(1, 3), (1, 3, 6, 1, 2, 1, 1)], 1, 5),
+    ]
+    fast = Simulator()
+    slow = Simulator(fast_path=False)
+    fast_table = _Table(table)
+    slow_table = _Table(table)
+    for template in requests:
+        msg = template.encode(4711)
+        assert fast.handle(fast_table, msg) == slow.handle(slow_table, msg)
+
+    # cached encodings are invalidated by SET
+    fast_table.set((1, 3, 6, 1, 2, 1, 1, 1, 0), rfc1902.OctetString('BSD'))
+    slow_table.set((1, 3, 6, 1, 2, 1, 1, 1, 0), rfc1902.OctetString('BSD'))
+    msg = requests[0].encode(1)
+    assert fast.handle(fast_table, msg) == slow.handle(slow_table, msg)
@@ -0,0 +1,104 @@
+import json
+
+import pytest
+from pysnmp.proto import rfc1902
+
+from src.SnmpLibrary import bulkset
+
+IF_ALIAS = (1, 3, 6, 1, 2, 1, 31, 1, 1, 1, 18)
+IF_ALIAS_OID = '.' + '.'.join(map(str, IF_ALIAS))
+
+table = [(IF_ALIAS + (row,), rfc1902.OctetString(''))
+         for row in range(1, 201)]
+
+
+def test_pack():
+    rows = [(n, None, None, 10) for n in range(1, 8)]
+    chunks = list(bulkset.pack(iter(rows), 3, 1000))
+    assert [len(c) for c in chunks] == [3, 3, 1]
+    chunks = list(bulkset.pack(iter(rows), 50, 25))
+    assert [len(c) for c in chunks] == [2, 2, 2, 1]
+    chunks = list(bulkset.pack(iter([(1, None, None, 100)]), 50, 25))
+    assert [len(c) for c in chunks] == [1]
+
+
+def _parse_rows(source):
+    return [bulkset.parse_row(row) for row in bulkset.read_rows(source)]
+
+
+def test_read_rows(tmp_path):
+    path = tmp_path / 'rows.csv'
+    path.write_text('oid,type,value\n.1.3.6.1,integer,1\n.1.3.6.2,x\n')
+    assert _parse_rows(str(path)) == \
+        [['.1.3.6.1', 'integer', '1'], ['.1.3.6.2', '', 'x']]
+    path = tmp_path / 'rows.jsonl'
+    path.write_text('{"oid": ".1.3.6.1", "value": 1}\n\n'
+                    '[".1.3.6.2", "integer", 2]\n')
+    assert _parse_rows(str(path)) == \
+        [['.1.3.6.1', '', 1], ['.1.3.6.2', 'integer', 2]]
+    for row in (['.1.3.6.1'], {'oid': '.1.3.6.1'}, '{"oid": '):
+        with pytest.raises(ValueError):
+            bulkset.parse_row(row)
+
+
+def test_bulk_set(lib, tmp_path):
+    rows = [('%s.%d' % (IF_ALIAS_OID, row), 'octetstring', 'port %d' % row)
+            for row in range(1, 201)]
+    path = tmp_path / 'rows.jsonl'
+    path.write_text('\n'.join(json.dumps(row) for row in rows))
+    assert lib.bulk_set(str(path), max_var_binds=30, max_in_flight=3) == []
+    assert lib.get_display_string(IF_ALIAS_OID, 1) == 'port 1'
+    assert lib.get_display_string(IF_ALIAS_OID, 200) == 'port 200'
+
+
+def test_bulk_set_failed_rows(lib):
+    rows = [[IF_ALIAS_OID + '.1', 'octetstring', 'a'],
+            [IF_ALIAS_OID + '.999', 'octetstring', 'b'],
+            [IF_ALIAS_OID + '.2', 'integer', 'c'],
+            [IF_ALIAS_OID + '.3', 'octetstring', 'd']]
+    with pytest.raises(RuntimeError):
+        lib.bulk_set(rows)
+    failures = lib.bulk_set(rows, fail=False)
+    assert [(number, oid) for number, oid, _ in failures] == \
+        [(2, IF_ALIAS_OID + '.999'), (3, IF_ALIAS_OID + '.2')]
+    assert 'noCreation' in failures[0][2]
+    assert lib.get_display_string(IF_ALIAS_OID, 1) == 'a'
+    assert lib.get_display_string(IF_ALIAS_OID, 3) == 'd'
+
+
+def test_bulk_set_malformed_rows(lib, tmp_path):
+    rows = [['%s.%d' % (IF_ALIAS_OID, row), 'octetstring', 'row %d' % row]
+            for row in range(1, 121)]
+    rows[49] = [IF_ALIAS_OID + '.50', 'octetstring', 'x', 'too many']
+    failures = lib.bulk_set(rows, max_var_binds=10, fail=False)
+    assert [number for number, _, _ in failures] == [50]
+    assert 'Expected OID, type and value' in failures[0][2]
+    assert lib.get_display_string(IF_ALIAS_OID, 1) == 'row 1'
+    assert lib.get_display_string(IF_ALIAS_OID, 100) == 'row 100'
+
+    lines = [json.dumps({'oid': '%s.%d' % (IF_ALIAS_OID, row),
+                         'type': 'octetstring', 'value': 'line %d' % row})
+             for row in range(1, 121)]
+    lines[9] = json.dumps({'oid': IF_ALIAS_OID + '.10'})
+    lines[19] = '{"oid": '
+    path = tmp_path / 'rows.jsonl'
+    path.write_text('\n'.join(lines))
+    failures = lib.bulk_set(str(path), max_var_binds=10, fail=False)
+    assert [number for number, _, _ in failures] == [10, 20]
+    assert 'Missing "value"' in failures[0][2]
+    assert lib.get_display_string(IF_ALIAS_OID, 120) == 'line 120'
+
+
+def test_set_many(lib):
+    lib.set_many(IF_ALIAS_OID, rfc1902.OctetString('x'), 'idx=4',
+                 IF_ALIAS_OID, rfc1902.OctetString('y'), 'idx=5')
+    assert lib.get_display_string(IF_ALIAS_OID, 4) == 'x'
+    assert lib.get_display_string(IF_ALIAS_OID, 5) == 'y'
+
+
+@pytest.mark.simulator(max_message_size=484)
+def test_bulk_set_splits_too_big_requests(lib):
+    rows = [('%s.%d' % (IF_ALIAS_OID, row), 'octetstring', 'x' * 20)
+            for row in range(1, 101)]
+    assert lib.bulk_set(rows, max_var_binds=100, max_bytes=65000) == []
+    assert lib.get_display_string(IF_ALIAS_OID, 100) == 'x' * 20
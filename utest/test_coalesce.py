@@ -0,0 +1,128 @@
+import threading
+
+import pytest
+from pysnmp.proto import rfc1902
+
+from src.SnmpLibrary.coalesce import GetCoalescer, _Batch
+
+SYS_OR_DESCR = (1, 3, 6, 1, 2, 1, 1, 9, 1, 3)
+
+table = [((1, 3, 6, 1, 2, 1, 1, 1, 0), rfc1902.OctetString('agent'))]
+table += [(SYS_OR_DESCR + (row,), rfc1902.OctetString('module %d' % row))
+          for row in range(1, 21)]
+
+
+pytestmark = pytest.mark.simulator(latency=0.05)
+
+
+def _get_concurrently(lib, oids):
+    results = dict()
+    errors = list()
+
+    def get(oid, idx):
+        try:
+            results[(oid, idx)] = lib.get_display_string(oid, idx)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=get, args=args) for args in oids]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    return results
+
+
+def test_identical_gets_share_one_request(simulator, connect):
+    lib = connect(coalescing_window='20 ms')
+    results = _get_concurrently(lib, [('.1.3.6.1.2.1.1.1', 0)] * 10)
+    assert set(results.values()) == set(['agent'])
+    coalescer = lib._active_connection.coalescer
+    assert coalescer.calls == 10
+    assert coalescer.requests == 1
+    assert simulator.requests == 1
+
+
+def test_different_gets_are_merged(simulator, lib):
+    oids = [('.1.3.6.1.2.1.1.9.1.3', row) for row in range(1, 21)]
+    results = _get_concurrently(lib, oids)
+    assert results == dict(((oid, row), 'module %d' % row)
+                           for oid, row in oids)
+    # the first request is sent alone, the others are merged while it is
+    # in flight; a thread starting late may need one more request
+    coalescer = lib._active_connection.coalescer
+    assert coalescer.calls == len(oids)
+    assert coalescer.requests <= 3
+    assert simulator.requests == coalescer.requests
+
+
+def test_missing_oid_of_merged_request(simulator, connect):
+    lib = connect(coalescing_window='20 ms')
+    results = dict()
+
+    def get(idx):
+        try:
+            results[idx] = lib.get_display_string('.1.3.6.1.2.1.1.9.1.3', idx)
+        except RuntimeError as e:
+            results[idx] = e
+
+    threads = [threading.Thread(target=get, args=(idx,)) for idx in (1, 99)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results[1] == 'module 1'
+    assert isinstance(results[99], RuntimeError)
+    assert simulator.requests == 1
+
+
+class _CommandGenerator:
+
+    def __init__(self):
+        self.requests = list()
+
+    def getCmd(self, authentication, transport, *oids, **kwargs):
+        self.requests.append(oids)
+        if len(oids) > 1 and (9,) in oids:
+            # like SNMP v1 noSuchName
+            return None, 2, oids.index((9,)) + 1, list()
+        return None, 0, 0, [(oid, oid[0]) for oid in oids]
+
+
+class _Connection:
+    authentication_data = transport_target = context_name = None
+    fast_path = None
+
+    def __init__(self):
+        self.cmd_gen = _CommandGenerator()
+
+
+def test_error_of_merged_request_is_not_shared():
+    connection = _Connection()
+    coalescer = GetCoalescer(connection)
+    batch = _Batch()
+    for oid in [(1,), (9,)]:
+        batch.add(oid)
+    coalescer._send(batch)
+    assert coalescer._response(batch, (1,)) == (None, 0, 0, [((1,), 1)])
+    assert coalescer._response(batch, (9,))[1] == 0
+    assert connection.cmd_gen.requests == [((1,), (9,)), ((1,),), ((9,),)]
+
+
+def test_merged_request_size_is_limited():
+    connection = _Connection()
+    coalescer = GetCoalescer(connection, max_var_binds=2)
+    results = dict()
+
+    def get(oid):
+        results[oid] = coalescer.get(oid, 0.05)[3]
+
+    threads = [threading.Thread(target=get, args=((i,),))
+               for i in range(1, 6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == dict(((i,), [((i,), i)]) for i in range(1, 6))
+    assert sorted(len(r) for r in connection.cmd_gen.requests) == [1, 2, 2]
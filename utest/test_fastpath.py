@@ -0,0 +1,70 @@
+import pytest
+
+from pysnmp.proto import rfc1902
+
+from src.SnmpLibrary import ber
+from src.SnmpLibrary.fastpath import FastPath
+
+IF_ENTRY = (1, 3, 6, 1, 2, 1, 2, 2, 1)
+
+table = [((1, 3, 6, 1, 2, 1, 1, 1, 0), rfc1902.OctetString('agent')),
+         ((1, 3, 6, 1, 2, 1, 1, 3, 0), rfc1902.TimeTicks(4242)),
+         ((1, 3, 6, 1, 2, 1, 4, 20, 1, 1, 10, 0, 0, 1),
+          rfc1902.IpAddress('10.0.0.1')),
+         ((1, 3, 6, 1, 2, 1, 11, 30, 0), rfc1902.Integer32(1))]
+table += [(IF_ENTRY + (column, row), rfc1902.Integer32(row))
+          for column in range(1, 5) for row in range(1, 5)]
+
+
+class _NoCommandGenerator:
+
+    def getCmd(self, *args, **kwargs):
+        raise AssertionError('request sent with pysnmp')
+
+
+def test_fast_path_same_as_pysnmp(lib, connect):
+    fast = connect(fast_ber=True)
+    fast._active_connection.cmd_gen = _NoCommandGenerator()
+    for oid in ('.1.3.6.1.2.1.1.1.0', '.1.3.6.1.2.1.1.3.0',
+                '.1.3.6.1.2.1.4.20.1.1.10.0.0.1', '.1.3.6.1.2.1.2.2.1.2.3',
+                '.1.3.6.1.2.1.11.30.0'):
+        assert fast.get(oid, idx=()) == lib.get(oid, idx=())
+    # snmpEnableAuthenTraps is an enumeration
+    assert fast.get('.1.3.6.1.2.1.11.30.0', idx=()) == 'enabled'
+    assert fast.get_display_string('.1.3.6.1.2.1.1.1.0', idx=()) == 'agent'
+    with pytest.raises(RuntimeError) as e:
+        fast.get('.1.3.6.1.2.1.1.2.0', idx=())
+    assert 'not found' in str(e.value)
+
+
+def test_fast_path_parallel_walk(connect):
+    lib = connect(fast_ber=True)
+    oid = '.1.3.6.1.2.1.2.2.1'
+    assert lib.parallel_walk(oid, partitions=4) == lib.walk(oid)
+
+
+def test_fast_path_falls_back_to_pysnmp(connect):
+    lib = connect(fast_ber=True)
+    fast_path = lib._active_connection.fast_path
+    assert fast_path.get([('SNMPv2-MIB', 'sysDescr')]) is None
+    assert lib.get_display_string('SNMPv2-MIB::sysDescr') == 'agent'
+
+
+def test_fast_path_timeout():
+    fast_path = FastPath('127.0.0.1', 9, 'public', timeout=0.1, retries=1)
+    error_indication, _, _, var_binds = \
+        fast_path.get([(1, 3, 6, 1, 2, 1, 1, 1, 0)])
+    fast_path.close()
+    assert str(error_indication) == \
+        'No SNMP response received before timeout'
+    assert var_binds == []
+
+
+def test_fast_path_reuses_templates(simulator):
+    fast_path = FastPath('127.0.0.1', simulator.port, 'public')
+    oids = [(1, 3, 6, 1, 2, 1, 1, 1, 0)]
+    for _ in range(3):
+        assert fast_path.get(oids)[3][0][1] == \
+            rfc1902.OctetString('agent')
+    fast_path.close()
+    assert list(fast_path._templates) == [(ber.GET_REQUEST, tuple(oids))]
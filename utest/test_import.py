@@ -0,0 +1,49 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCRIPT = '''
+import sys
+import time
+started = time.time()
+import src.SnmpLibrary
+from src.SnmpLibrary import SnmpLibrary
+lib = SnmpLibrary()
+lib.find_index(1, [('.1.2.3.4', '1')], '1')
+lib.get_index_from_oid('.1.2.3.4')
+print(time.time() - started)
+print(' '.join(m for m in sys.modules
+               if m.split('.')[0] in ('pysnmp', 'pyasn1')))
+'''
+
+FIRST_USE_SCRIPT = '''
+import sys
+import time
+started = time.time()
+from src.SnmpLibrary import SnmpLibrary
+lib = SnmpLibrary()
+lib.convert_to_integer(1)
+print(time.time() - started)
+print(' '.join(m for m in sys.modules
+               if m.split('.')[0] in ('pysnmp', 'pyasn1')))
+'''
+
+
+def _run(script):
+    output = subprocess.check_output([sys.executable, '-c', script],
+                                     cwd=ROOT)
+    return output.decode('ascii').splitlines()
+
+
+def test_import_does_not_load_pysnmp():
+    lines = _run(SCRIPT)
+    assert float(lines[0]) < 2.0
+    assert len(lines) == 1 or lines[1] == ''
+
+
+def test_pysnmp_is_loaded_on_first_use():
+    lines = _run(FIRST_USE_SCRIPT)
+    assert 'pyasn1.type.univ' in lines[1].split()
+    assert 'pysnmp.proto.rfc1902' in lines[1].split()
@@ -0,0 +1,99 @@
+import time
+
+import pytest
+from pysnmp.proto import rfc1902
+
+from src.SnmpLibrary.pool import _ConnectionPool, connection_pool
+
+
+class _Connection(object):
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class TestConnectionPool(object):
+    def setup_method(self):
+        self.pool = _ConnectionPool()
+
+    def test_acquire_empty_pool(self):
+        assert self.pool.acquire('key') is None
+
+    def test_release_and_acquire(self):
+        c = _Connection()
+        self.pool.release('key', c)
+        assert len(self.pool) == 1
+        assert self.pool.acquire('other') is None
+        assert self.pool.acquire('key') is c
+        assert len(self.pool) == 0
+
+    def test_idle_timeout(self):
+        c = _Connection()
+        self.pool.release('key', c)
+        time.sleep(0.01)
+        assert self.pool.acquire('key', idle_timeout=0) is None
+        assert c.closed
+
+    def test_health_check(self):
+        bad = _Connection()
+        good = _Connection()
+        self.pool.release('key', good)
+        self.pool.release('key', bad)
+        assert self.pool.acquire('key',
+                                 health_check=lambda c: c is good) is good
+        assert bad.closed
+
+    def test_purge(self):
+        c = _Connection()
+        self.pool.release('key', c)
+        self.pool.purge()
+        assert c.closed
+        assert len(self.pool) == 0
+
+
+table = [((1, 3, 6, 1, 2, 1, 1, 1, 0), rfc1902.OctetString('agent'))]
+
+
+@pytest.fixture
+def pooled(connect):
+    """Opens a connection with a library using the connection pool."""
+    connection_pool.purge()
+    yield lambda: connect(connection_pool=True)
+    connection_pool.purge()
+
+
+def test_library_reuses_pooled_connection(pooled):
+    lib = pooled()
+    connection = lib._active_connection
+    lib.get_display_string('.1.3.6.1.2.1.1.1.0', idx=())
+    connection.table_columns['entry'] = 'columns'
+    lib.close_all_snmp_connections()
+    assert len(connection_pool) == 1
+
+    # the next suite
+    lib = pooled()
+    assert lib._active_connection is connection
+    assert connection.table_columns == {}
+    assert lib.get_display_string('.1.3.6.1.2.1.1.1.0', idx=()) == 'agent'
+    lib.close_all_snmp_connections()
+    assert len(connection_pool) == 1
+
+
+def test_library_does_not_pool_closed_connection(pooled):
+    lib = pooled()
+    connection = lib._active_connection
+    lib.close_snmp_connection()
+    lib.close_all_snmp_connections()
+    assert len(connection_pool) == 0
+    assert pooled()._active_connection is not connection
+
+
+def test_library_does_not_pool_changed_mibs(pooled, tmp_path):
+    lib = pooled()
+    connection = lib._active_connection
+    lib.add_mib_search_path(str(tmp_path))
+    lib.close_all_snmp_connections()
+    assert len(connection_pool) == 0
+    assert connection.closed
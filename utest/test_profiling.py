@@ -0,0 +1,71 @@
+import threading
+
+import pytest
+from pysnmp.proto import rfc1902
+
+from src.SnmpLibrary import SnmpLibrary
+from src.SnmpLibrary import profiling
+
+table = [((1, 3, 6, 1, 2, 1, 1, 1, 0), rfc1902.OctetString('agent')),
+         ((1, 3, 6, 1, 2, 1, 1, 3, 0), rfc1902.TimeTicks(0))]
+
+
+def test_phases_are_nested():
+    profiler = profiling.Profiler()
+    profiler.start()
+    try:
+        with profiling.phase('get'):
+            with profiling.phase('request'):
+                pass
+            with profiling.phase('request'):
+                pass
+    finally:
+        profiler.stop()
+    assert profiler.calls['get'][0] == 1
+    assert profiler.calls['get;request'][0] == 2
+    assert profiler.folded['get'] <= profiler.calls['get'][1]
+    assert profiling.phase('get') is profiling._NO_PHASE
+
+
+def test_profiling_report(lib, tmp_path):
+    lib.start_snmp_profiling(profile_keywords='walk', trace_memory=True)
+    lib.get('.1.3.6.1.2.1.1.1.0', idx=())
+    lib.walk('.1.3.6.1.2.1.1')
+    report = str(tmp_path / 'suite.folded')
+    lib.stop_snmp_profiling(report)
+
+    stacks = dict(line.rsplit(' ', 1) for line in open(report))
+    for stack in ('get;parse_oid', 'get;request;ber_encode',
+                  'get;request;ber_decode', 'get;request;mib_resolve',
+                  'get;format', 'get;log', 'walk;request', 'walk;format'):
+        assert stack in stacks
+    assert (tmp_path / 'suite.folded.pstats').exists()
+    with pytest.raises(RuntimeError):
+        lib.stop_snmp_profiling()
+
+
+def test_profiling_threads(connect):
+    lib = SnmpLibrary()
+    lib.start_snmp_profiling(profile_keywords='get')
+    with pytest.raises(RuntimeError):
+        profiling.Profiler().start()
+
+    def get():
+        lib = connect()
+        for _ in range(5):
+            lib.get('.1.3.6.1.2.1.1.1.0', idx=())
+
+    threads = [threading.Thread(target=get) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    profiler = profiling._profiler
+    lib.stop_snmp_profiling()
+
+    assert profiler.calls['get'][0] == 20
+    assert profiler.calls['get;request'][0] == 20
+    assert 'request' not in profiler.calls
+    assert profiling._profiler is None
+    import pyasn1.codec.ber.decoder
+    assert not hasattr(pyasn1.codec.ber.decoder.decode, '__wrapped__')
@@ -0,0 +1,189 @@
+import socket
+import time
+
+import pytest
+from pyasn1 import error
+from pysnmp.proto import rfc1902
+
+from src.SnmpLibrary import SnmpLibrary
+from src.SnmpLibrary import ber
+from src.SnmpLibrary.simulator import Simulator
+from src.SnmpLibrary.snapshot import (format_record, parse_record,
+                                      read_snapshot, write_snapshot)
+
+records = [
+    '1.3.6.1.2.1.1.1.0|4|Linux',
+    '1.3.6.1.2.1.1.2.0|6|1.3.6.1.4.1.8072.3.2.10',
+    '1.3.6.1.2.1.1.3.0|67|1234',
+    '1.3.6.1.2.1.2.2.1.5.1|66|1000000000',
+    '1.3.6.1.2.1.2.2.1.6.1|4x|0050569a2b3c',
+    '1.3.6.1.2.1.2.2.1.10.1|65|42',
+    '1.3.6.1.2.1.4.20.1.1.10.0.0.1|64|10.0.0.1',
+    '1.3.6.1.2.1.31.1.1.1.6.1|70|12345678901',
+]
+
+
+def test_snapshot_record_roundtrip():
+    for record in records:
+        assert format_record(*parse_record(record)) == record
+
+
+def test_write_snapshot_sorts(tmp_path):
+    path = str(tmp_path / 'snapshot.snmprec')
+    var_binds = [parse_record(r) for r in reversed(records)]
+    assert write_snapshot(path, var_binds) == len(records)
+    assert [format_record(*r) for r in read_snapshot(path)] == records
+
+
+def test_simulator_serves_snapshot(tmp_path):
+    path = str(tmp_path / 'snapshot.snmprec')
+    write_snapshot(path, [parse_record(r) for r in records])
+
+    lib = SnmpLibrary()
+    ports = lib.start_snmp_simulator(path, count=2)
+    try:
+        lib.open_snmp_v2c_connection('127.0.0.1', 'public', port=ports[1])
+        assert lib.get_display_string('.1.3.6.1.2.1.1.1') == 'Linux'
+        walk = lib.walk('.1.3.6.1.2.1.2.2.1')
+        assert [oid for oid, _ in walk] == [
+            '.1.3.6.1.2.1.2.2.1.5.1',
+            '.1.3.6.1.2.1.2.2.1.6.1',
+            '.1.3.6.1.2.1.2.2.1.10.1',
+        ]
+
+        copy = str(tmp_path / 'copy.snmprec')
+        assert lib.record_walk_snapshot('.1.3', copy) == len(records)
+        assert open(copy).read() == open(path).read()
+    finally:
+        lib.stop_snmp_simulator()
+
+
+def test_simulator_getnext_is_lexicographic():
+    simulator = Simulator()
+    table = [((1, 3, 6, 1, 10), rfc1902.Integer32(2)),
+             ((1, 3, 6, 1, 9, 1), rfc1902.Integer32(1))]
+    port = simulator.add_agent(table)
+    assert simulator.ports == [port]
+    t = simulator._agents[list(simulator._agents)[0]]
+    assert t.successor((1, 3, 6, 1, 9)) == (1, 3, 6, 1, 9, 1)
+    assert t.successor((1, 3, 6, 1, 9, 1)) == (1, 3, 6, 1, 10)
+    assert t.successor((1, 3, 6, 1, 10)) is None
+    simulator.stop()
+
+
+def test_compare_walk_to_snapshot(tmp_path):
+    path = str(tmp_path / 'snapshot.snmprec')
+    write_snapshot(path, [parse_record(r) for r in records])
+    golden = str(tmp_path / 'golden.snmprec')
+    with open(golden, 'w') as f:
+        f.write('1.3.6.1.2.1.1.1.0|4|Linux\n'
+                '1.3.6.1.2.1.2.2.1.4.1|2|1500\n'
+                '1.3.6.1.2.1.2.2.1.5.1|66|100000000\n'
+                '1.3.6.1.2.1.2.2.1.6.1|4x|0050569a2b3c\n'
+                '1.3.6.1.2.1.2.2.1.10.1|65|0\n'
+                '1.3.6.1.2.1.4.20.1.1.10.0.0.1|64|10.0.0.1\n')
+
+    lib = SnmpLibrary()
+    port = lib.start_snmp_simulator(path)
+    try:
+        lib.open_snmp_v2c_connection('127.0.0.1', 'public', port=port)
+        assert lib.compare_walk_to_snapshot('.1.3.6.1.2.1.1', golden,
+                                            fail=False) == [
+            ('added', '.1.3.6.1.2.1.1.2.0', None,
+             '6|1.3.6.1.4.1.8072.3.2.10'),
+            ('added', '.1.3.6.1.2.1.1.3.0', None, '67|1234'),
+        ]
+        assert lib.compare_walk_to_snapshot(
+                '.1.3.6.1.2.1.2', golden, ignore='.1.3.6.1.2.1.2.2.1.10.*',
+                fail=False) == [
+            ('removed', '.1.3.6.1.2.1.2.2.1.4.1', '2|1500', None),
+            ('changed', '.1.3.6.1.2.1.2.2.1.5.1', '66|100000000',
+             '66|1000000000'),
+        ]
+        assert len(lib.compare_walk_to_snapshot(
+                '.1.3.6.1.2.1.2', golden, max_differences=1,
+                fail=False)) == 1
+        lib.compare_walk_to_snapshot('.1.3.6.1.2.1.4', golden)
+        with pytest.raises(AssertionError):
+            lib.compare_walk_to_snapshot('.1.3.6.1.2.1.2', golden)
+    finally:
+        lib.stop_snmp_simulator()
+
+
+def test_simulator_latency_per_agent(tmp_path):
+    path = str(tmp_path / 'snapshot.snmprec')
+    write_snapshot(path, [parse_record(r) for r in records])
+
+    lib = SnmpLibrary()
+    fast = lib.start_snmp_simulator(path)
+    slow = lib.start_snmp_simulator(path, latency='200 ms')
+    try:
+        lib.open_snmp_v2c_connection('127.0.0.1', 'public', port=fast)
+        # the first request loads the MIBs
+        lib.get_display_string('.1.3.6.1.2.1.1.1')
+        started = time.time()
+        lib.get_display_string('.1.3.6.1.2.1.1.1')
+        assert time.time() - started < 0.2
+        lib.open_snmp_v2c_connection('127.0.0.1', 'public', port=slow)
+        started = time.time()
+        lib.get_display_string('.1.3.6.1.2.1.1.1')
+        assert time.time() - started >= 0.2
+    finally:
+        lib.stop_snmp_simulator()
+
+
+@pytest.mark.parametrize('fast_path', [True, False])
+def test_simulator_truncates_too_big_bulk_responses(fast_path):
+    simulator = Simulator(max_message_size=484, fast_path=fast_path)
+    table = [((1, 3, 6, 1, 2, 1, 2, 2, 1, 2, row),
+              rfc1902.OctetString('x' * 20)) for row in range(1, 101)]
+    simulator.add_agent(table)
+    agent = simulator._agents[list(simulator._agents)[0]]
+
+    oids = [(1, 3, 6, 1, 2, 1, 1, 1, 0), (1, 3, 6, 1, 2, 1, 2, 2, 1, 2)]
+    bulk = ber.RequestTemplate(1, 'public', ber.GET_BULK_REQUEST, oids,
+                               non_repeaters=1, max_repetitions=100)
+    response = simulator.handle(agent, bulk.encode(1))
+    simulator.stop()
+    assert 484 - 40 < len(response) <= 484
+    msg = ber.decode_message(response)
+    assert msg.error_status == 0
+    assert msg.var_binds[0][0] == oids[1] + (1,)
+    rows = [oid for oid, _, _ in msg.var_binds[1:]]
+    assert 1 < len(rows) < 100
+    assert rows == [oids[1] + (row,) for row in range(1, len(rows) + 1)]
+
+    get = ber.RequestTemplate(1, 'public', ber.GET_REQUEST,
+                              [oid for oid, _ in table])
+    msg = ber.decode_message(simulator.handle(agent, get.encode(2)))
+    assert msg.error_status == 1
+    assert msg.var_binds == []
+
+
+def test_simulator_counts_handler_errors(capsys):
+    simulator = Simulator()
+    port = simulator.add_agent([((1, 3, 6, 1, 2, 1, 1, 1, 0),
+                                 rfc1902.OctetString('agent'))])
+
+    def handle(table, msg):
+        raise KeyError('bug')
+    simulator.handle = handle
+    simulator.start()
+    try:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.sendto(b'garbage', ('127.0.0.1', port))
+        sock.close()
+        deadline = time.time() + 5
+        while not simulator.errors and time.time() < deadline:
+            time.sleep(0.01)
+    finally:
+        simulator.stop()
+    assert simulator.errors == 1
+    assert "KeyError: 'bug'" in capsys.readouterr().err
+
+    simulator = Simulator()
+    simulator.add_agent([])
+    agent = simulator._agents[list(simulator._agents)[0]]
+    with pytest.raises(error.PyAsn1Error):
+        simulator.handle(agent, b'garbage')
+    simulator.stop()
@@ -53,3 +53,11 @@ class TestSnmpLibrary(object):
     def test_snmplibrary_find_index_ambiguous_match(self):
         with pytest.raises(RuntimeError):
             self.s.find_index(1, a, '1', b, '0/10')
+
+    def test_snmplibrary_find_index_unhashable_values(self):
+        c = [((1, 2, 3, 256), [0, 1]), ((1, 2, 3, 261), [0, 6]),
+             ((1, 2, 3, 262), (0, 7))]
+        assert self.s.find_index(1, a, '1', c, [0, 6]) == (261, )
+        assert self.s.find_index(1, c, (0, 7)) == (262, )
+        with pytest.raises(RuntimeError):
+            self.s.find_index(1, a, ['1'])
@@ -0,0 +1,89 @@
+import socket
+import threading
+
+from pysnmp.proto import rfc1902
+
+from src.SnmpLibrary import SnmpLibrary
+from src.SnmpLibrary import symbols
+
+table = [((1, 3, 6, 1, 2, 1, 1, 1, 0), rfc1902.OctetString('agent')),
+         ((1, 3, 6, 1, 2, 1, 1, 9, 1, 3, 2), rfc1902.OctetString('x'))]
+
+
+def test_trie_longest_prefix():
+    trie = symbols.OidTrie()
+    trie.insert((1, 3), ('A', 'a'))
+    trie.insert((1, 3, 6, 1), ('B', 'b'))
+    trie.insert((1, 3, 6, 1), ('C', 'c'))
+    assert trie.lookup((1, 3, 6, 1, 2, 5)) == (('B', 'b'), (2, 5))
+    assert trie.lookup((1, 3, 6)) == (('A', 'a'), (6,))
+    assert trie.lookup((1, 3, 6, 1)) == (('B', 'b'), ())
+    assert trie.lookup((2, 1)) == (None, (2, 1))
+
+
+def test_format_symbolic():
+    builder = symbols.default_builder()
+    assert symbols.format_symbolic(builder, (1, 3, 6, 1, 2, 1, 1, 1, 0)) == \
+        'SNMPv2-MIB::sysDescr.0'
+    assert symbols.format_symbolic(builder, (1, 3, 6, 1, 4, 1, 99, 1)) == \
+        'SNMPv2-SMI::enterprises.99.1'
+    assert symbols.format_symbolic(builder, (5, 1)) == '.5.1'
+    assert symbols.get_trie(builder) is symbols.get_trie(builder)
+
+
+def test_symbolic_walk(connect):
+    lib = connect(symbolic_oids=True)
+    assert lib.walk('.1.3.6.1.2.1.1') == [
+        ('SNMPv2-MIB::sysDescr.0', 'agent'),
+        ('SNMPv2-MIB::sysORDescr.2', 'x'),
+    ]
+    assert lib.get_display_string('SNMPv2-MIB::sysORDescr.2') == 'x'
+
+    # the same notation with and without a prefetched table
+    assert lib.find_oid_by_value('.1.3.6.1.2.1.1', 'x') == \
+        'SNMPv2-MIB::sysORDescr.2'
+    lib.prefetch_oid_table('.1.3.6.1.2.1.1')
+    assert lib.find_oid_by_value('.1.3.6.1.2.1.1', 'x') == \
+        'SNMPv2-MIB::sysORDescr.2'
+
+    rows, token = lib.walk_range('.1.3.6.1.2.1.1', max_rows=1)
+    assert token == 'SNMPv2-MIB::sysDescr.0'
+    assert lib.walk_range('.1.3.6.1.2.1.1', start=token) == \
+        ([('SNMPv2-MIB::sysORDescr.2', 'x')], None)
+
+
+def test_symbolic_trap():
+    from pysnmp.proto.api import v2c
+    from pyasn1.codec.ber import encoder
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+
+    pdu = v2c.TrapPDU()
+    v2c.apiTrapPDU.setDefaults(pdu)
+    msg = v2c.Message()
+    v2c.apiMessage.setDefaults(msg)
+    v2c.apiMessage.setPDU(msg, pdu)
+    trap = encoder.encode(msg)
+    done = threading.Event()
+
+    def sender():
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        while not done.wait(0.1):
+            sock.sendto(trap, ('127.0.0.1', port))
+        sock.close()
+
+    thread = threading.Thread(target=sender)
+    thread.start()
+    try:
+        lib = SnmpLibrary(symbolic_oids=True)
+        lib.new_trap_filter('any')
+        var_binds = lib.wait_until_trap_is_received('any', host='127.0.0.1',
+                                                    port=port)
+    finally:
+        done.set()
+        thread.join()
+    assert [oid for oid, _ in var_binds] == \
+        ['SNMPv2-MIB::sysUpTime.0', 'SNMPv2-MIB::snmpTrapOID.0']
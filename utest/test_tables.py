@@ -0,0 +1,73 @@
+import pytest
+from pysnmp.proto import rfc1902
+
+from src.SnmpLibrary import SnmpLibrary
+from src.SnmpLibrary.tables import TableIndex
+
+SYS_OR_ENTRY = (1, 3, 6, 1, 2, 1, 1, 9, 1)
+
+table = [((1, 3, 6, 1, 2, 1, 1, 1, 0), rfc1902.OctetString('agent'))]
+for row in range(1, 4):
+    table += [
+        (SYS_OR_ENTRY + (2, row), rfc1902.ObjectName((1, 3, 6, 1, 6, row))),
+        (SYS_OR_ENTRY + (3, row), rfc1902.OctetString('module %d' % row)),
+        (SYS_OR_ENTRY + (4, row), rfc1902.TimeTicks(row * 100)),
+    ]
+
+
+def test_get_table_row(lib):
+    assert lib.get_table_row('SNMPv2-MIB::sysOREntry', 2) == {
+        'sysORID': '.1.3.6.1.6.2',
+        'sysORDescr': 'module 2',
+        'sysORUpTime': '200',
+    }
+    assert lib.get_table_row('.1.3.6.1.2.1.1.9.1', '3', 'sysORDescr', 4) == \
+        {'sysORDescr': 'module 3', 'sysORUpTime': '300'}
+
+
+def test_get_table_rows(lib):
+    rows = lib.get_table_rows('SNMPv2-MIB::sysOREntry', '1, 3, 4',
+                              'sysORDescr')
+    assert rows == [{'sysORDescr': 'module 1'},
+                    {'sysORDescr': 'module 3'}, {}]
+
+
+def test_get_table_row_errors(lib):
+    with pytest.raises(RuntimeError):
+        lib.get_table_row('SNMPv2-MIB::sysDescr', 0)
+    with pytest.raises(RuntimeError):
+        lib.get_table_row('SNMPv2-MIB::sysOREntry', 1, 'ifDescr')
+
+
+def test_table_index():
+    a = [('.1.2.3.1.%d' % row, str(row % 2)) for row in range(1, 7)]
+    b = [((1, 2, 3, 2, row), 'port %d' % (row // 2)) for row in range(1, 7)]
+    index = TableIndex(1, {'a': a, 'b': b})
+    assert len(index.indexes) == 6
+    assert index.find({'a': '1', 'b': 'port 1'}) == [(3,)]
+    assert index.find({'b': 'port 1'}) == [(2,), (3,)]
+    assert index.find({'a': '1', 'b': 'port 9'}) == []
+    assert TableIndex(2, {'a': a}).find({'a': '0'}) == [(1, 2), (1, 4),
+                                                         (1, 6)]
+    with pytest.raises(RuntimeError):
+        index.find({'c': '1'})
+    with pytest.raises(RuntimeError):
+        index.find_one({'b': 'port 1'})
+    with pytest.raises(RuntimeError):
+        index.find_one({'b': 'port 9'})
+
+
+def test_find_indexes():
+    lib = SnmpLibrary()
+    a = [('.1.2.3.1.%d' % row, str(row % 100)) for row in range(1, 1001)]
+    b = [('.1.2.3.2.%d' % row, str(row // 100)) for row in range(1, 1001)]
+    index = lib.build_table_index(1, a=a, b=b)
+    queries = [{'a': str(row % 100), 'b': str(row // 100)}
+               for row in range(1, 1001)]
+    assert lib.find_indexes(index, queries) == [(row,)
+                                                for row in range(1, 1001)]
+    assert lib.find_indexes(index, {'a': '5'}, all_matches=True)[0] == \
+        [(row,) for row in range(5, 1001, 100)]
+    with pytest.raises(RuntimeError) as e:
+        lib.find_indexes(index, [{'a': '1', 'b': '0'}, {'a': '5'}])
+    assert 'Query 2' in str(e.value)
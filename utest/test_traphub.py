@@ -0,0 +1,172 @@
+import os
+import socket
+import threading
+import time
+
+import pytest
+from pysnmp.proto import rfc1902
+
+from src.SnmpLibrary import SnmpLibrary
+from src.SnmpLibrary import traphub
+
+SNMP_TRAP_OID = (1, 3, 6, 1, 6, 3, 1, 1, 4, 1, 0)
+TRAP_OIDS = [(1, 3, 6, 1, 4, 1, 99999, 0, i) for i in (1, 2)]
+
+
+def _encode_trap(trap_oid):
+    from pysnmp.proto.api import v2c
+    from pyasn1.codec.ber import encoder
+
+    pdu = v2c.TrapPDU()
+    v2c.apiTrapPDU.setDefaults(pdu)
+    v2c.apiTrapPDU.setVarBinds(pdu, [
+        ((1, 3, 6, 1, 2, 1, 1, 3, 0), v2c.TimeTicks(42)),
+        (SNMP_TRAP_OID, v2c.ObjectIdentifier(trap_oid)),
+    ])
+    msg = v2c.Message()
+    v2c.apiMessage.setDefaults(msg)
+    v2c.apiMessage.setPDU(msg, pdu)
+    return encoder.encode(msg)
+
+
+def _free_port():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+@pytest.fixture
+def sender():
+    port = _free_port()
+    traps = [_encode_trap(oid) for oid in TRAP_OIDS]
+    done = threading.Event()
+
+    def send():
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        while not done.wait(0.1):
+            for trap in traps:
+                sock.sendto(trap, ('127.0.0.1', port))
+        sock.close()
+
+    thread = threading.Thread(target=send)
+    thread.start()
+    yield port
+    done.set()
+    thread.join()
+
+
+def test_encode_decode_trap():
+    var_binds = [((1, 3, 6, 1, 2, 1, 1, 3, 0), rfc1902.TimeTicks(5)),
+                 (SNMP_TRAP_OID, rfc1902.ObjectName(TRAP_OIDS[0]))]
+    line = traphub.encode_trap('10.0.0.1', var_binds)
+    source, decoded, dropped = traphub.decode_trap(line.decode('utf-8'))
+    assert source == '10.0.0.1'
+    assert decoded == var_binds
+    assert dropped == []
+
+
+def test_encode_values_without_snapshot_notation():
+    from pyasn1.type import univ
+    from pysnmp.proto import rfc1905
+
+    var_binds = [((1, 3, 6, 1, 2, 1, 1, 1, 0), rfc1902.Null('')),
+                 ((1, 3, 6, 1, 2, 1, 1, 2, 0), rfc1905.noSuchObject),
+                 ((1, 3, 6, 1, 2, 1, 1, 3, 0), univ.Boolean(True))]
+    line = traphub.encode_trap('10.0.0.1', var_binds)
+    _, decoded, dropped = traphub.decode_trap(line.decode('utf-8'))
+    assert decoded[0] == ((1, 3, 6, 1, 2, 1, 1, 1, 0), rfc1902.Null(''))
+    assert isinstance(decoded[1][1], rfc1905.NoSuchObject)
+    assert dropped == ['.1.3.6.1.2.1.1.3.0']
+
+
+def test_hub_fans_out_traps(sender, monkeypatch):
+    monkeypatch.setattr(traphub, 'IDLE_TIMEOUT', 1)
+    results = dict()
+
+    def wait(name, oid):
+        lib = SnmpLibrary(trap_hub=True)
+        lib.new_trap_filter(name, oid='.' + '.'.join(map(str, oid)))
+        results[name] = lib.wait_until_trap_is_received(
+                name, host='127.0.0.1', port=sender)
+
+    threads = [threading.Thread(target=wait, args=('trap%d' % i, oid))
+               for i, oid in enumerate(TRAP_OIDS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results['trap0'] == [('.1.3.6.1.2.1.1.3.0', '42'),
+                                ('.1.3.6.1.6.3.1.1.4.1.0',
+                                 '.1.3.6.1.4.1.99999.0.1')]
+    assert results['trap1'][1][1] == '.1.3.6.1.4.1.99999.0.2'
+    assert os.path.exists(traphub.socket_path('127.0.0.1', sender))
+
+
+def test_hub_timeout(monkeypatch):
+    monkeypatch.setattr(traphub, 'IDLE_TIMEOUT', 1)
+    lib = SnmpLibrary(trap_hub=True)
+    lib.new_trap_filter('any')
+    with pytest.raises(AssertionError):
+        lib.wait_until_trap_is_received('any', timeout=0.5,
+                                        host='127.0.0.1', port=_free_port())
+
+
+@pytest.fixture
+def hub(monkeypatch):
+    monkeypatch.setattr(traphub, 'MAX_PENDING', 64 * 1024)
+    hub = traphub.TrapHub('127.0.0.1', _free_port(), idle_timeout=1)
+    hub.open()
+    thread = threading.Thread(target=hub.run)
+    thread.daemon = True
+    thread.start()
+    yield hub
+    thread.join(10)
+    hub.close()
+
+
+def _subscribe(hub, line):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.connect(hub.path)
+    sock.sendall(line)
+    return sock
+
+
+def test_hub_drops_malformed_filter(hub):
+    sock = _subscribe(hub, b'{"oid": \n')
+    sock.settimeout(5)
+    assert sock.recv(1) == b''
+    sock.close()
+
+    # a trap sent once the subscription is acknowledged is received
+    trap = _encode_trap(TRAP_OIDS[0])
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    subscriber = traphub.subscribe({}, '127.0.0.1', hub.port)
+    subscriber.settimeout(5)
+    sock.sendto(trap, ('127.0.0.1', hub.port))
+    assert subscriber.recv(65536).startswith(b'{"source": "127.0.0.1"')
+    subscriber.close()
+    sock.close()
+
+
+def test_hub_drops_stalled_subscriber(hub):
+    stalled = _subscribe(hub, b'{}\n')
+    reader = _subscribe(hub, b'{}\n')
+    reader.settimeout(5)
+    trap = _encode_trap(TRAP_OIDS[0])
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    received = 0
+    while len(hub._subscribers) < 2:
+        time.sleep(0.01)
+    # the stalled subscriber never reads, the hub must keep delivering
+    while len(hub._subscribers) > 1:
+        for _ in range(50):
+            sock.sendto(trap, ('127.0.0.1', hub.port))
+        received += len(reader.recv(1 << 20))
+    assert received > traphub.MAX_PENDING
+    sock.sendto(trap, ('127.0.0.1', hub.port))
+    assert reader.recv(65536)
+    for s in (sock, stalled, reader):
+        s.close()
@@ -5,6 +5,7 @@ def test_parse_oid():
     assert parse_oid('.1.2.3') == (1, 2, 3)
     assert parse_oid('sysDescr.0') == (('', 'sysDescr'), 0)
     assert parse_oid('SNMPv2-MIB::sysDescr.0') == (('SNMPv2-MIB', 'sysDescr'), 0)
+    assert parse_oid('IF-MIB::ifEntry') == (('IF-MIB', 'ifEntry'),)
     assert parse_oid('.iso.org.6') == ('iso', 'org', 6)
 
 
@@ -0,0 +1,47 @@
+import ipaddress
+
+import pytest
+from pysnmp.proto import api, rfc1902, rfc1905
+
+from src.SnmpLibrary import traps
+from src.SnmpLibrary.values import decode
+
+
+def test_decode_native():
+    assert decode(rfc1902.Integer32(-5)) == -5
+    assert decode(rfc1902.Counter64(2 ** 40)) == 2 ** 40
+    assert decode(rfc1902.TimeTicks(100)) == 100
+    assert decode(rfc1902.OctetString('abc')) == b'abc'
+    assert decode(rfc1902.IpAddress('10.0.0.1')) == \
+        ipaddress.IPv4Address('10.0.0.1')
+    assert decode(rfc1902.ObjectName('1.3.6.1')) == (1, 3, 6, 1)
+    assert decode(rfc1902.Null('')) is None
+    for value in (rfc1905.noSuchObject, rfc1905.noSuchInstance,
+                  rfc1905.endOfMibView):
+        assert decode(value) is None
+
+
+def test_decode_legacy():
+    assert decode(rfc1902.OctetString('ab'), 'get') == (97, 98)
+    assert decode(rfc1902.Integer32(7), 'get') == '7'
+    assert decode(rfc1902.OctetString('ab'), 'string') == 'ab'
+    with pytest.raises(RuntimeError):
+        decode(rfc1902.Integer32(7), 'string')
+    assert decode(rfc1902.ObjectName('1.3.6.1'), 'walk') == '.1.3.6.1'
+    assert decode(rfc1902.Gauge32(7), 'walk') == '7'
+
+
+def test_generic_trap_filter():
+    pdu = api.v2c.TrapPDU()
+    api.v2c.apiTrapPDU.setDefaults(pdu)
+    api.v2c.apiTrapPDU.setVarBinds(pdu, [
+        ((1, 3, 6, 1, 2, 1, 1, 3, 0), api.v2c.TimeTicks(0)),
+        ((1, 3, 6, 1, 6, 3, 1, 1, 4, 1, 0),
+         api.v2c.ObjectIdentifier((1, 3, 6, 1, 4, 1, 1))),
+    ])
+    sock = ('10.0.0.1', 162)
+    assert traps._generic_trap_filter(None, sock, pdu, oid=(1, 3, 6, 1, 4,
+                                                            1, 1))
+    assert not traps._generic_trap_filter(None, sock, pdu,
+                                          oid=(1, 3, 6, 1, 4, 1, 2))
+    assert not traps._generic_trap_filter(None, sock, pdu, host='10.0.0.2')
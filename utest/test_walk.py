@@ -0,0 +1,80 @@
+import time
+
+import pytest
+from pysnmp.proto import rfc1902
+
+IF_ENTRY = (1, 3, 6, 1, 2, 1, 2, 2, 1)
+
+table = [((1, 3, 6, 1, 2, 1, 1, 1, 0), rfc1902.OctetString('agent'))]
+table += [(IF_ENTRY + (column, row), rfc1902.Integer32(row))
+          for column in range(1, 11) for row in range(1, 11)]
+table += [((1, 3, 6, 1, 2, 1, 4, 1, 0), rfc1902.Integer32(1))]
+
+
+pytestmark = pytest.mark.simulator(latency=0.01)
+
+
+def test_parallel_walk_same_as_walk(lib):
+    for oid in ('.1.3.6.1.2.1.2', '.1.3.6.1.2.1.2.2.1.3', '.1.3.6.1.2.1'):
+        assert lib.parallel_walk(oid) == lib.walk(oid)
+
+
+def test_parallel_walk_with_arcs(lib):
+    oid = '.1.3.6.1.2.1.2.2.1'
+    expected = lib.walk(oid)
+    assert lib.parallel_walk(oid, arcs='2, 5,9') == expected
+    assert lib.parallel_walk(oid, arcs=[3], max_in_flight=1) == expected
+
+
+def test_parallel_walk_is_faster(lib):
+    oid = '.1.3.6.1.2.1.2.2.1'
+    started = time.time()
+    lib.walk(oid)
+    sequential = time.time() - started
+    started = time.time()
+    lib.parallel_walk(oid, partitions=10)
+    parallel = time.time() - started
+    assert parallel < sequential / 3
+
+
+def test_walk_range_bounds(lib):
+    oid = '.1.3.6.1.2.1.2.2.1'
+    result = lib.walk(oid, start=oid + '.2.5', end=oid + '.3.3')
+    assert [o for o, _ in result] == \
+        [oid + '.2.%d' % row for row in range(6, 11)] + \
+        [oid + '.3.1', oid + '.3.2']
+    assert lib.walk(oid, stop='value == "3"')[-1] == (oid + '.1.3', '3')
+
+
+def test_walk_range_start_before_subtree(lib):
+    oid = '.1.3.6.1.2.1.2.2.1.2'
+    expected = lib.walk(oid)
+    assert len(expected) == 10
+    assert lib.walk(oid, start='.1.3.6.1.2.1.1') == expected
+    assert lib.walk(oid, start='.1.3.6.1.2.1.1', max_rows=3) == expected[:3]
+    assert lib.walk(oid, max_rows=1) == expected[:1]
+    for max_rows in (0, -1):
+        with pytest.raises(RuntimeError) as e:
+            lib.walk_range(oid, max_rows=max_rows)
+        assert 'Invalid max_rows' in str(e.value)
+
+
+def test_walk_range_resume(lib):
+    oid = '.1.3.6.1.2.1.2.2.1'
+    expected = lib.walk(oid)
+    result = list()
+    token = None
+    while True:
+        rows, token = lib.walk_range(oid, start=token, max_rows=30)
+        result.extend(rows)
+        if token is None:
+            break
+        assert len(rows) == 30
+    assert result == expected
+
+
+def test_find_oid_by_value_stops_early(lib):
+    assert lib.find_oid_by_value('.1.3.6.1.2.1.2.2.1.1', 2) == \
+        '.1.3.6.1.2.1.2.2.1.1.2'
+    with pytest.raises(RuntimeError):
+        lib.find_oid_by_value('.1.3.6.1.2.1.2.2.1.1', 11)
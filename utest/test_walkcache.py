@@ -0,0 +1,130 @@
+import os
+
+from pysnmp.proto import rfc1902
+
+from src.SnmpLibrary.walkcache import WalkCache
+
+SYS_OR_DESCR = (1, 3, 6, 1, 2, 1, 1, 9, 1, 3)
+
+table = [
+    ((1, 3, 6, 1, 2, 1, 1, 2, 0), rfc1902.ObjectName('1.3.6.1.4.1.99')),
+    ((1, 3, 6, 1, 2, 1, 1, 3, 0), rfc1902.TimeTicks(100000)),
+    ((1, 3, 6, 1, 2, 1, 1, 8, 0), rfc1902.TimeTicks(500)),
+]
+table += [(SYS_OR_DESCR + (row,), rfc1902.OctetString('module %d' % row))
+          for row in range(1, 11)]
+
+
+def _open(connect, tmp_path, community='public', **kwargs):
+    return connect(community, walk_cache=str(tmp_path / 'walks'), **kwargs)
+
+
+def test_walk_is_cached(simulator, connect, tmp_path):
+    lib = _open(connect, tmp_path)
+    walk = lib.walk('.1.3.6.1.2.1.1.9.1.3')
+    assert len(walk) == 10
+    requests = simulator.requests
+    assert len(os.listdir(str(tmp_path / 'walks'))) == 1
+
+    # a new library instance, like in a later test run
+    lib = _open(connect, tmp_path)
+    assert lib.walk('.1.3.6.1.2.1.1.9.1.3') == walk
+    assert simulator.requests == requests + 1
+
+
+def test_changed_probe_invalidates_cache(simulator, connect, tmp_path):
+    lib = _open(connect, tmp_path,
+                walk_cache_probes='SNMPv2-MIB::sysORLastChange.0')
+    lib.walk('.1.3.6.1.2.1.1.9.1.3')
+    lib.set('.1.3.6.1.2.1.1.9.1.3', rfc1902.OctetString('new'), idx=1)
+    lib.set('.1.3.6.1.2.1.1.8', rfc1902.TimeTicks(600))
+    requests = simulator.requests
+
+    walk = lib.walk('.1.3.6.1.2.1.1.9.1.3')
+    assert walk[0] == ('.1.3.6.1.2.1.1.9.1.3.1', 'new')
+    assert simulator.requests > requests + 1
+
+    requests = simulator.requests
+    assert lib.walk('.1.3.6.1.2.1.1.9.1.3') == walk
+    assert simulator.requests == requests + 1
+
+
+def test_restart_invalidates_cache(simulator, connect, tmp_path):
+    lib = _open(connect, tmp_path)
+    lib.walk('.1.3.6.1.2.1.1.9.1.3')
+    lib.set('.1.3.6.1.2.1.1.3', rfc1902.TimeTicks(10))
+    requests = simulator.requests
+    lib.walk('.1.3.6.1.2.1.1.9.1.3')
+    assert simulator.requests > requests + 1
+
+
+def test_max_age(simulator, connect, tmp_path):
+    lib = _open(connect, tmp_path, walk_cache_max_age='0 s')
+    lib.walk('.1.3.6.1.2.1.1.9.1.3')
+    requests = simulator.requests
+    lib.walk('.1.3.6.1.2.1.1.9.1.3')
+    assert simulator.requests > requests + 1
+
+
+def test_prefetch_oid_table_uses_cache(simulator, connect, tmp_path):
+    lib = _open(connect, tmp_path)
+    lib.prefetch_oid_table('.1.3.6.1.2.1.1.9.1.3')
+    requests = simulator.requests
+    lib.prefetch_oid_table('.1.3.6.1.2.1.1.9.1.3')
+    assert simulator.requests == requests + 1
+    assert lib.find_oid_by_value('.1.3.6.1.2.1.1.9.1.3', 'module 4') == \
+        '.1.3.6.1.2.1.1.9.1.3.4'
+
+
+def test_cache_key_has_community(simulator, connect, tmp_path):
+    lib = _open(connect, tmp_path)
+    walk = lib.walk('.1.3.6.1.2.1.1.9.1.3')
+
+    lib = _open(connect, tmp_path, 'private')
+    requests = simulator.requests
+    assert lib.walk('.1.3.6.1.2.1.1.9.1.3') == walk
+    assert simulator.requests > requests + 1
+    assert len(os.listdir(str(tmp_path / 'walks'))) == 2
+
+
+class _CommandGenerator:
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = list()
+
+    def getCmd(self, authentication, transport, *oids, **kwargs):
+        self.requests.append(oids)
+        return self.responses.pop(0)
+
+
+class _Connection:
+    authentication_data = None
+    context_name = ''
+
+    def __init__(self, *responses):
+        self.cmd_gen = _CommandGenerator(responses)
+        self.transport_target = self
+        self.transportAddr = ('10.0.0.1', 161)
+
+
+def test_agent_without_engine_id(tmp_path):
+    # SNMPv1 agents answer a GET of snmpEngineID with noSuchName
+    cache = WalkCache(str(tmp_path))
+    connection = _Connection(
+        (None, 2, 2, []),
+        (None, 0, 0, [((1, 3, 6, 1, 2, 1, 1, 2, 0),
+                       rfc1902.ObjectName('1.3.6.1.4.1.99')),
+                      ((1, 3, 6, 1, 2, 1, 1, 3, 0),
+                       rfc1902.TimeTicks(100))]))
+    entry = cache.lookup(connection, SYS_OR_DESCR)
+    assert entry.var_binds is None
+    assert len(connection.cmd_gen.requests[1]) == 2
+
+
+def test_walk_without_state_is_not_cached(connect, tmp_path, monkeypatch):
+    lib = _open(connect, tmp_path)
+    monkeypatch.setattr(lib._walk_cache, '_get', lambda connection, oids:
+                        (None, rfc1902.Integer32(5), 1, []))
+    assert len(lib.walk('.1.3.6.1.2.1.1.9.1.3')) == 10
+    assert not os.path.exists(str(tmp_path / 'walks'))